@@ -2,15 +2,41 @@
 ASGI config for KeepNotes project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Streaming and hot read endpoints are served by native ASGI handlers, every
+other request goes to the Django application.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/3.1/howto/deployment/asgi/
 """
 
 import os
+import re
 
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'KeepNotes.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from django.conf import settings
+from Notes.streams import note_events
+from Notes.async_views import list_notes, note_detail, search_notes
+
+routes = [
+    (re.compile(r'^/notes/events/$'), note_events),
+]
+if settings.ASYNC_READ_VIEWS:
+    routes += [
+        (re.compile(r'^/notes/notes/$'), list_notes),
+        (re.compile(r'^/notes/note/(?P<id>\d+)$'), note_detail),
+        (re.compile(r'^/notes/search/$'), search_notes),
+    ]
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'http' and scope['method'] == 'GET':
+        for pattern, handler in routes:
+            match = pattern.match(scope['path'])
+            if match:
+                return await handler(scope, receive, send, **match.groupdict())
+    await django_application(scope, receive, send)
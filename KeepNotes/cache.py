@@ -0,0 +1,308 @@
+from collections import OrderedDict
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.serializers.json import DjangoJSONEncoder
+from django_redis.client import DefaultClient
+from django_redis.client.default import _main_exceptions
+from django_redis.compressors.zlib import ZlibCompressor
+from django_redis.exceptions import ConnectionInterrupted
+from django_redis.serializers.base import BaseSerializer
+from KeepNotes.locks import Lease
+import json
+import logging
+import math
+import random
+import redis
+import threading
+import time
+
+logger = logging.getLogger('django')
+
+INVALIDATION_CHANNEL = 'keep:cache-invalidate'
+COMPUTE_POLL_INTERVAL = 0.05
+
+
+class JSONSerializer(BaseSerializer):
+    """
+        Summary:
+        --------
+            Compact json prefixed with the schema version. Values written with another version,
+            like the pickles of older deployments, are read as a miss instead of failing.
+    """
+    version = b'v1:'
+
+    def dumps(self, value):
+        return self.version+json.dumps(value, cls=DjangoJSONEncoder, separators=(',', ':')).encode()
+
+    def loads(self, value):
+        if not value.startswith(self.version):
+            return None
+        return json.loads(value[len(self.version):].decode())
+
+
+class ThresholdZlibCompressor(ZlibCompressor):
+    """ zlib compressor leaving values shorter than the COMPRESS_MIN_LENGTH option uncompressed """
+
+    def __init__(self, options):
+        super().__init__(options)
+        self.min_length = options.get('COMPRESS_MIN_LENGTH', self.min_length)
+
+
+class LocalLRU:
+    """
+        Summary:
+        --------
+            In process least recently used entries with an expiry, holding the encoded values so
+            callers never share mutable objects.
+    """
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return entry[0]
+
+    def set(self, key, value, timeout):
+        with self.lock:
+            self.entries[key] = (value, time.monotonic()+timeout)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def discard(self, keys):
+        with self.lock:
+            for key in keys:
+                self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+class LocalTier:
+    """
+        Summary:
+        --------
+            Local LRU of the process for one redis location, kept in sync by a single listener
+            thread subscribed to INVALIDATION_CHANNEL on a connection of its own, outside of the
+            pool the cache clients of every thread share.
+    """
+    retry_delay = 1
+
+    def __init__(self, url, max_entries):
+        self.url = url
+        self.l1 = LocalLRU(max_entries)
+        self.listener = None
+        self.lock = threading.Lock()
+
+    def drop(self, keys):
+        if keys == '*':
+            self.l1.clear()
+        else:
+            self.l1.discard(str(key) for key in keys)
+
+    def listen(self):
+        if self.listener is not None and self.listener.is_alive():
+            return
+        with self.lock:
+            if self.listener is None or not self.listener.is_alive():
+                self.listener = threading.Thread(target=self.run, name='cache-invalidation', daemon=True)
+                self.listener.start()
+
+    def run(self):
+        connection = redis.Redis.from_url(self.url)
+        while True:
+            pubsub = connection.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.subscribe(INVALIDATION_CHANNEL)
+                # messages published while the subscription was down are lost
+                self.l1.clear()
+                for message in pubsub.listen():
+                    if message['type'] == 'message':
+                        self.drop(json.loads(message['data']))
+            except Exception:
+                logger.exception("cache invalidation listener lost its redis connection")
+                time.sleep(self.retry_delay)
+            finally:
+                pubsub.close()
+
+
+local_tiers = {}
+local_tiers_lock = threading.Lock()
+
+
+def local_tier(url, max_entries):
+    """
+        Args:
+            url : [redis location the local entries are cached from]
+            max_entries : [size of the LRU if it is created]
+        Returns:
+            [LocalTier]: [the one of the process for url, Django builds a cache client per thread]
+    """
+    with local_tiers_lock:
+        if url not in local_tiers:
+            local_tiers[url] = LocalTier(url, max_entries)
+        return local_tiers[url]
+
+
+class TieredClient(DefaultClient):
+    """
+        Summary:
+        --------
+            django-redis client keeping the keys starting with one of the L1_PREFIXES option in the
+            LocalTier of the process, an LRU of L1_MAX_ENTRIES for L1_TIMEOUT seconds. Setting or
+            deleting such a key publishes it on INVALIDATION_CHANNEL and every process drops its
+            local copy, the short timeout bounds what a lost message or a read racing a write can
+            leave stale.
+        --------
+        Methods:
+            get : It serves hot keys from the local LRU and fills it on a miss.
+            set, delete, delete_many : They write to redis and invalidate hot keys everywhere.
+            delete_pattern, clear : They drop every local entry everywhere.
+    """
+
+    def __init__(self, server, params, backend):
+        super().__init__(server, params, backend)
+        self.tier = local_tier(self._server[0], self._options.get('L1_MAX_ENTRIES', 1024))
+        self.l1_timeout = self._options.get('L1_TIMEOUT', 5)
+        self.l1_prefixes = tuple(self._options.get('L1_PREFIXES', ()))
+
+    def is_hot(self, key):
+        return bool(self.l1_prefixes) and str(key).startswith(self.l1_prefixes)
+
+    def get(self, key, default=None, version=None, client=None):
+        if not self.is_hot(key):
+            return super().get(key, default=default, version=version, client=client)
+        self.tier.listen()
+        nkey = str(self.make_key(key, version=version))
+        value = self.tier.l1.get(nkey)
+        if value is None:
+            if client is None:
+                client = self.get_client(write=False)
+            try:
+                value = client.get(nkey)
+            except _main_exceptions as e:
+                raise ConnectionInterrupted(connection=client) from e
+            if value is None:
+                return default
+            self.tier.l1.set(nkey, value, self.l1_timeout)
+        return self.decode(value)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None, client=None, nx=False, xx=False):
+        result = super().set(key, value, timeout, version=version, client=client, nx=nx, xx=xx)
+        if self.is_hot(key):
+            self.invalidate([self.make_key(key, version=version)], client)
+        return result
+
+    def delete(self, key, version=None, prefix=None, client=None):
+        result = super().delete(key, version=version, prefix=prefix, client=client)
+        if self.is_hot(key):
+            self.invalidate([self.make_key(key, version=version, prefix=prefix)], client)
+        return result
+
+    def delete_many(self, keys, version=None, client=None):
+        result = super().delete_many(keys, version=version, client=client)
+        self.invalidate([self.make_key(key, version=version) for key in keys if self.is_hot(key)], client)
+        return result
+
+    def delete_pattern(self, *args, **kwargs):
+        result = super().delete_pattern(*args, **kwargs)
+        self.invalidate('*', kwargs.get('client'))
+        return result
+
+    def clear(self, client=None):
+        super().clear(client=client)
+        self.invalidate('*', client)
+
+    def invalidate(self, keys, client=None):
+        """
+            Args:
+                keys : [full redis keys to drop from every local LRU, '*' for all of them]
+                client : [redis client or pipeline of the write]
+        """
+        if not keys:
+            return
+        self.tier.drop(keys)
+        try:
+            (client if client is not None else self.get_client(write=True)).publish(INVALIDATION_CHANNEL, json.dumps(keys if keys == '*' else [str(key) for key in keys]))
+        except _main_exceptions:
+            logger.exception("cache invalidation could not be published")
+
+
+def fresh(entry):
+    """
+        Args:
+            entry : [dict stored by get_or_compute with value, delta and expires, or None]
+        Returns:
+            [bool]: [True if the value can be served without recomputing it. An entry is treated as
+                     expired a little early with a probability growing as its expiry gets closer and
+                     its computation slower (XFetch), so one caller refreshes it before all miss]
+    """
+    if not entry:
+        return False
+    early = entry['delta'] * settings.CACHE_XFETCH_BETA * -math.log(1.0 - random.random())
+    return time.time() + early < entry['expires']
+
+
+def get_or_compute(key, compute, timeout=None):
+    """
+        Args:
+            key : [cache key]
+            compute : [function returning the value, None values are not cached]
+            timeout : [seconds the value is fresh, the default timeout of the cache if None]
+        Returns:
+            [object]: [cached or computed value]
+        Only the caller holding the compute lease of key recomputes it. While it does, the others
+        serve the entry kept CACHE_STALE_TIMEOUT seconds past its expiry, or wait for the new
+        value when there is none. A waiter computes itself once the holder released the lease
+        without a value or CACHE_COMPUTE_TIMEOUT passed.
+    """
+    entry = cache.get(key)
+    if fresh(entry):
+        return entry['value']
+    lease = Lease('compute:'+key, settings.CACHE_COMPUTE_TIMEOUT)
+    if not lease.acquire():
+        if entry:
+            return entry['value']
+        deadline = time.monotonic() + settings.CACHE_COMPUTE_TIMEOUT
+        while time.monotonic() < deadline:
+            time.sleep(COMPUTE_POLL_INTERVAL)
+            entry = cache.get(key)
+            if entry:
+                return entry['value']
+            if lease.acquire():
+                break
+    return compute_entry(key, compute, lease, timeout)
+
+
+def compute_entry(key, compute, lease, timeout=None):
+    """
+        Args:
+            key : [cache key]
+            compute : [function returning the value, None values are not cached]
+            lease : [compute lease of key, released once the value is stored]
+            timeout : [seconds the value is fresh, the default timeout of the cache if None]
+        Returns:
+            [object]: [computed value, cached with its expiry and computation time for fresh]
+    """
+    try:
+        start = time.monotonic()
+        value = compute()
+        if value is not None:
+            timeout = cache.default_timeout if timeout is None else timeout
+            entry = {'value': value, 'delta': time.monotonic() - start, 'expires': time.time() + timeout}
+            cache.set(key, entry, timeout + settings.CACHE_STALE_TIMEOUT)
+        return value
+    finally:
+        lease.release()
@@ -0,0 +1,107 @@
+from django.conf import settings
+from django.core.cache import cache
+from django_redis import get_redis_connection
+import uuid
+
+LOCK_PREFIX = 'keep:lock:'
+
+# Deletes the lock only while it still holds our token, a lease that expired and
+# was taken by another worker is left alone.
+RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+def connection(alias):
+    """
+        Args:
+            alias : [name of a django_redis cache in CACHES]
+        Returns:
+            [StrictRedis]: [raw redis client of the cache, None if the cache is not backed by redis]
+    """
+    try:
+        return get_redis_connection(alias)
+    except NotImplementedError:
+        return None
+
+
+class Lease:
+    """
+        Summary:
+        --------
+            Lock held for at most timeout seconds, so a crashed worker never keeps it. On redis it
+            is a SET NX PX with a random token and a compare and delete release, other caches
+            fall back to cache.add.
+        --------
+        Methods:
+            acquire : It takes the lock, returns False if someone else holds it.
+            release : It gives the lock back if it is still ours.
+    """
+
+    def __init__(self, name, timeout):
+        self.key = LOCK_PREFIX+name
+        self.timeout = timeout
+        self.token = uuid.uuid4().hex
+        self.redis = connection(settings.LOCK_REDIS)
+
+    def acquire(self):
+        if self.redis is not None:
+            return bool(self.redis.set(self.key, self.token, nx=True, px=int(self.timeout*1000)))
+        return cache.add(self.key, self.token, self.timeout)
+
+    def release(self):
+        if self.redis is not None:
+            self.redis.eval(RELEASE_SCRIPT, 1, self.key, self.token)
+        elif cache.get(self.key) == self.token:
+            cache.delete(self.key)
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+
+def claim(key, timeout):
+    """
+        Args:
+            key : [idempotency key of a piece of work]
+            timeout : [seconds the key is remembered]
+        Returns:
+            [bool]: [True only for the first caller with key, the work is skipped by everyone else]
+    """
+    return Lease('once:'+key, timeout).acquire()
+
+
+def claim_many(keys, timeout):
+    """
+        Args:
+            keys : [idempotency keys of a batch of work]
+            timeout : [seconds the keys are remembered]
+        Returns:
+            [list]: [keys claimed by this caller, taken in one round trip on redis]
+    """
+    redis = connection(settings.LOCK_REDIS)
+    if redis is None:
+        return [key for key in keys if cache.add(LOCK_PREFIX+'once:'+key, 1, timeout)]
+    pipe = redis.pipeline(transaction=False)
+    for key in keys:
+        pipe.set(LOCK_PREFIX+'once:'+key, 1, nx=True, px=int(timeout*1000))
+    return [key for key, claimed in zip(keys, pipe.execute()) if claimed]
+
+
+def unclaim_many(keys):
+    """
+        Args:
+            keys : [idempotency keys claimed by claim_many whose work failed, so it can be retried]
+    """
+    if not keys:
+        return
+    redis = connection(settings.LOCK_REDIS)
+    if redis is None:
+        cache.delete_many([LOCK_PREFIX+'once:'+key for key in keys])
+    else:
+        redis.delete(*[LOCK_PREFIX+'once:'+key for key in keys])
@@ -0,0 +1,115 @@
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.views.decorators.http import require_safe
+from urllib.parse import quote
+import mimetypes
+import os
+import re
+
+RANGE = re.compile(r'^bytes=(\d*)-(\d*)$')
+DIGEST = re.compile(r'^[0-9a-f]{64}$')
+# Only the images and thumbnails re-encoded by process_profile_image are public, raw uploads and
+# attachments are not
+PUBLIC = re.compile(r'^profile_picture/(thumbnails/)?[0-9a-f]{2}/[0-9a-f]{64}\.(jpg|webp)$')
+INLINE_TYPES = {'image/jpeg', 'image/png', 'image/gif', 'image/webp'}
+CHUNK_SIZE = 64*1024
+
+
+def read_range(file, length):
+    """
+        Args:
+            file : [file opened at the first byte of the range]
+            length : [number of bytes to send]
+        Returns:
+            [generator]: [chunks of the range, the file is closed when the response ends]
+    """
+    try:
+        while length > 0:
+            chunk = file.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+    finally:
+        file.close()
+
+
+def attachment_disposition(filename):
+    """ Content-Disposition header sending filename as a download, like FileResponse does """
+    try:
+        filename.encode('ascii')
+        return 'attachment; filename="%s"' % filename.replace('\\', '\\\\').replace('"', r'\"')
+    except UnicodeEncodeError:
+        return "attachment; filename*=utf-8''%s" % quote(filename)
+
+
+def media_response(request, storage, name, content_type=None, as_attachment=False, filename='', private=False):
+    """
+        Args:
+            request : [GET or HEAD request]
+            storage : [file system storage holding the file]
+            name : [storage name of the file]
+            content_type : [content type to send, guessed from name if not given]
+            as_attachment, filename : [Content-Disposition of the response, anything but images is
+                                       always sent as attachment so it never runs on the app origin]
+            private : [True for files only some users may read, shared caches must not keep them]
+        Returns:
+            [HttpResponse]: [whole file, a single byte range with 206 or 304 when the client copy is current.
+                             Content addressed files never change so they are cached for MEDIA_CACHE_MAX_AGE]
+    """
+    path = storage.path(name)
+    if not os.path.isfile(path):
+        raise Http404("File does not exist")
+    stat = os.stat(path)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    immutable = bool(DIGEST.match(stem))
+    etag = '"%s"' % stem if immutable else '"%x-%x"' % (int(stat.st_mtime), stat.st_size)
+    if etag in request.META.get('HTTP_IF_NONE_MATCH', ''):
+        response = HttpResponseNotModified()
+    else:
+        content_type = content_type or mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        as_attachment = as_attachment or content_type not in INLINE_TYPES
+        match = RANGE.match(request.META.get('HTTP_RANGE', ''))
+        if request.META.get('HTTP_IF_RANGE', etag) != etag or (match and not any(match.groups())):
+            match = None
+        if match:
+            first, last = match.groups()
+            if first:
+                start, end = int(first), min(int(last), stat.st_size-1) if last else stat.st_size-1
+            else:
+                start, end = max(stat.st_size-int(last), 0), stat.st_size-1
+            if start > end:
+                response = HttpResponse(status=416)
+                response['Content-Range'] = 'bytes */%d' % stat.st_size
+                return response
+            file = open(path, 'rb')
+            file.seek(start)
+            response = StreamingHttpResponse(read_range(file, end-start+1), status=206, content_type=content_type)
+            response['Content-Range'] = 'bytes %d-%d/%d' % (start, end, stat.st_size)
+            response['Content-Length'] = str(end-start+1)
+            if as_attachment:
+                response['Content-Disposition'] = attachment_disposition(filename or os.path.basename(path))
+        else:
+            response = FileResponse(open(path, 'rb'), content_type=content_type, as_attachment=as_attachment, filename=filename)
+        response['Accept-Ranges'] = 'bytes'
+        response['X-Content-Type-Options'] = 'nosniff'
+    response['ETag'] = etag
+    if immutable:
+        response['Cache-Control'] = '%s, max-age=%d, immutable' % ('private' if private else 'public', settings.MEDIA_CACHE_MAX_AGE)
+    else:
+        response['Cache-Control'] = 'private, no-cache' if private else 'no-cache'
+    return response
+
+
+@require_safe
+def serve(request, path):
+    """
+        Args:
+            path : [storage name of a file under MEDIA_ROOT]
+        Returns:
+            [HttpResponse]: [file served by media_response, only derived profile images and thumbnails are served]
+    """
+    if not PUBLIC.match(path):
+        raise Http404("File does not exist")
+    return media_response(request, default_storage, path)
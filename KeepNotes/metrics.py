@@ -0,0 +1,69 @@
+from collections import Counter, defaultdict
+from django.conf import settings
+from KeepNotes.locks import connection
+import fnmatch
+import logging
+import threading
+
+logger = logging.getLogger('django')
+
+METRICS_PREFIX = 'keep:metrics:'
+
+# Counters of processes without redis, like the test runner
+local_metrics = defaultdict(Counter)
+local_lock = threading.Lock()
+
+
+def record(group, **amounts):
+    """
+        Args:
+            group : [name of the metric group, ex: tasks.send_reminder]
+            amounts : [counters of the group to increase]
+        All counters of a group live in one redis hash and are increased in one round trip.
+        Failures are logged only, metrics never break the work they measure.
+    """
+    redis = connection(settings.METRICS_REDIS)
+    if redis is None:
+        with local_lock:
+            local_metrics[group].update(amounts)
+        return
+    try:
+        pipe = redis.pipeline(transaction=False)
+        for name, amount in amounts.items():
+            pipe.hincrby(METRICS_PREFIX+group, name, int(amount))
+        pipe.execute()
+    except Exception:
+        logger.exception("metrics of %s could not be recorded", group)
+
+
+def read(group):
+    """
+        Returns:
+            [dict]: [counters of group]
+    """
+    redis = connection(settings.METRICS_REDIS)
+    if redis is None:
+        with local_lock:
+            return dict(local_metrics.get(group, {}))
+    return {name.decode(): int(value) for name, value in redis.hgetall(METRICS_PREFIX+group).items()}
+
+
+def groups(pattern='*'):
+    """
+        Returns:
+            [list]: [sorted names of the metric groups matching pattern]
+    """
+    redis = connection(settings.METRICS_REDIS)
+    if redis is None:
+        with local_lock:
+            return sorted(fnmatch.filter(local_metrics, pattern))
+    return sorted(key.decode()[len(METRICS_PREFIX):] for key in redis.scan_iter(METRICS_PREFIX+pattern))
+
+
+def reset(group):
+    redis = connection(settings.METRICS_REDIS)
+    if redis is None:
+        with local_lock:
+            local_metrics.pop(group, None)
+    else:
+        redis.delete(METRICS_PREFIX+group)
@@ -11,6 +11,8 @@ from pathlib import Path
 import os
 import datetime
 from decouple import config
+from celery.schedules import crontab
+from kombu import Queue
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -32,7 +34,7 @@ AUTH_USER_MODEL = 'authentication.user'
 INSTALLED_APPS = [
     'rest_framework',
     'authentication.apps.AuthenticationConfig',
-    'Notes',
+    'Notes.apps.NotesConfig',
     'django.contrib.admin',
     'django.contrib.auth',
     'django.contrib.contenttypes',
@@ -92,6 +94,28 @@ DATABASES = {
 # Password validation
 # https://docs.djangoproject.com/en/3.1/ref/settings/#auth-password-validators
 
+# New passwords are hashed with the first hasher, hashes of the other ones are
+# upgraded on the next login. Put TimedArgon2PasswordHasher first when argon2-cffi is installed.
+PASSWORD_HASHERS = [
+    'authentication.hashers.TimedScryptPasswordHasher',
+    'authentication.hashers.TimedPBKDF2PasswordHasher',
+    'authentication.hashers.TimedArgon2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+]
+PASSWORD_SCRYPT_N = config('PASSWORD_SCRYPT_N', default=2**14, cast=int)
+PASSWORD_SCRYPT_R = 8
+PASSWORD_SCRYPT_P = 1
+PASSWORD_ARGON2_TIME_COST = 2
+PASSWORD_ARGON2_MEMORY_COST = 64*1024
+PASSWORD_ARGON2_PARALLELISM = 2
+
+# Seconds the signed email verification and password reset tokens are valid, a used token is
+# remembered on LOCK_REDIS until it expires so it can not be replayed
+AUTH_TOKEN_AGES = {
+    'verify-email': 24*60*60,
+    'reset-password': 60*60,
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -133,13 +157,40 @@ STATICFILES_DIRS = [
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = 'media'
+MEDIA_CACHE_MAX_AGE = 365*24*60*60
+
+# Uploads are streamed to a temporary file and hashed while they arrive, never buffered in memory
+FILE_UPLOAD_HANDLERS = ['KeepNotes.storage.HashingFileUploadHandler']
+
+# Profile images are decoded by a celery task, stored resized without metadata under content hashed names
+PROFILE_IMAGE_MAX_UPLOAD_SIZE = 10*1024*1024
+PROFILE_IMAGE_MAX_PIXELS = 40000000
+PROFILE_IMAGE_SIZE = (1024, 1024)
+PROFILE_THUMBNAIL_SIZE = (128, 128)
+PROFILE_THUMBNAIL_FORMAT = 'WEBP'
+PROFILE_IMAGE_QUALITY = 80
 
 REST_FRAMEWORK = {
      'DEFAULT_PERMISSION_CLASSES': [
          'rest_framework.permissions.IsAuthenticated',
          ],
+     'DEFAULT_THROTTLE_CLASSES': [
+         'KeepNotes.throttling.BucketRateThrottle',
+         ],
+     # reverse proxies in front of the app, the client address is taken from X-Forwarded-For only behind them
+     'NUM_PROXIES': config('NUM_PROXIES', default=0, cast=int),
     }
 
+# Token bucket rates of the views with a throttle_scope, per user or per client address
+THROTTLE_RATES = {
+    'register': '5/hour',
+    'login': '10/min',
+    'reset-password': '5/hour',
+    'search': '60/min',
+}
+# django_redis cache holding the buckets, None keeps them in process like the tests do
+THROTTLE_REDIS = 'default'
+
 JWT_AUTH = {
  
   'JWT_VERIFY': True,
@@ -187,14 +238,58 @@ CACHES = {
     "default": {
         "BACKEND": "django_redis.cache.RedisCache", 
         "LOCATION": "redis://127.0.0.1:6379/1",
+        "TIMEOUT": 3600,
         "OPTIONS": {
-            "CLIENT_CLASS": "django_redis.client.DefaultClient",
-            "TIMEOUT": 3600
+            "CLIENT_CLASS": "KeepNotes.cache.TieredClient",
+            "SERIALIZER": "KeepNotes.cache.JSONSerializer",
+            "COMPRESSOR": "KeepNotes.cache.ThresholdZlibCompressor",
+            "COMPRESS_MIN_LENGTH": 1024,
+            "CONNECTION_POOL_KWARGS": {"max_connections": config('CACHE_MAX_CONNECTIONS', default=50, cast=int)},
+            # shared note data and label counts are read on every request, keep them in process briefly
+            "L1_PREFIXES": ["notes-data-", "labels-counts-"],
+            "L1_MAX_ENTRIES": 1024,
+            "L1_TIMEOUT": 5
         },
         "KEY_PREFIX": "keep"
     }
 }
 
+# get_or_compute serves values this long past expiry while one caller recomputes them
+CACHE_STALE_TIMEOUT = 60
+CACHE_COMPUTE_TIMEOUT = 10
+CACHE_XFETCH_BETA = 1.0
+
+# NOTE EVENTS
+NOTE_EVENTS_REDIS = 'default'
+NOTE_EVENTS_HEARTBEAT = 15
+NOTE_EVENTS_POLL_TIMEOUT = 25
+
+# Note bodies longer than the threshold are stored zlib compressed, the notes row keeps a preview
+NOTES_COMPRESS_THRESHOLD = 2048
+NOTES_COMPRESS_LEVEL = 6
+NOTES_PREVIEW_LENGTH = 200
+
+# A full snapshot is stored every NOTE_REVISION_SNAPSHOT_INTERVAL revisions, the ones between hold deltas
+NOTE_REVISION_SNAPSHOT_INTERVAL = 10
+NOTE_REVISION_RETENTION_DAYS = 30
+
+# Labels keep a materialized path of ids, so a label can be nested LABEL_MAX_DEPTH levels deep
+LABEL_MAX_DEPTH = 10
+# Seconds the labels of a user are cached with their note counts
+LABEL_COUNTS_TIMEOUT = 300
+
+# Due reminders are delivered REMINDER_BATCH_SIZE notes at a time, with one notification insert and
+# one digest mail per recipient for every batch
+REMINDER_BATCH_SIZE = 500
+
+# Attachments are uploaded in chunks of at most ATTACHMENT_CHUNK_SIZE, incomplete uploads expire
+ATTACHMENT_MAX_SIZE = 100*1024*1024
+ATTACHMENT_CHUNK_SIZE = 8*1024*1024
+ATTACHMENT_UPLOAD_EXPIRY_HOURS = 24
+
+# Serve GET of notes list, note detail and search with the async handlers under ASGI
+ASYNC_READ_VIEWS = True
+
 
 # CELERY
 BROKER_URL = 'redis://localhost:6379'
@@ -203,3 +298,53 @@ CELERY_ACCEPT_CONTENT = ['application/json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'Africa/Nairobi'
+
+# Every kind of work has its own queue so a long purge never delays reminders
+CELERY_QUEUES = (
+    Queue('reminders'),
+    Queue('email'),
+    Queue('media'),
+    Queue('maintenance'),
+)
+CELERY_DEFAULT_QUEUE = 'maintenance'
+CELERY_ROUTES = {
+    'send_reminder': {'queue': 'reminders'},
+    'send_email': {'queue': 'email'},
+    'send_emails': {'queue': 'email'},
+    'process_profile_image': {'queue': 'media'},
+    'delete_trashed_note': {'queue': 'maintenance'},
+    'prune_note_revisions': {'queue': 'maintenance'},
+    'delete_stale_attachments': {'queue': 'maintenance'},
+}
+CELERY_ANNOTATIONS = {
+    'send_reminder': {'soft_time_limit': 45, 'time_limit': 55},
+    'send_email': {'soft_time_limit': 30, 'time_limit': 60},
+    'send_emails': {'soft_time_limit': 240, 'time_limit': 300},
+    'process_profile_image': {'soft_time_limit': 60, 'time_limit': 90},
+    'delete_trashed_note': {'soft_time_limit': 1800, 'time_limit': 1900},
+    'prune_note_revisions': {'soft_time_limit': 1800, 'time_limit': 1900},
+    'delete_stale_attachments': {'soft_time_limit': 600, 'time_limit': 660},
+}
+CELERY_ACKS_LATE = True
+CELERYD_PREFETCH_MULTIPLIER = 1
+
+# Reminder ticks expire before the next one so a backlog never piles up
+CELERYBEAT_SCHEDULE = {
+    'send-reminder': {'task': 'send_reminder', 'schedule': crontab(minute='*'), 'options': {'expires': 50}},
+    'delete-trashed-note': {'task': 'delete_trashed_note', 'schedule': crontab(hour=2, minute=0)},
+    'prune-note-revisions': {'task': 'prune_note_revisions', 'schedule': crontab(hour=3, minute=0)},
+    'delete-stale-attachments': {'task': 'delete_stale_attachments', 'schedule': crontab(minute=30)},
+}
+
+# Periodic tasks take a lease lock and an idempotency key per run on LOCK_REDIS and
+# count runs, skipped overlaps, rows and duration on METRICS_REDIS (python manage.py metrics)
+LOCK_REDIS = 'default'
+METRICS_REDIS = 'default'
+
+# Worker launch profiles used by: python manage.py celeryworker <profile>
+CELERY_WORKER_PROFILES = {
+    'reminders': {'queues': ['reminders'], 'concurrency': 4, 'prefetch': 1},
+    'email': {'queues': ['email'], 'concurrency': 8, 'prefetch': 4},
+    'media': {'queues': ['media'], 'concurrency': 2, 'prefetch': 1},
+    'maintenance': {'queues': ['maintenance'], 'concurrency': 1, 'prefetch': 1},
+}
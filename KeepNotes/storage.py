@@ -0,0 +1,108 @@
+from django.core.files.move import file_move_safe
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+import hashlib
+import os
+import tempfile
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+        Summary:
+        --------
+            File system storage that names every file by the sha256 of its content, so a file
+            saved twice is stored once. The folder and extension of the given name are kept:
+            profile_picture/photo.jpg is stored as profile_picture/<2 hex>/<sha256>.jpg
+        --------
+        Methods:
+            hashed_name : It returns the storage name of content with the given digest.
+            write_temporary : It streams content to a temporary file and returns its path and digest.
+            store : It moves a complete file with known digest to its storage name.
+    """
+    temporary_folder = '.incoming'
+
+    def hashed_name(self, name, digest):
+        """
+            Args:
+                name : [name given to save, only its folder and extension are used]
+                digest : [sha256 hex digest of content]
+            Returns:
+                [str]: [content addressed storage name]
+        """
+        folder, extension = os.path.dirname(name), os.path.splitext(name)[1].lower()
+        return os.path.join(folder, digest[:2], digest+extension).replace('\\', '/')
+
+    def write_temporary(self, content):
+        """
+            Args:
+                content : [File object to store]
+            Returns:
+                [tuple]: [path of temporary file next to MEDIA_ROOT and sha256 of content,
+                          content is read in chunks so it never sits in memory as a whole]
+        """
+        folder = self.path(self.temporary_folder)
+        os.makedirs(folder, exist_ok=True)
+        descriptor, path = tempfile.mkstemp(dir=folder)
+        digest = hashlib.sha256()
+        with os.fdopen(descriptor, 'wb') as temporary:
+            for chunk in content.chunks():
+                digest.update(chunk)
+                temporary.write(chunk)
+        return path, digest.hexdigest()
+
+    def get_available_name(self, name, max_length=None):
+        return name
+
+    def store(self, name, path, digest):
+        """
+            Args:
+                name : [name given to save, only its folder and extension are used]
+                path : [complete file on the same disk, it is moved in place or removed if the content is stored already]
+                digest : [sha256 hex digest of the file]
+            Returns:
+                [str]: [content addressed storage name]
+        """
+        name = self.hashed_name(name, digest)
+        full_path = self.path(name)
+        if os.path.exists(full_path):
+            os.remove(path)
+            return name
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        file_move_safe(path, full_path, allow_overwrite=True)
+        if self.file_permissions_mode is not None:
+            os.chmod(full_path, self.file_permissions_mode)
+        return name
+
+    def _save(self, name, content):
+        digest = getattr(content, 'sha256', None)
+        if digest is not None and hasattr(content, 'temporary_file_path'):
+            path = content.temporary_file_path()
+        else:
+            path, digest = self.write_temporary(content)
+        return self.store(name, path, digest)
+
+
+class HashingFileUploadHandler(TemporaryFileUploadHandler):
+    """
+        Summary:
+        --------
+            Upload handler that streams every uploaded file to a temporary file on disk, like
+            TemporaryFileUploadHandler, and computes its sha256 on the way so that
+            ContentAddressedStorage can move it in place without reading it again.
+    """
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.digest = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data, start):
+        self.digest.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        file = super().file_complete(file_size)
+        file.sha256 = self.digest.hexdigest()
+        return file
+
+
+content_storage = ContentAddressedStorage()
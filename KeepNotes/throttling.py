@@ -0,0 +1,125 @@
+from django.conf import settings
+from KeepNotes import metrics
+from KeepNotes.locks import connection
+from rest_framework.throttling import BaseThrottle
+import math
+import threading
+import time
+
+BUCKET_PREFIX = 'keep:throttle:'
+
+# Token bucket refilled at rate tokens per millisecond up to capacity. Reading, refilling, taking a
+# token and setting the expiry happen in one atomic call, so a request costs one round trip.
+TAKE_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = math.ceil((1 - tokens) / rate)
+end
+redis.call('HMSET', KEYS[1], 'tokens', tostring(tokens), 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate))
+return wait
+"""
+
+PERIODS = {'s': 1, 'm': 60, 'h': 60*60, 'd': 24*60*60}
+
+
+def parse_rate(rate):
+    """
+        Args:
+            rate : [requests per period, ex: 10/min, 100/hour]
+        Returns:
+            [tuple]: [bucket capacity and tokens added per millisecond]
+    """
+    requests, period = rate.split('/')
+    return int(requests), int(requests) / (PERIODS[period[0]]*1000)
+
+
+class LocalBuckets:
+    """
+        Summary:
+        --------
+            In process token buckets used when THROTTLE_REDIS is None or not backed by redis, like in tests.
+    """
+
+    def __init__(self):
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def take(self, key, capacity, rate, now):
+        with self.lock:
+            tokens, ts = self.buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + max(0, now - ts) * rate)
+            wait = 0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = math.ceil((1 - tokens) / rate)
+            self.buckets[key] = (tokens, now)
+            return wait
+
+    def reset(self):
+        with self.lock:
+            self.buckets.clear()
+
+
+local_buckets = LocalBuckets()
+scripts = {}
+
+
+def take(scope, ident):
+    """
+        Args:
+            scope : [name of the throttled endpoint in THROTTLE_RATES]
+            ident : [id of the user or address of the client]
+        Returns:
+            [float]: [0 if the request is allowed, else the seconds to wait for the next token]
+    """
+    capacity, rate = parse_rate(settings.THROTTLE_RATES[scope])
+    key = BUCKET_PREFIX+scope+':'+ident
+    now = int(time.time()*1000)
+    redis = connection(settings.THROTTLE_REDIS) if settings.THROTTLE_REDIS else None
+    if redis is None:
+        wait = local_buckets.take(key, capacity, rate, now)
+    else:
+        if settings.THROTTLE_REDIS not in scripts:
+            scripts[settings.THROTTLE_REDIS] = redis.register_script(TAKE_SCRIPT)
+        wait = int(scripts[settings.THROTTLE_REDIS](keys=[key], args=[capacity, rate, now]))
+    if wait:
+        metrics.record('throttle', **{scope: 1})
+    return wait / 1000
+
+
+def reset():
+    """ forgets the in process buckets """
+    local_buckets.reset()
+
+
+class BucketRateThrottle(BaseThrottle):
+    """
+        Summary:
+        --------
+            Throttles the views with a throttle_scope found in THROTTLE_RATES, per user when
+            logged in and per client address otherwise. Throttled requests get a 429 with
+            Retry-After.
+    """
+
+    def allow_request(self, request, view):
+        scope = getattr(view, 'throttle_scope', None)
+        if scope not in settings.THROTTLE_RATES:
+            return True
+        user = request.user
+        ident = 'user-'+str(user.pk) if user and user.is_authenticated else 'ip-'+self.get_ident(request)
+        self.wait_seconds = take(scope, ident)
+        return not self.wait_seconds
+
+    def wait(self):
+        return self.wait_seconds
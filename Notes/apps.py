@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class NotesConfig(AppConfig):
     name = 'Notes'
+
+    def ready(self):
+        import Notes.signals
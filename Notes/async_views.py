@@ -0,0 +1,133 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+from Notes.models import Notes
+from Notes.entries import note_entry, search_data, search_key
+from Notes.serializers import NotePreviewSerializer, parse_projection
+from Notes.streams import scope_user, send_json
+from KeepNotes import throttling
+from KeepNotes.cache import COMPUTE_POLL_INTERVAL, compute_entry, fresh
+from KeepNotes.locks import Lease
+from rest_framework.renderers import JSONRenderer
+from urllib.parse import parse_qs
+import asyncio
+import logging
+import math
+import time
+
+logger = logging.getLogger('django')
+
+# Django 3.0 has no async cache API, the redis round trips run in the default
+# thread pool so they never queue behind ORM work on the thread sensitive executor.
+cache_get = sync_to_async(cache.get, thread_sensitive=False)
+search_generation = sync_to_async(Notes.search_generation, thread_sensitive=False)
+throttle = sync_to_async(throttling.take, thread_sensitive=False)
+
+NOT_AUTHENTICATED = {'detail':'Authentication credentials were not provided.'}
+
+
+async def send_data(send, status, data):
+    await send({'type':'http.response.start', 'status':status, 'headers':[(b'content-type', b'application/json')]})
+    await send({'type':'http.response.body', 'body':JSONRenderer().render(data)})
+
+
+async def cached(key, compute):
+    """
+        Args:
+            key : [cache key]
+            compute : [function querying the value]
+        Returns:
+            [object]: [value of key like get_or_compute returns it, the cache and lease round trips
+                       run in the thread pool and waiting for another caller sleeps on the event
+                       loop, only compute runs with the ORM on the thread sensitive executor]
+    """
+    entry = await cache_get(key)
+    if fresh(entry):
+        return entry['value']
+    lease = Lease('compute:'+key, settings.CACHE_COMPUTE_TIMEOUT)
+    acquire = sync_to_async(lease.acquire, thread_sensitive=False)
+    if not await acquire():
+        if entry:
+            return entry['value']
+        deadline = time.monotonic() + settings.CACHE_COMPUTE_TIMEOUT
+        while time.monotonic() < deadline:
+            await asyncio.sleep(COMPUTE_POLL_INTERVAL)
+            entry = await cache_get(key)
+            if entry:
+                return entry['value']
+            if await acquire():
+                break
+    return await sync_to_async(compute_entry, thread_sensitive=True)(key, compute, lease)
+
+
+def query_params(scope):
+    return {name: values[0] for name, values in parse_qs(scope['query_string'].decode()).items()}
+
+
+def notes_data(user, fields=None, preview=None):
+    """
+        Args:
+            user : [logged in user]
+            fields : [names of fields to return, None for all]
+            preview : [length of content preview, None for the stored content]
+        Returns:
+            [list]: [serialized active notes owned by or shared with user]
+    """
+    serializer = NotePreviewSerializer(fields=fields, preview=preview)
+    notes = serializer.project(Notes.objects.filter(Q(owner=user)|Q(collaborator=user), Q(isArchive=False,isDelete=False)).distinct())
+    return NotePreviewSerializer(notes, many=True, fields=fields, preview=preview).data
+
+
+async def list_notes(scope, receive, send):
+    """
+        Async version of CreateAndListNotes.get
+    """
+    user = await sync_to_async(scope_user, thread_sensitive=True)(scope)
+    if not user.is_authenticated:
+        await send_json(send, 403, NOT_AUTHENTICATED)
+        return
+    fields, preview = parse_projection(query_params(scope))
+    await send_data(send, 200, await sync_to_async(notes_data, thread_sensitive=True)(user, fields, preview))
+
+
+async def note_detail(scope, receive, send, id):
+    """
+        Async version of NoteDetails.get, the serialized note is cached once for owner and collaborators
+    """
+    user = await sync_to_async(scope_user, thread_sensitive=True)(scope)
+    if not user.is_authenticated:
+        await send_json(send, 403, NOT_AUTHENTICATED)
+        return
+    entry = await cached(Notes.cache_key(id), lambda: note_entry(id))
+    if entry is None:
+        await send_json(send, 404, {'detail':'Not found.'})
+    elif user.id != entry['owner'] and user.id not in entry['collaborators']:
+        await send_json(send, 403, {'detail':'You do not have permission to perform this action.'})
+    else:
+        await send_data(send, 200, entry['data'])
+
+
+async def search_notes(scope, receive, send):
+    """
+        Async version of SearchNote.get, results are cached per user and search word
+    """
+    user = await sync_to_async(scope_user, thread_sensitive=True)(scope)
+    if not user.is_authenticated:
+        await send_json(send, 403, NOT_AUTHENTICATED)
+        return
+    wait = await throttle('search', 'user-'+str(user.id))
+    if wait:
+        await send({'type':'http.response.start', 'status':429, 'headers':[(b'content-type', b'application/json'), (b'retry-after', str(math.ceil(wait)).encode())]})
+        await send({'type':'http.response.body', 'body':JSONRenderer().render({'detail':'Request was throttled.'})})
+        return
+    params = query_params(scope)
+    search = params.get('search', '')
+    if not search:
+        await send_data(send, 200, {'response':'Give some search string!!!'})
+        return
+    query = search.split(' ')[-1]
+    fields, preview = parse_projection(params)
+    key = search_key(user.id, await search_generation(user.id), query, fields, preview)
+    data = await cached(key, lambda: search_data(user, query, fields, preview) or None)
+    await send_data(send, 200, data or [])
@@ -0,0 +1,42 @@
+from Notes.models import Notes
+from Notes.serializers import NotesSerializer, NotePreviewSerializer
+
+
+def note_entry(note_id):
+    """
+        Args:
+            note_id : [id of note]
+        Returns:
+            [dict]: [serialized note with the ids allowed to read it, None if note is missing or trashed]
+    """
+    note = Notes.objects.filter(id=note_id, isDelete=False).prefetch_related('label', 'collaborator').first()
+    if note is None:
+        return None
+    return {'owner':note.owner_id, 'collaborators':[user.id for user in note.collaborator.all()], 'data':NotesSerializer(note).data}
+
+
+def search_key(user_id, generation, query, fields=None, preview=None):
+    """
+        Returns:
+            [str]: [cache key of the serialized results of a search word with its projection for user,
+                    generation is Notes.search_generation of user so a change of a note moves all
+                    searches of its users to new keys]
+    """
+    key = str(user_id)+"-search-"+generation+"-"+query
+    if fields is not None or preview:
+        key += "-"+",".join(fields or [])+"-"+str(preview or "")
+    return key
+
+
+def search_data(user, query, fields=None, preview=None):
+    """
+        Args:
+            user : [logged in user]
+            query : [last word of the search string]
+            fields : [names of fields to return, None for all]
+            preview : [length of content preview, None for the stored content]
+        Returns:
+            [list]: [serialized active notes of user having query in title or content]
+    """
+    notes = NotePreviewSerializer(fields=fields, preview=preview).project(Notes.objects.search(user, query))
+    return NotePreviewSerializer(notes, many=True, fields=fields, preview=preview).data
@@ -0,0 +1,94 @@
+from django.conf import settings
+from django_redis import get_redis_connection
+import json
+import logging
+import threading
+import time
+
+logger = logging.getLogger('django')
+
+CHANNEL_PREFIX = 'keep:note-events:'
+
+
+def channel_name(user_id):
+    """
+        Args:
+            user_id : [id of the user receiving the events]
+        Returns:
+            [str]: [redis pub/sub channel of the user]
+    """
+    return CHANNEL_PREFIX+str(user_id)
+
+
+def publish(changes):
+    """
+        Args:
+            changes : [saved NoteChange objects]
+        Publishes one event per change on the channel of its user. Failures are
+        logged only, clients still catch up through the change feed.
+    """
+    try:
+        pipe = get_redis_connection(settings.NOTE_EVENTS_REDIS).pipeline(transaction=False)
+        for change in changes:
+            pipe.publish(channel_name(change.user_id), json.dumps({'note':change.note_id, 'cursor':change.id}))
+        pipe.execute()
+    except Exception:
+        logger.exception("note events could not be published")
+
+
+class EventHub:
+    """
+        Summary:
+        --------
+            One pattern subscription per process that dispatches note events to local listeners.
+        --------
+        Methods:
+            add : Registers a callback for events of a user and starts the listener thread.
+            remove : Unregisters a callback.
+    """
+    retry_delay = 1
+
+    def __init__(self):
+        self.listeners = {}
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def add(self, user_id, callback):
+        with self.lock:
+            self.listeners.setdefault(user_id, set()).add(callback)
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self.run, name='note-events', daemon=True)
+                self.thread.start()
+
+    def remove(self, user_id, callback):
+        with self.lock:
+            callbacks = self.listeners.get(user_id, set())
+            callbacks.discard(callback)
+            if not callbacks:
+                self.listeners.pop(user_id, None)
+
+    def dispatch(self, message):
+        channel = message['channel']
+        if isinstance(channel, bytes):
+            channel = channel.decode()
+        user_id = int(channel[len(CHANNEL_PREFIX):])
+        data = json.loads(message['data'])
+        with self.lock:
+            callbacks = list(self.listeners.get(user_id, ()))
+        for callback in callbacks:
+            callback(data)
+
+    def run(self):
+        while True:
+            try:
+                pubsub = get_redis_connection(settings.NOTE_EVENTS_REDIS).pubsub(ignore_subscribe_messages=True)
+                pubsub.psubscribe(CHANNEL_PREFIX+'*')
+                for message in pubsub.listen():
+                    if message['type'] == 'pmessage':
+                        self.dispatch(message)
+            except Exception:
+                logger.exception("note events listener lost its redis connection")
+                time.sleep(self.retry_delay)
+
+
+hub = EventHub()
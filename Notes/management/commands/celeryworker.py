@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from KeepNotes.celery import app
+
+
+class Command(BaseCommand):
+    """
+        Summary:
+        --------
+            Starts a celery worker consuming the queues of one profile of CELERY_WORKER_PROFILES
+            with its concurrency and prefetch multiplier.
+        --------
+        Example:
+            python manage.py celeryworker reminders
+            python manage.py celeryworker maintenance --loglevel warning
+    """
+    help = 'Starts a celery worker for one of the CELERY_WORKER_PROFILES'
+
+    def add_arguments(self, parser):
+        parser.add_argument('profile', choices=sorted(settings.CELERY_WORKER_PROFILES))
+        parser.add_argument('--concurrency', type=int, help='overrides the concurrency of the profile')
+        parser.add_argument('--loglevel', default='info')
+
+    def handle(self, *args, **options):
+        profile = settings.CELERY_WORKER_PROFILES[options['profile']]
+        concurrency = options['concurrency'] or profile['concurrency']
+        if concurrency < 1:
+            raise CommandError("concurrency must be at least 1")
+        app.conf.CELERYD_PREFETCH_MULTIPLIER = profile['prefetch']
+        app.worker_main(['worker', '-Q', ','.join(profile['queues']), '-c', str(concurrency),
+                         '-n', options['profile']+'@%h', '-l', options['loglevel'], '-Ofair'])
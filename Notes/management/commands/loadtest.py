@@ -0,0 +1,48 @@
+from concurrent.futures import ThreadPoolExecutor
+from django.core.management.base import BaseCommand
+from urllib.request import Request, urlopen
+import time
+
+
+class Command(BaseCommand):
+    """
+        Summary:
+        --------
+            Fires concurrent GET requests at one URL and reports throughput and latency,
+            used to compare the ASGI and WSGI deployments of the read endpoints.
+        --------
+        Example:
+            python manage.py loadtest http://127.0.0.1:8000/notes/notes/ --session <sessionid> -c 200 -n 5000
+    """
+    help = 'Fires concurrent GET requests at a URL and reports throughput and latency'
+
+    def add_arguments(self, parser):
+        parser.add_argument('url')
+        parser.add_argument('-c', '--concurrency', type=int, default=50)
+        parser.add_argument('-n', '--requests', type=int, default=1000)
+        parser.add_argument('--session', default='', help='sessionid cookie of a logged in user')
+        parser.add_argument('--timeout', type=float, default=30)
+
+    def fetch(self, url, session, timeout):
+        request = Request(url, headers={'Cookie':'sessionid='+session} if session else {})
+        start = time.perf_counter()
+        try:
+            with urlopen(request, timeout=timeout) as response:
+                response.read()
+                ok = response.status == 200
+        except Exception:
+            ok = False
+        return ok, time.perf_counter()-start
+
+    def handle(self, *args, **options):
+        url, session, timeout = options['url'], options['session'], options['timeout']
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+            results = list(executor.map(lambda i: self.fetch(url, session, timeout), range(options['requests'])))
+        elapsed = time.perf_counter()-start
+        latencies = sorted(latency for ok, latency in results)
+        errors = sum(1 for ok, latency in results if not ok)
+        percentile = lambda p: latencies[min(int(len(latencies)*p), len(latencies)-1)]*1000
+        self.stdout.write('requests: %d  concurrency: %d  errors: %d' % (len(results), options['concurrency'], errors))
+        self.stdout.write('throughput: %.1f req/s' % (len(results)/elapsed))
+        self.stdout.write('latency ms  p50: %.1f  p95: %.1f  p99: %.1f  max: %.1f' % (percentile(0.5), percentile(0.95), percentile(0.99), latencies[-1]*1000))
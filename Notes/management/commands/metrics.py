@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from KeepNotes import metrics
+
+
+class Command(BaseCommand):
+    """
+        Summary:
+        --------
+            Prints the counters of the metric groups, ex: runs, skipped, rows and duration_ms
+            of every periodic task.
+        --------
+        Example:
+            python manage.py metrics
+            python manage.py metrics 'tasks.*' --reset
+    """
+    help = 'Prints the counters recorded in the metric groups'
+
+    def add_arguments(self, parser):
+        parser.add_argument('pattern', nargs='?', default='*')
+        parser.add_argument('--reset', action='store_true', help='clears the groups after printing them')
+
+    def handle(self, *args, **options):
+        for group in metrics.groups(options['pattern']):
+            counters = metrics.read(group)
+            if counters.get('runs'):
+                counters['avg_ms'] = counters.get('duration_ms', 0) // counters['runs']
+            self.stdout.write(group+' '+' '.join(name+'='+str(value) for name, value in sorted(counters.items())))
+            if options['reset']:
+                metrics.reset(group)
@@ -0,0 +1,31 @@
+# Generated by Django 3.0.8 on 2026-10-19 21:58
+
+from django.db import migrations
+from django.db.models import Count, Min
+
+
+def merge_duplicate_labels(apps, schema_editor):
+    """
+        Folds labels sharing the same owner and name into the oldest one,
+        so that the unique constraint can be created.
+    """
+    Labels = apps.get_model('Notes', 'Labels')
+    Notes = apps.get_model('Notes', 'Notes')
+    through = Notes.label.through
+    duplicates = Labels.objects.values('owner_id', 'name').annotate(keep=Min('id'), count=Count('id')).filter(count__gt=1)
+    for duplicate in duplicates:
+        others = Labels.objects.filter(owner_id=duplicate['owner_id'], name=duplicate['name']).exclude(id=duplicate['keep'])
+        note_ids = set(through.objects.filter(labels_id__in=others).values_list('notes_id', flat=True))
+        through.objects.bulk_create([through(notes_id=note_id, labels_id=duplicate['keep']) for note_id in note_ids], ignore_conflicts=True)
+        others.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Notes', '0020_notes_reminder'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_labels, migrations.RunPython.noop),
+    ]
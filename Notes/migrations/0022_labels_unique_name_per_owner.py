@@ -0,0 +1,17 @@
+# Generated by Django 3.0.8 on 2026-10-19 21:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Notes', '0021_merge_duplicate_labels'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='labels',
+            constraint=models.UniqueConstraint(fields=('owner', 'name'), name='unique_label_name_per_owner'),
+        ),
+    ]
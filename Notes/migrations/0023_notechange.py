@@ -0,0 +1,31 @@
+# Generated by Django 3.0.8 on 2026-10-19 22:01
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0004_auto_20210107_2349'),
+        ('Notes', '0022_labels_unique_name_per_owner'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NoteChange',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('note_id', models.IntegerField()),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='authentication.User')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='notechange',
+            index=models.Index(fields=['user', 'id'], name='Notes_notec_user_id_3ba9e8_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notechange',
+            index=models.Index(fields=['note_id'], name='Notes_notec_note_id_aabbc1_idx'),
+        ),
+    ]
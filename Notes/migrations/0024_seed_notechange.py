@@ -0,0 +1,26 @@
+# Generated by Django 3.0.8 on 2026-10-19 22:01
+
+from django.db import migrations
+
+
+def seed_note_changes(apps, schema_editor):
+    """
+        Records one change per existing note for its owner and collaborators,
+        so that a first sync from cursor 0 returns the whole collection.
+    """
+    Notes = apps.get_model('Notes', 'Notes')
+    NoteChange = apps.get_model('Notes', 'NoteChange')
+    pairs = set(Notes.objects.values_list('id', 'owner_id'))
+    pairs.update(Notes.collaborator.through.objects.values_list('notes_id', 'user_id'))
+    NoteChange.objects.bulk_create([NoteChange(note_id=note_id, user_id=user_id) for note_id, user_id in sorted(pairs)], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Notes', '0023_notechange'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_note_changes, migrations.RunPython.noop),
+    ]
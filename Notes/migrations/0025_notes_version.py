@@ -0,0 +1,18 @@
+# Generated by Django 3.0.8 on 2026-10-19 22:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Notes', '0024_seed_notechange'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notes',
+            name='version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.0.8 on 2026-10-19 22:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Notes', '0025_notes_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notes',
+            name='isPinned',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 3.0.8 on 2026-10-19 22:11
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Notes', '0026_notes_ispinned'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NoteBody',
+            fields=[
+                ('note', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, serialize=False, to='Notes.Notes')),
+                ('data', models.BinaryField()),
+                ('size', models.PositiveIntegerField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='notes',
+            name='isCompressed',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AlterField(
+            model_name='notes',
+            name='content',
+            field=models.TextField(),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 3.0.8 on 2026-10-19 22:11
+
+from django.conf import settings
+from django.db import migrations
+from django.db.models.functions import Length
+import zlib
+
+
+def compress_large_notes(apps, schema_editor):
+    """
+        Moves bodies above NOTES_COMPRESS_THRESHOLD into compressed NoteBody rows
+        and keeps only a preview in the notes table.
+    """
+    Notes = apps.get_model('Notes', 'Notes')
+    NoteBody = apps.get_model('Notes', 'NoteBody')
+    notes = Notes.objects.annotate(length=Length('content')).filter(length__gt=settings.NOTES_COMPRESS_THRESHOLD)
+    for note in notes.only('id', 'content').iterator():
+        NoteBody.objects.create(note_id=note.id, data=zlib.compress(note.content.encode(), settings.NOTES_COMPRESS_LEVEL), size=len(note.content))
+        Notes.objects.filter(id=note.id).update(content=note.content[:settings.NOTES_PREVIEW_LENGTH], isCompressed=True)
+
+
+def decompress_notes(apps, schema_editor):
+    Notes = apps.get_model('Notes', 'Notes')
+    NoteBody = apps.get_model('Notes', 'NoteBody')
+    for body in NoteBody.objects.iterator():
+        Notes.objects.filter(id=body.note_id).update(content=zlib.decompress(body.data).decode(), isCompressed=False)
+    NoteBody.objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Notes', '0027_notebody'),
+    ]
+
+    operations = [
+        migrations.RunPython(compress_large_notes, decompress_notes),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 3.0.8 on 2026-10-19 22:18
+
+from django.db import migrations
+import json
+import zlib
+
+
+def seed_note_revisions(apps, schema_editor):
+    """
+        Stores one snapshot revision per existing note at its current version,
+        so that later edits are recorded as deltas against it.
+    """
+    Notes = apps.get_model('Notes', 'Notes')
+    NoteBody = apps.get_model('Notes', 'NoteBody')
+    NoteRevision = apps.get_model('Notes', 'NoteRevision')
+    revisions = []
+    for note in Notes.objects.only('id', 'title', 'content', 'isCompressed', 'owner_id', 'version').iterator():
+        body = zlib.decompress(NoteBody.objects.get(note_id=note.id).data).decode() if note.isCompressed else note.content
+        data = {'title': note.title, 'body': body}
+        revisions.append(NoteRevision(note_id=note.id, number=note.version, author_id=note.owner_id, isSnapshot=True, data=zlib.compress(json.dumps(data, separators=(',', ':')).encode())))
+        if len(revisions) == 500:
+            NoteRevision.objects.bulk_create(revisions)
+            revisions = []
+    NoteRevision.objects.bulk_create(revisions)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Notes', '0029_noterevision'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_note_revisions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 3.0.8 on 2026-10-19 22:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Notes', '0032_notification'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notes',
+            name='reminderRule',
+            field=models.CharField(blank=True, default='', max_length=100),
+        ),
+        migrations.AlterField(
+            model_name='notes',
+            name='reminder',
+            field=models.DateTimeField(blank=True, db_index=True, default=None, null=True),
+        ),
+    ]
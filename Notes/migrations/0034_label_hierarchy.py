@@ -0,0 +1,35 @@
+# Generated by Django 3.0.8 on 2026-10-19 22:38
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import Value
+from django.db.models.functions import Cast, Concat
+
+
+def set_root_paths(apps, schema_editor):
+    """
+        Existing labels have no parent, their path is /<id>/
+    """
+    Labels = apps.get_model('Notes', 'Labels')
+    Labels.objects.update(path=Concat(Value('/'), Cast('id', models.CharField()), Value('/')))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Notes', '0033_recurring_reminder'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='labels',
+            name='parent',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='children', to='Notes.Labels'),
+        ),
+        migrations.AddField(
+            model_name='labels',
+            name='path',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=255),
+        ),
+        migrations.RunPython(set_root_paths, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 3.0.8 on 2026-10-19 23:05
+
+from django.db import migrations, models
+import zlib
+
+
+def set_terms(apps, schema_editor):
+    """
+        Stores the distinct lower case words of every compressed body
+    """
+    NoteBody = apps.get_model('Notes', 'NoteBody')
+    for body in NoteBody.objects.only('note_id', 'data').iterator():
+        text = zlib.decompress(body.data).decode()
+        NoteBody.objects.filter(note_id=body.note_id).update(terms=' '.join(sorted(set(text.lower().split()))))
+
+
+def add_trigram_index(apps, schema_editor):
+    """
+        On postgres the substring match of search is served by a trigram index
+    """
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        schema_editor.execute('CREATE INDEX "Notes_notebody_terms_trgm" ON "Notes_notebody" USING gin ("terms" gin_trgm_ops)')
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS "Notes_notebody_terms_trgm"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Notes', '0034_label_hierarchy'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notebody',
+            name='terms',
+            field=models.TextField(default=''),
+        ),
+        migrations.RunPython(set_terms, migrations.RunPython.noop),
+        migrations.RunPython(add_trigram_index, drop_trigram_index),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 3.0.8 on 2026-10-19 23:40
+
+from django.db import migrations
+
+
+def repair_paths(apps, schema_editor):
+    """
+        Labels created by name were stored without a path, it is rebuilt from the parents of
+        every label whose path does not start with /
+    """
+    Labels = apps.get_model('Notes', 'Labels')
+    parents = dict(Labels.objects.values_list('id', 'parent_id'))
+    for label_id in Labels.objects.exclude(path__startswith='/').values_list('id', flat=True):
+        ids = [label_id]
+        while parents[ids[-1]] is not None:
+            ids.append(parents[ids[-1]])
+        Labels.objects.filter(id=label_id).update(path='/'+''.join(str(id)+'/' for id in reversed(ids)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Notes', '0035_notebody_terms'),
+    ]
+
+    operations = [
+        migrations.RunPython(repair_paths, migrations.RunPython.noop),
+    ]
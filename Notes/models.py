@@ -1,33 +1,686 @@
-from django.db import models
+from django.db import connection, models, transaction
+from django.db.models.functions import Cast, Concat, Substr
+from django.conf import settings
+from django.core.cache import cache
 from authentication.models import User
 from django.contrib.postgres.fields import JSONField
+from KeepNotes.storage import content_storage
+from Notes import events, revisions
+import hashlib
+import mmap
+import os
+import uuid
+import zlib
 
 # Create your models here.
+class LabelsManager(models.Manager):
+
+    def resolve(self, owner, names):
+        """
+            Args:
+                owner : [user owning the labels]
+                names : [label names to resolve]
+            Returns:
+                [queryset]: [labels of owner with given names, missing ones are created
+                             by a single INSERT ... ON CONFLICT DO NOTHING]
+            bulk_create skips Labels.save, the created labels are roots and get their path
+            /<id>/ from one UPDATE.
+        """
+        names = list(dict.fromkeys(names))
+        with transaction.atomic():
+            self.bulk_create([self.model(name=name, owner=owner) for name in names], ignore_conflicts=True)
+            self.filter(owner=owner, name__in=names, path='').update(path=Concat(models.Value('/'), Cast('id', models.CharField()), models.Value('/')))
+        return self.filter(owner=owner, name__in=names)
+
+    def subtrees(self, labels):
+        """
+            Args:
+                labels : [labels of one owner]
+            Returns:
+                [queryset]: [labels and every label of their owner nested under them, found by prefix
+                             scans of the path index]
+            Raises:
+                ValueError : [a label has no path, its prefix would match every label]
+        """
+        paths = models.Q()
+        for label in labels:
+            if not label.path:
+                raise ValueError(label.id)
+            paths |= models.Q(path__startswith=label.path)
+        return self.filter(paths, owner_id=labels[0].owner_id)
+
+    def subtree(self, label):
+        """
+            Returns:
+                [queryset]: [label and every label nested under it, found by one prefix scan of the path index]
+        """
+        return self.subtrees([label])
+
+    def with_counts(self, owner):
+        """
+            Returns:
+                [queryset]: [labels of owner annotated with noteCount, the number of their active
+                             notes, computed for all labels by one aggregate query]
+        """
+        active = models.Q(notes__isDelete=False, notes__isArchive=False)
+        return self.filter(owner=owner).annotate(noteCount=models.Count('notes', filter=active, distinct=True)).order_by('id')
+
+    def merge(self, target, sources):
+        """
+            Args:
+                target : [label kept]
+                sources : [labels of the same owner merged into target, none of them holds target]
+            Returns:
+                [list]: [ids of the notes that were relabeled]
+            Copies the note rows of all sources to target with one INSERT ... SELECT, moves the
+            labels nested under the sources below target and deletes the sources, all in one
+            transaction. Notes already labeled with target are left alone.
+        """
+        through = Notes.label.through
+        table, note_column, label_column = (connection.ops.quote_name(name) for name in (through._meta.db_table, 'notes_id', 'labels_id'))
+        source_ids = [source.id for source in sources]
+        with transaction.atomic():
+            note_ids = list(through.objects.filter(labels_id__in=source_ids).values_list('notes_id', flat=True).distinct())
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "INSERT INTO "+table+" ("+note_column+", "+label_column+") SELECT DISTINCT "+note_column+", %s FROM "+table+
+                    " WHERE "+label_column+" IN ("+", ".join(["%s"]*len(source_ids))+") ON CONFLICT DO NOTHING", [target.id]+source_ids)
+            through.objects.filter(labels_id__in=source_ids).delete()
+            self.filter(parent_id__in=source_ids).update(parent=target)
+            # deepest sources first, so labels under a source nested in another source get target as parent in their path too
+            for source in sorted(sources, key=lambda source: -len(source.path)):
+                self.subtree(source).exclude(id=source.id).update(path=Concat(models.Value(target.path), Substr('path', len(source.path)+1)))
+            self.filter(id__in=source_ids).delete()
+            NoteChange.objects.record(note_ids)
+        return note_ids
+
+    def delete_labels(self, labels):
+        """
+            Args:
+                labels : [labels of one owner to delete with every label nested under them]
+            Returns:
+                [list]: [ids of the notes that lost a label]
+            Deletes the note rows of all labels with one DELETE before the labels themselves.
+        """
+        through = Notes.label.through
+        with transaction.atomic():
+            label_ids = list(self.subtrees(labels).values_list('id', flat=True))
+            note_ids = list(through.objects.filter(labels_id__in=label_ids).values_list('notes_id', flat=True).distinct())
+            through.objects.filter(labels_id__in=label_ids).delete()
+            self.filter(id__in=label_ids).delete()
+            NoteChange.objects.record(note_ids)
+        return note_ids
+
+
 class Labels(models.Model):
     name = models.TextField(db_index=True)
     owner=models.ForeignKey(to=User, on_delete=models.CASCADE)
     date = models.DateTimeField(auto_now_add=True, null=False, blank=False)
+    parent = models.ForeignKey(to='self', on_delete=models.CASCADE, null=True, blank=True, related_name='children')
+    path = models.CharField(max_length=255, db_index=True, default='', editable=False)
+
+    objects = LabelsManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['owner', 'name'], name='unique_label_name_per_owner'),
+        ]
 
     def get_name(self):
         return self.name
 
+    @staticmethod
+    def counts_key(user_id):
+        """
+            Args:
+                user_id : [id of label owner]
+            Returns:
+                [str]: [cache key of the labels of user with their note counts]
+        """
+        return "labels-counts-"+str(user_id)
+
+    def save(self, *args, **kwargs):
+        """
+            Keeps the materialized path /<root id>/.../<id>/ of the label and, when the label
+            moves to another parent, rewrites the paths of its whole subtree with one update.
+        """
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            path = (Labels.objects.get(id=self.parent_id).path if self.parent_id else '/')+str(self.id)+'/'
+            if path != self.path:
+                if self.path:
+                    Labels.objects.subtree(self).update(path=Concat(models.Value(path), Substr('path', len(self.path)+1)))
+                else:
+                    Labels.objects.filter(id=self.id).update(path=path)
+                self.path = path
+
     def __str__(self):
         return self.name
 
+class NotesManager(models.Manager):
+
+    def add_labels(self, note_ids, label_ids):
+        """
+            Args:
+                note_ids : [ids of notes to be labeled]
+                label_ids : [ids of labels to add]
+            Inserts all missing note-label rows in one statement without touching the note rows.
+        """
+        through = self.model.label.through
+        rows = [through(notes_id=note_id, labels_id=label_id) for note_id in note_ids for label_id in label_ids]
+        through.objects.bulk_create(rows, ignore_conflicts=True)
+        NoteChange.objects.record(note_ids)
+
+    def add_collaborators(self, pairs):
+        """
+            Args:
+                pairs : [(note id, user id) pairs to share]
+            Inserts all missing note-collaborator rows in one statement without touching the note rows.
+        """
+        through = self.model.collaborator.through
+        rows = [through(notes_id=note_id, user_id=user_id) for note_id, user_id in pairs]
+        through.objects.bulk_create(rows, ignore_conflicts=True)
+        NoteChange.objects.record({row.notes_id for row in rows})
+
+    def in_labels(self, user, labels, match_all=False):
+        """
+            Args:
+                user : [logged in user]
+                labels : [labels of user, notes with a label nested under one of them match it as well]
+                match_all : [True to require every label, False for any of them]
+            Returns:
+                [queryset]: [active notes owned by or shared with user having the labels]
+        """
+        notes = self.filter(models.Q(owner=user)|models.Q(collaborator=user), isArchive=False, isDelete=False)
+        if match_all:
+            for label in labels:
+                notes = notes.filter(label__path__startswith=label.path)
+        else:
+            paths = models.Q()
+            for label in labels:
+                paths |= models.Q(path__startswith=label.path)
+            notes = notes.filter(label__in=Labels.objects.filter(paths, owner=user))
+        return notes.distinct()
+
+    def audience(self, note_ids):
+        """
+            Args:
+                note_ids : [ids of notes]
+            Returns:
+                [set]: [(note id, user id) pairs for the owner and every collaborator of the notes]
+        """
+        pairs = set(self.filter(id__in=note_ids).values_list('id', 'owner_id'))
+        pairs.update(self.model.collaborator.through.objects.filter(notes_id__in=note_ids).values_list('notes_id', 'user_id'))
+        return pairs
+
+    def update_versioned(self, note_id, version, fields, author=None):
+        """
+            Args:
+                note_id : [id of note]
+                version : [version the changes are based on]
+                fields : [changed field values]
+                author : [user making the changes, recorded with the revision of a title or body change]
+            Returns:
+                [int]: [new version written by a single UPDATE ... WHERE id AND version,
+                        None when the note is no longer at the given version]
+        """
+        fields = dict(fields)
+        body = fields.pop('body', None)
+        if body is not None:
+            fields.update(self.model.content_fields(body))
+        with transaction.atomic():
+            if not self.filter(id=note_id, version=version).update(version=models.F('version')+1, **fields):
+                return None
+            if body is not None:
+                NoteBody.objects.store(note_id, body if fields['isCompressed'] else None)
+            if body is not None or 'title' in fields:
+                note = self.get(id=note_id)
+                NoteRevision.objects.record(note_id, version+1, note.title, body if body is not None else note.body, author)
+        NoteChange.objects.record([note_id])
+        return version+1
+
+    def update_state(self, note_id, owner, fields, active_only=False):
+        """
+            Args:
+                note_id : [id of note]
+                owner : [user who must own the note]
+                fields : [state field values to set]
+                active_only : [true if trashed notes must not be changed]
+            Returns:
+                [bool]: [true if the note was changed by a single UPDATE under the ownership predicate]
+        """
+        notes = self.filter(id=note_id, owner=owner)
+        if active_only:
+            notes = notes.filter(isDelete=False)
+        if not notes.update(version=models.F('version')+1, **fields):
+            return False
+        NoteChange.objects.record([note_id])
+        return True
+
+    def search(self, user, query):
+        """
+            Args:
+                user : [logged in user]
+                query : [word to search]
+            Returns:
+                [queryset]: [active notes of user having query in title or content, bodies of
+                             compressed notes are matched on the words stored next to them]
+        """
+        return self.filter(models.Q(owner=user)|models.Q(collaborator=user), isArchive=False, isDelete=False).filter(
+            models.Q(title__icontains=query)|models.Q(content__icontains=query)|
+            models.Q(isCompressed=True, notebody__terms__contains=query.lower())).distinct()
+
+
 class Notes(models.Model):
     title=models.TextField()
-    content=models.TextField(db_index=True)
+    content=models.TextField()
     owner=models.ForeignKey(to=User, on_delete=models.CASCADE)
     label = models.ManyToManyField(to=Labels)
     isArchive = models.BooleanField(default=False)
     isDelete = models.BooleanField(default=False)
+    isPinned = models.BooleanField(default=False)
     trashedAt = models.DateTimeField(default=None, null=True, blank=True)
     date = models.DateTimeField(auto_now_add=True, null=False, blank=False)
-    reminder = models.DateTimeField(default=None, null=True, blank=True)
+    reminder = models.DateTimeField(default=None, null=True, blank=True, db_index=True)
+    reminderRule = models.CharField(max_length=100, blank=True, default='')
     collaborator = models.ManyToManyField(to=User, related_name='collaborator')
+    version = models.PositiveIntegerField(default=1)
+    isCompressed = models.BooleanField(default=False)
+
+    objects = NotesManager()
+
+    _body = None
+    _body_changed = False
+
+    @staticmethod
+    def content_fields(body):
+        """
+            Args:
+                body : [full text of note]
+            Returns:
+                [dict]: [content and isCompressed values of the note row, bodies above
+                         NOTES_COMPRESS_THRESHOLD keep only a preview in content]
+        """
+        if len(body) > settings.NOTES_COMPRESS_THRESHOLD:
+            return {'content': body[:settings.NOTES_PREVIEW_LENGTH], 'isCompressed': True}
+        return {'content': body, 'isCompressed': False}
+
+    @property
+    def body(self):
+        """
+            Returns:
+                [str]: [full text of note, compressed bodies are loaded on first access]
+        """
+        if self._body is None:
+            self._body = self.notebody.text if self.isCompressed else self.content
+        return self._body
+
+    @body.setter
+    def body(self, body):
+        for field, value in self.content_fields(body).items():
+            setattr(self, field, value)
+        self._body = body
+        self._body_changed = True
+
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if self._body_changed:
+                NoteBody.objects.store(self.id, self._body if self.isCompressed else None)
+                self._body_changed = False
+            if adding:
+                NoteRevision.objects.record(self.id, self.version, self.title, self.body, self.owner_id)
+
+    @staticmethod
+    def cache_key(note_id):
+        """
+            Args:
+                note_id : [id of note]
+            Returns:
+                [str]: [cache key of the serialized note, shared by all users of the note]
+        """
+        return "notes-data-"+str(note_id)
+
+    @staticmethod
+    def search_generation_key(user_id):
+        """
+            Args:
+                user_id : [id of user]
+            Returns:
+                [str]: [cache key of the generation of the cached searches of user]
+        """
+        return "search-generation-"+str(user_id)
+
+    @staticmethod
+    def search_generation(user_id):
+        """
+            Args:
+                user_id : [id of user]
+            Returns:
+                [str]: [generation the search keys of user are made with, NoteChange.objects.record
+                        deletes it when a note of user changes so the next search starts a new one]
+        """
+        key = Notes.search_generation_key(user_id)
+        generation = cache.get(key)
+        if generation is None:
+            cache.add(key, uuid.uuid4().hex, None)
+            generation = cache.get(key)
+        return generation
 
     def get_content(self):
         return self.content
 
     def get_owner(self):
-        return self.owner
\ No newline at end of file
+        return self.owner
+
+
+def search_terms(body):
+    """
+        Returns:
+            [str]: [distinct lower case words of body, compressed bodies are searched on them in SQL]
+    """
+    return ' '.join(sorted(set(body.lower().split())))
+
+
+class NoteBodyManager(models.Manager):
+
+    def store(self, note_id, body):
+        """
+            Args:
+                note_id : [id of note]
+                body : [full text to compress, None if the note is not compressed anymore]
+        """
+        if body is None:
+            self.filter(note_id=note_id).delete()
+        else:
+            self.update_or_create(note_id=note_id, defaults={'data': zlib.compress(body.encode(), settings.NOTES_COMPRESS_LEVEL), 'size': len(body), 'terms': search_terms(body)})
+
+
+class NoteBody(models.Model):
+    note = models.OneToOneField(to=Notes, on_delete=models.CASCADE, primary_key=True)
+    data = models.BinaryField()
+    size = models.PositiveIntegerField()
+    terms = models.TextField(default='')
+
+    objects = NoteBodyManager()
+
+    @property
+    def text(self):
+        return zlib.decompress(self.data).decode()
+
+
+class NoteRevisionManager(models.Manager):
+
+    def chain(self, note_id, number=None):
+        """
+            Args:
+                note_id : [id of note]
+                number : [last revision number wanted, None for the latest revision]
+            Returns:
+                [list]: [nearest snapshot before number followed by the deltas up to number, at most
+                         NOTE_REVISION_SNAPSHOT_INTERVAL revisions]
+        """
+        revisions = self.filter(note_id=note_id)
+        if number is not None:
+            revisions = revisions.filter(number__lte=number)
+        snapshot = revisions.filter(isSnapshot=True).order_by('-number').values('number')[:1]
+        return list(revisions.filter(number__gte=models.Subquery(snapshot)).order_by('number'))
+
+    def rebuild(self, chain):
+        """
+            Args:
+                chain : [revisions returned by chain]
+            Returns:
+                [tuple]: [title and body of the last revision of chain]
+        """
+        title, body = None, None
+        for revision in chain:
+            data = revisions.unpack(revision.data)
+            title = data.get('title', title)
+            if revision.isSnapshot:
+                body = data['body']
+            elif 'body' in data:
+                body = revisions.patch(body, data['body'])
+        return title, body
+
+    def record(self, note_id, number, title, body, author=None):
+        """
+            Args:
+                note_id : [id of note]
+                number : [revision number, the version of note it belongs to]
+                title : [title of note at this revision]
+                body : [full text of note at this revision]
+                author : [user or user id making the change]
+            Stores the changed title and a token delta of the body against the previous revision, or a
+            full snapshot every NOTE_REVISION_SNAPSHOT_INTERVAL revisions.
+        """
+        chain = self.chain(note_id)
+        if not chain or len(chain) >= settings.NOTE_REVISION_SNAPSHOT_INTERVAL:
+            data, snapshot = {'title': title, 'body': body}, True
+        else:
+            old_title, old_body = self.rebuild(chain)
+            data, snapshot = {}, False
+            if title != old_title:
+                data['title'] = title
+            if body != old_body:
+                data['body'] = revisions.diff(old_body, body)
+        author = getattr(author, 'id', author)
+        return self.create(note_id=note_id, number=number, author_id=author, isSnapshot=snapshot, data=revisions.pack(data))
+
+    def get_revision(self, note_id, number):
+        """
+            Args:
+                note_id : [id of note]
+                number : [revision number]
+            Returns:
+                [NoteRevision]: [revision carrying its rebuilt title and body, None if it does not exist]
+        """
+        chain = self.chain(note_id, number)
+        if not chain or chain[-1].number != number:
+            return None
+        revision = chain[-1]
+        revision.title, revision.body = self.rebuild(chain)
+        return revision
+
+    def prune(self, before):
+        """
+            Args:
+                before : [datetime, revisions older than it may be deleted]
+            Returns:
+                [int]: [number of deleted revisions, only revisions before the latest snapshot older than
+                        before are deleted so every kept revision can still be rebuilt]
+        """
+        snapshot = self.filter(note_id=models.OuterRef('note_id'), isSnapshot=True, date__lt=before).order_by('-number').values('number')[:1]
+        deleted, _ = self.filter(number__lt=models.Subquery(snapshot)).delete()
+        return deleted
+
+
+class NoteRevision(models.Model):
+    note = models.ForeignKey(to=Notes, on_delete=models.CASCADE, related_name='revisions')
+    number = models.PositiveIntegerField()
+    author = models.ForeignKey(to=User, on_delete=models.SET_NULL, null=True, related_name='+')
+    isSnapshot = models.BooleanField(default=False)
+    data = models.BinaryField()
+    date = models.DateTimeField(auto_now_add=True)
+
+    objects = NoteRevisionManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['note', 'number'], name='unique_revision_number_per_note'),
+        ]
+
+    def __str__(self):
+        return str(self.number)
+
+
+class AttachmentManager(models.Manager):
+
+    def visible_to(self, user):
+        """
+            Args:
+                user : [logged in user]
+            Returns:
+                [queryset]: [attachments of active or archived notes owned by or shared with user]
+        """
+        return self.filter(models.Q(note__owner=user)|models.Q(note__collaborator=user), note__isDelete=False).distinct()
+
+    def stale(self, before):
+        """
+            Args:
+                before : [datetime, uploads without a chunk since then are stale]
+            Returns:
+                [queryset]: [incomplete uploads not written to since before]
+        """
+        return self.filter(isComplete=False, updatedAt__lt=before)
+
+
+class Attachment(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    note = models.ForeignKey(to=Notes, on_delete=models.CASCADE, related_name='attachments')
+    owner = models.ForeignKey(to=User, on_delete=models.CASCADE)
+    name = models.CharField(max_length=255)
+    contentType = models.CharField(max_length=100, blank=True)
+    size = models.BigIntegerField()
+    received = models.BigIntegerField(default=0)
+    sha256 = models.CharField(max_length=64, blank=True)
+    file = models.FileField(upload_to='attachments/', storage=content_storage, max_length=255, blank=True)
+    isComplete = models.BooleanField(default=False)
+    date = models.DateTimeField(auto_now_add=True)
+    updatedAt = models.DateTimeField(auto_now=True)
+
+    objects = AttachmentManager()
+
+    def part_path(self):
+        """
+            Returns:
+                [str]: [path of the file receiving the chunks of an incomplete upload]
+        """
+        return content_storage.path(os.path.join(content_storage.temporary_folder, 'attachments', str(self.id)+'.part'))
+
+    def digest(self):
+        """
+            Returns:
+                [str]: [sha256 of the received file, read through a memory map so large files are
+                        paged in by the kernel instead of copied into the worker]
+        """
+        with open(self.part_path(), 'rb') as file:
+            if not self.size:
+                return hashlib.sha256().hexdigest()
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return hashlib.sha256(data).hexdigest()
+
+    def __str__(self):
+        return self.name
+
+
+# First key of the per user advisory locks serializing change inserts, the user id is the second.
+# Ids come from a sequence when rows are inserted, a transaction taking a lower id and committing
+# after a higher one would let a client move its cursor past a change of its feed it never saw.
+CHANGE_FEED_LOCK = 2028
+
+
+class NoteChangeManager(models.Manager):
+
+    def record(self, note_ids=None, pairs=None):
+        """
+            Args:
+                note_ids : [ids of changed notes, their audience is looked up]
+                pairs : [(note id, user id) pairs to notify, used when notes are already gone]
+            Replaces the previous change row of every user and note with a new one, so the
+            feed holds at most one row per user and note and its size follows the churn.
+            Writers hold the CHANGE_FEED_LOCK of every user they notify until they commit, so the
+            ids of a feed are taken in commit order. The locks are taken in user id order so
+            writers of overlapping users do not deadlock.
+            The cached notes, label counts and search generations of the users are dropped and the
+            events are published once the transaction commits, so nobody reads or caches
+            uncommitted data.
+        """
+        if pairs is None:
+            pairs = Notes.objects.audience(list(note_ids or []))
+        if not pairs:
+            return
+        users_by_note = {}
+        for note_id, user_id in pairs:
+            users_by_note.setdefault(note_id, set()).add(user_id)
+        stale = models.Q()
+        for note_id, user_ids in users_by_note.items():
+            stale |= models.Q(note_id=note_id, user_id__in=user_ids)
+        user_ids = sorted({user_id for note_id, user_id in pairs})
+        with transaction.atomic():
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT pg_advisory_xact_lock(%s, id) FROM (SELECT unnest(%s::int[]) AS id ORDER BY id) AS ids", [CHANGE_FEED_LOCK, user_ids])
+            self.filter(stale).delete()
+            changes = self.bulk_create([self.model(note_id=note_id, user_id=user_id) for note_id, user_id in sorted(pairs)])
+        keys = [Notes.cache_key(note_id) for note_id in users_by_note]+[Labels.counts_key(user_id) for user_id in user_ids]
+        keys += [Notes.search_generation_key(user_id) for user_id in user_ids]
+        transaction.on_commit(lambda: cache.delete_many(keys))
+        transaction.on_commit(lambda: events.publish(changes))
+
+    def since(self, user, cursor):
+        """
+            Args:
+                user : [user reading the feed]
+                cursor : [id of the last change already seen]
+            Returns:
+                [queryset]: [changes of user after cursor in sequence order]
+        """
+        return self.filter(user=user, id__gt=cursor).order_by('id')
+
+
+class NoteChange(models.Model):
+    id = models.BigAutoField(primary_key=True)
+    user = models.ForeignKey(to=User, on_delete=models.CASCADE)
+    note_id = models.IntegerField()
+
+    objects = NoteChangeManager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'id']),
+            models.Index(fields=['note_id']),
+        ]
+
+    def __str__(self):
+        return str(self.note_id)
+
+
+class NotificationManager(models.Manager):
+
+    def fan_out(self, notes):
+        """
+            Args:
+                notes : [dicts with id, title and reminder of due notes]
+            Returns:
+                [dict]: [due notes of every recipient by user id]
+            Resolves the owner and collaborators of all notes in one lookup and stores the
+            notifications of the whole batch with one insert.
+        """
+        notes = {note['id']: note for note in notes}
+        pairs = sorted(Notes.objects.audience(list(notes)))
+        self.bulk_create([self.model(user_id=user_id, note_id=note_id, reminder=notes[note_id]['reminder']) for note_id, user_id in pairs])
+        recipients = {}
+        for note_id, user_id in pairs:
+            recipients.setdefault(user_id, []).append(notes[note_id])
+        return recipients
+
+
+class Notification(models.Model):
+    id = models.BigAutoField(primary_key=True)
+    user = models.ForeignKey(to=User, on_delete=models.CASCADE, related_name='notifications')
+    note = models.ForeignKey(to=Notes, on_delete=models.CASCADE, related_name='+')
+    reminder = models.DateTimeField()
+    isRead = models.BooleanField(default=False)
+    date = models.DateTimeField(auto_now_add=True)
+
+    objects = NotificationManager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'isRead', 'id']),
+        ]
+
+    def __str__(self):
+        return str(self.note_id)
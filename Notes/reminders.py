@@ -0,0 +1,68 @@
+from crontab import CronSlices
+from datetime import datetime, timedelta
+
+ALIASES = {'hourly', 'daily', 'weekly', 'monthly', 'yearly', 'annually'}
+
+# Longest gap between two fire times of a satisfiable rule, ex: 0 0 29 2 * fires in leap years only
+SEARCH_DAYS = 8*366
+
+
+class InvalidRule(ValueError):
+    pass
+
+
+def normalize(rule):
+    """
+        Args:
+            rule : [cron expression of five fields, or hourly, daily, weekly, monthly, yearly]
+        Returns:
+            [str]: [rule as stored in Notes.reminderRule, aliases get their @ prefix]
+        Raises:
+            InvalidRule : [rule is not a valid cron expression or never fires]
+    """
+    rule = ' '.join(rule.split())
+    if rule.lstrip('@').lower() in ALIASES:
+        rule = '@'+rule.lstrip('@').lower()
+    if rule == '@reboot' or not CronSlices.is_valid(rule):
+        raise InvalidRule("Invalid reminder rule")
+    if next_fire(rule, datetime.now()) is None:
+        raise InvalidRule("Reminder rule never fires")
+    return rule
+
+
+def expand(rule):
+    """
+        Returns:
+            [tuple]: [sets of minutes, hours, days of month, months and weekdays (0 is sunday) of rule,
+                      and whether days of month and weekdays are both restricted]
+    """
+    slices = CronSlices(rule)
+    minutes, hours, days, months, weekdays = (set(values) for values in slices)
+    weekdays = {weekday % 7 for weekday in weekdays}
+    either = str(slices[2]) != '*' and str(slices[4]) != '*'
+    return minutes, hours, days, months, weekdays, either
+
+
+def next_fire(rule, after):
+    """
+        Args:
+            rule : [normalized reminder rule]
+            after : [time the next fire has to follow]
+        Returns:
+            [datetime]: [first minute after the given time matching rule, None if there is none.
+                         Like cron, a rule restricting both days of month and weekdays fires on either]
+    """
+    minutes, hours, days, months, weekdays, either = expand(rule)
+    start = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+    day = start.replace(hour=0, minute=0)
+    for _ in range(SEARCH_DAYS):
+        weekday = (day.weekday() + 1) % 7
+        day_matches = (day.day in days or weekday in weekdays) if either else (day.day in days and weekday in weekdays)
+        if day.month in months and day_matches:
+            for hour in sorted(hours):
+                for minute in sorted(minutes):
+                    fire = day.replace(hour=hour, minute=minute)
+                    if fire >= start:
+                        return fire
+        day += timedelta(days=1)
+    return None
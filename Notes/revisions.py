@@ -0,0 +1,55 @@
+from difflib import SequenceMatcher
+import json
+import re
+import zlib
+
+TOKEN = re.compile(r'\s+|\S+\s*')
+
+
+def tokens(text):
+    """
+        Args:
+            text : [note text]
+        Returns:
+            [list]: [words with their trailing whitespace, joining them gives back text]
+    """
+    return TOKEN.findall(text)
+
+
+def diff(old, new):
+    """
+        Args:
+            old : [previous text]
+            new : [changed text]
+        Returns:
+            [list]: [[start, end, replacement] operations on the tokens of old, only changed ranges are kept]
+    """
+    old_tokens, new_tokens = tokens(old), tokens(new)
+    opcodes = SequenceMatcher(None, old_tokens, new_tokens, autojunk=False).get_opcodes()
+    return [[i1, i2, ''.join(new_tokens[j1:j2])] for tag, i1, i2, j1, j2 in opcodes if tag != 'equal']
+
+
+def patch(old, delta):
+    """
+        Args:
+            old : [previous text]
+            delta : [operations returned by diff]
+        Returns:
+            [str]: [changed text]
+    """
+    old_tokens = tokens(old)
+    parts, position = [], 0
+    for start, end, replacement in delta:
+        parts.extend(old_tokens[position:start])
+        parts.append(replacement)
+        position = end
+    parts.extend(old_tokens[position:])
+    return ''.join(parts)
+
+
+def pack(data):
+    return zlib.compress(json.dumps(data, separators=(',', ':')).encode())
+
+
+def unpack(data):
+    return json.loads(zlib.decompress(data).decode())
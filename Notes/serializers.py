@@ -1,14 +1,86 @@
 from rest_framework import serializers
-from Notes.models import Notes, Labels
+from django.db.models.functions import Substr
+from django.conf import settings
+from Notes.reminders import InvalidRule, normalize
+from Notes.models import Notes, Labels, NoteRevision, Attachment, Notification
 from authentication.models import User
 from datetime import datetime, timedelta
 
-class NotesSerializer(serializers.ModelSerializer):
+MAX_PREVIEW_LENGTH = 1000
+
+
+def parse_projection(params):
+    """
+        Args:
+            params : [query parameters of the request]
+        Returns:
+            [tuple]: [field names asked with fields=a,b (None for all) and preview length asked with preview=N (None for full content)]
+    """
+    fields = params.get('fields')
+    preview = params.get('preview', '')
+    fields = [field for field in fields.split(',') if field] if fields is not None else None
+    preview = min(int(preview), MAX_PREVIEW_LENGTH) if preview.isdigit() else None
+    return fields, preview
+
+
+class DynamicFieldsMixin:
+    """
+        Summary:
+        --------
+            This mixin keeps only the requested fields of a note serializer and serializes
+            content from a preview annotation computed by the database.
+        --------
+        Methods:
+            project : It restricts a notes queryset to the columns the kept fields read.
+    """
+
+    def __init__(self, *args, fields=None, preview=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.preview = preview
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+        if preview and 'content' in self.fields:
+            self.fields['content'] = serializers.CharField(source='preview', read_only=True)
+
+    def project(self, queryset):
+        """
+            Args:
+                queryset : [notes queryset to serialize]
+            Returns:
+                [queryset]: [queryset loading only needed columns, with preview annotation and prefetched relations]
+        """
+        model_fields = {field.name: field for field in Notes._meta.get_fields()}
+        model_fields.update({field.attname: field for field in Notes._meta.concrete_fields})
+        columns, related = {'id'}, []
+        for field in self.fields.values():
+            if field.source == 'body':
+                columns.update(['content', 'isCompressed'])
+            elif field.source in model_fields and model_fields[field.source].many_to_many:
+                related.append(field.source)
+            elif field.source in model_fields:
+                columns.add(model_fields[field.source].name)
+        queryset = queryset.only(*columns).prefetch_related(*related)
+        if self.preview:
+            queryset = queryset.annotate(preview=Substr('content', 1, self.preview))
+        return queryset
+
+
+class NotesSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    content = serializers.CharField(source='body')
     collaborator = serializers.StringRelatedField(many=True, read_only=True)
     label = serializers.StringRelatedField(many=True, read_only=True)
     class Meta:
         model= Notes
-        fields=['title','content','label','collaborator'] 
+        fields=['title','content','label','collaborator','isPinned','isCompressed','version'] 
+        extra_kwargs = {'isPinned': {'read_only': True}, 'isCompressed': {'read_only': True}}
+
+    def get_fields(self):
+        """ version is only accepted as the precondition of an update, a new note starts at its default """
+        fields = super().get_fields()
+        if self.instance is None:
+            fields['version'].read_only = True
+        return fields
 
         def validate(self, data):
             title = data.get('title','')
@@ -16,39 +88,68 @@ class NotesSerializer(serializers.ModelSerializer):
             return data
 
 
+class NotePreviewSerializer(NotesSerializer):
+    content = serializers.CharField(read_only=True)
+
+
 class LabelsSerializer(serializers.ModelSerializer):
     class Meta:
         model= Labels
-        fields=['name','owner']
+        fields=['id','name','owner','parent','path']
         extra_kwargs = {'owner':{'read_only':True}}
 
+    def validate_parent(self, parent):
+        if parent is None:
+            return parent
+        if parent.owner_id != self.context['request'].user.id:
+            raise serializers.ValidationError("Parent label does not exist!!")
+        if self.instance is not None and parent.path.startswith(self.instance.path):
+            raise serializers.ValidationError("Label can not be nested under itself!!")
+        if parent.path.count('/') > settings.LABEL_MAX_DEPTH:
+            raise serializers.ValidationError("Labels can not be nested deeper than "+str(settings.LABEL_MAX_DEPTH)+" levels!!")
+        return parent
+
+    def validate_name(self, name):
+        labels = Labels.objects.filter(owner=self.context['request'].user, name=name)
+        if self.instance is not None:
+            labels = labels.exclude(id=self.instance.id)
+        if labels.exists():
+            raise serializers.ValidationError("Label with this name already exists!!")
+        return name
 
 
-class ListNotesSerializer(serializers.ModelSerializer):
+
+class LabelCountSerializer(LabelsSerializer):
+    noteCount = serializers.IntegerField(read_only=True)
+    class Meta(LabelsSerializer.Meta):
+        fields = LabelsSerializer.Meta.fields+['noteCount']
+
+
+class ListNotesSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     label = serializers.StringRelatedField(many=True, read_only=True)
     collaborator = serializers.StringRelatedField(many=True, read_only=True)
     class Meta:
         model = Notes
-        fields=['owner','title','content','label','collaborator','reminder']
-        extra_kwargs = {'owner': {'read_only': True}, 'title': {'read_only': True}, 'content': {'read_only': True}, 'reminder': {'read_only': True}}
+        fields=['owner','title','content','label','collaborator','reminder','reminderRule','isCompressed']
+        extra_kwargs = {'owner': {'read_only': True}, 'title': {'read_only': True}, 'content': {'read_only': True}, 'reminder': {'read_only': True}, 'reminderRule': {'read_only': True}, 'isCompressed': {'read_only': True}}
 
 
-class ArchiveNotesSerializer(serializers.ModelSerializer):
+class ArchiveNotesSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     label = serializers.StringRelatedField(many=True, read_only=True)
     collaborator = serializers.StringRelatedField(many=True, read_only=True)
     class Meta:
         model= Notes
-        fields=['owner_id','title','content','isArchive','label','collaborator']
-        extra_kwargs = {'title': {'read_only': True},'content': {'read_only': True},'owner_id': {'read_only': True}}   
+        fields=['owner_id','title','content','isArchive','label','collaborator','isCompressed','version']
+        extra_kwargs = {'title': {'read_only': True},'content': {'read_only': True},'owner_id': {'read_only': True},'isCompressed': {'read_only': True}}   
 
 
-class TrashSerializer(serializers.ModelSerializer):
+class TrashSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     label = serializers.StringRelatedField(many=True, read_only=True)
     collaborator = serializers.StringRelatedField(many=True, read_only=True)
     class Meta:
         model= Notes
-        fields=['owner_id','title','content','isDelete','isArchive','label','collaborator']
-        extra_kwargs = {'title': {'read_only': True},'content': {'read_only': True},'isArchive':{'read_only':True}, 'owner_id': {'read_only': True}}    
+        fields=['owner_id','title','content','isDelete','isArchive','label','collaborator','isCompressed','version']
+        extra_kwargs = {'title': {'read_only': True},'content': {'read_only': True},'isArchive':{'read_only':True}, 'owner_id': {'read_only': True},'isCompressed': {'read_only': True}}    
 
 
 class AddLabelsToNoteSerializer(serializers.ModelSerializer):
@@ -64,6 +165,20 @@ class AddLabelsToNoteSerializer(serializers.ModelSerializer):
             return label
 
 
+class BulkAddLabelsSerializer(serializers.Serializer):
+    notes = serializers.ListField(child=serializers.IntegerField(), allow_empty=False)
+    labels = serializers.ListField(child=serializers.CharField(), allow_empty=False)
+
+
+class MergeLabelsSerializer(serializers.Serializer):
+    target = serializers.IntegerField()
+    sources = serializers.ListField(child=serializers.IntegerField(), min_length=1, max_length=100)
+
+
+class DeleteLabelsSerializer(serializers.Serializer):
+    labels = serializers.ListField(child=serializers.IntegerField(), min_length=1, max_length=100)
+
+
 class AddCollaboratorSerializer(serializers.ModelSerializer):
     collaborator = serializers.EmailField()
     label = serializers.StringRelatedField(many=True, read_only=True)
@@ -77,11 +192,88 @@ class AddCollaboratorSerializer(serializers.ModelSerializer):
             return attrs
 
 
+class ShareNotesSerializer(serializers.Serializer):
+    notes = serializers.ListField(child=serializers.IntegerField(), allow_empty=False)
+    emails = serializers.ListField(child=serializers.EmailField(), allow_empty=False)
+
+
+class NoteChangeSerializer(serializers.ModelSerializer):
+    label = serializers.StringRelatedField(many=True, read_only=True)
+    collaborator = serializers.StringRelatedField(many=True, read_only=True)
+    class Meta:
+        model = Notes
+        fields = ['id','owner','title','content','label','collaborator','isArchive','isDelete','isPinned','isCompressed','trashedAt','reminder','reminderRule','version']
+        read_only_fields = fields
+
+
+class NoteRevisionSerializer(serializers.ModelSerializer):
+    author = serializers.StringRelatedField(read_only=True)
+    class Meta:
+        model = NoteRevision
+        fields = ['number','author','date','isSnapshot']
+        read_only_fields = fields
+
+
+class NoteRevisionDetailsSerializer(NoteRevisionSerializer):
+    title = serializers.CharField(read_only=True)
+    content = serializers.CharField(source='body', read_only=True)
+    class Meta(NoteRevisionSerializer.Meta):
+        fields = ['number','title','content','author','date']
+        read_only_fields = fields
+
+
+class RestoreRevisionSerializer(serializers.Serializer):
+    version = serializers.IntegerField(required=False)
+
+
+class AttachmentSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Attachment
+        fields = ['id','name','contentType','size','sha256','received','isComplete','date']
+        read_only_fields = ['id','received','isComplete','date']
+
+    def validate_size(self, size):
+        if size < 0 or size > settings.ATTACHMENT_MAX_SIZE:
+            raise serializers.ValidationError("Attachment can not be larger than "+str(settings.ATTACHMENT_MAX_SIZE // (1024*1024))+" MB!!")
+        return size
+
+    def validate_sha256(self, sha256):
+        sha256 = sha256.lower()
+        if sha256 and (len(sha256) != 64 or any(char not in '0123456789abcdef' for char in sha256)):
+            raise serializers.ValidationError("sha256 must be 64 hex characters!!")
+        return sha256
+
+
 class ReminderSerializer(serializers.ModelSerializer):
     collaborator = serializers.StringRelatedField(read_only=True)
     label = serializers.StringRelatedField(read_only=True)
-    reminder = serializers.DateTimeField()
+    reminder = serializers.DateTimeField(required=False)
+    reminderRule = serializers.CharField(required=False, allow_blank=True, max_length=100)
     class Meta:
         model = Notes
-        fields = ['title','content','owner','reminder','label','collaborator'] 
+        fields = ['title','content','owner','reminder','reminderRule','label','collaborator'] 
         extra_kwargs = {'owner': {'read_only': True}, 'title': {'read_only': True}, 'content': {'read_only': True}}
+
+    def validate_reminderRule(self, rule):
+        if not rule:
+            return ''
+        try:
+            return normalize(rule)
+        except InvalidRule as error:
+            raise serializers.ValidationError(str(error))
+
+    def validate(self, data):
+        if not data.get('reminder') and not data.get('reminderRule'):
+            raise serializers.ValidationError("Give a reminder time or a reminder rule!!")
+        return data
+
+
+class NotificationSerializer(serializers.ModelSerializer):
+    title = serializers.CharField(source='note.title', read_only=True)
+    class Meta:
+        model = Notification
+        fields = ['id','note','title','reminder','isRead','date']
+
+
+class ReadNotificationsSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(), required=False)
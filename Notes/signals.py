@@ -1,13 +1,106 @@
-from django.db.models.signals import post_delete
+from django.db.models.signals import post_save, pre_delete, post_delete, m2m_changed
 from authentication.models import User
-from Notes.models import Notes
+from Notes.models import Notes, Labels, NoteChange, Attachment
+from KeepNotes.storage import content_storage
 from django.dispatch import receiver
+from django.core.cache import cache
+import os
 
-@receiver(post_delete,sender=User)
+
+@receiver(pre_delete,sender=User)
 def delete_user(sender, instance, **kwargs):
-    notes = Notes.objects.filter(collaborator__contains=instance.id)
-    for note in notes:
-        note.collaborator=None
-        note.save()
-    
+    """ receiver function that remembers the shared notes losing a collaborator
+
+    Args:
+        sender ([model class]): [user model class]
+        instance ([model object]): [user model instance that is being deleted]
+    """
+    instance._shared_note_ids = list(Notes.objects.filter(collaborator=instance).values_list('id', flat=True))
+
+
+@receiver(post_delete,sender=User)
+def user_deleted(sender, instance, **kwargs):
+    """ receiver function that records a change for the shared notes of a deleted user """
+    NoteChange.objects.record(getattr(instance, '_shared_note_ids', []))
+
+
+@receiver(post_save,sender=Notes)
+def note_saved(sender, instance, **kwargs):
+    """ receiver function that records a change for every saved note
+
+    Args:
+        sender ([model class]): [notes model class]
+        instance ([model object]): [notes model instance that is actually being saved]
+    """
+    NoteChange.objects.record([instance.id])
+
+
+@receiver(pre_delete,sender=Notes)
+def note_deleting(sender, instance, **kwargs):
+    """ receiver function that remembers owner and collaborators of a note before they are unlinked """
+    instance._change_audience = Notes.objects.audience([instance.id])
+
+
+@receiver(post_delete,sender=Notes)
+def note_deleted(sender, instance, **kwargs):
+    """ receiver function that records a tombstone change for owner and collaborators of a deleted note """
+    NoteChange.objects.record(pairs=getattr(instance, '_change_audience', set()))
+
+
+@receiver(post_save,sender=Labels)
+def label_saved(sender, instance, created, **kwargs):
+    """ receiver function that records a change for notes showing a renamed label """
+    cache.delete(Labels.counts_key(instance.owner_id))
+    if not created:
+        NoteChange.objects.record(instance.notes_set.values_list('id', flat=True))
+
+
+@receiver(pre_delete,sender=Labels)
+def label_deleting(sender, instance, **kwargs):
+    """ receiver function that remembers the notes losing a deleted label """
+    instance._note_ids = list(instance.notes_set.values_list('id', flat=True))
+
+
+@receiver(post_delete,sender=Labels)
+def label_deleted(sender, instance, **kwargs):
+    """ receiver function that records a change for notes that lost a deleted label """
+    cache.delete(Labels.counts_key(instance.owner_id))
+    NoteChange.objects.record(getattr(instance, '_note_ids', []))
+
+
+@receiver(m2m_changed,sender=Notes.label.through)
+@receiver(m2m_changed,sender=Notes.collaborator.through)
+def note_relations_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """ receiver function that records a change when labels or collaborators of a note change
+
+    Args:
+        instance ([model object]): [note, or label/user when the relation is changed from the reverse side]
+        action ([string]): [m2m_changed action]
+        reverse ([boolean]): [true if the relation is changed from the label/user side]
+        pk_set ([set]): [primary keys added or removed]
+    """
+    if action not in ('pre_remove', 'pre_clear', 'post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        note_ids = [instance.id]
+    elif pk_set is not None:
+        note_ids = list(pk_set)
+    else:
+        field = 'label' if sender is Notes.label.through else 'collaborator'
+        note_ids = list(Notes.objects.filter(**{field: instance}).values_list('id', flat=True))
+    NoteChange.objects.record(note_ids)
+
+
+@receiver(post_delete,sender=Attachment)
+def attachment_deleted(sender, instance, **kwargs):
+    """ receiver function that removes the chunks of an incomplete upload, or the stored file when
+    no other attachment has the same content. Runs for attachments purged with their note too.
 
+    Args:
+        sender ([model class]): [attachment model class]
+        instance ([model object]): [attachment model instance that is deleted]
+    """
+    if os.path.exists(instance.part_path()):
+        os.remove(instance.part_path())
+    if instance.file and not Attachment.objects.filter(file=instance.file.name).exists():
+        content_storage.delete(instance.file.name)
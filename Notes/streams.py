@@ -0,0 +1,111 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user
+from django.contrib.auth.models import AnonymousUser
+from django.core.handlers.asgi import ASGIRequest
+from django.utils.functional import SimpleLazyObject
+from Notes.events import hub
+from Notes.models import NoteChange
+from importlib import import_module
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from urllib.parse import parse_qs
+import asyncio
+import io
+import json
+
+SessionStore = import_module(settings.SESSION_ENGINE).SessionStore
+REPLAY_LIMIT = 500
+
+
+def scope_user(scope):
+    """
+        Args:
+            scope : [ASGI connection scope]
+        Returns:
+            [User]: [user authenticated by DEFAULT_AUTHENTICATION_CLASSES of rest framework, like the
+                     views served by Django, or AnonymousUser]
+    """
+    request = ASGIRequest(scope, io.BytesIO())
+    request.session = SessionStore(request.COOKIES.get(settings.SESSION_COOKIE_NAME))
+    request.user = SimpleLazyObject(lambda: get_user(request))
+    try:
+        return Request(request, authenticators=[authenticator() for authenticator in api_settings.DEFAULT_AUTHENTICATION_CLASSES]).user
+    except APIException:
+        return AnonymousUser()
+
+
+def scope_cursor(scope):
+    """
+        Args:
+            scope : [ASGI connection scope]
+        Returns:
+            [int]: [cursor from Last-Event-ID header or since query parameter, None if not given]
+    """
+    cursor = dict(scope['headers']).get(b'last-event-id', b'').decode() or parse_qs(scope['query_string'].decode()).get('since', [''])[0]
+    return int(cursor) if cursor.isdigit() else None
+
+
+def pending_changes(user, cursor):
+    return list(NoteChange.objects.since(user, cursor).values_list('id', 'note_id')[:REPLAY_LIMIT])
+
+
+async def send_json(send, status, data):
+    await send({'type':'http.response.start', 'status':status, 'headers':[(b'content-type', b'application/json')]})
+    await send({'type':'http.response.body', 'body':json.dumps(data).encode()})
+
+
+async def send_event(send, note_id, cursor):
+    data = json.dumps({'note':note_id, 'cursor':cursor})
+    await send({'type':'http.response.body', 'body':('id: %s\nevent: change\ndata: %s\n\n' % (cursor, data)).encode(), 'more_body':True})
+
+
+async def wait_for_disconnect(receive):
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+
+
+async def note_events(scope, receive, send):
+    """
+        Summary:
+        --------
+            Server-sent events stream of note changes visible to the logged in user.
+            Missed changes are replayed from the change feed when the client reconnects
+            with Last-Event-ID, then live events from redis pub/sub follow.
+        --------
+        Args:
+            scope, receive, send : [ASGI application arguments]
+    """
+    user = await sync_to_async(scope_user, thread_sensitive=True)(scope)
+    if not user.is_authenticated:
+        await send_json(send, 403, {'detail':'Authentication credentials were not provided.'})
+        return
+    loop = asyncio.get_event_loop()
+    queue = asyncio.Queue()
+    callback = lambda data: loop.call_soon_threadsafe(queue.put_nowait, data)
+    hub.add(user.id, callback)
+    disconnected = asyncio.ensure_future(wait_for_disconnect(receive))
+    try:
+        await send({'type':'http.response.start', 'status':200, 'headers':[
+            (b'content-type', b'text/event-stream'), (b'cache-control', b'no-cache'), (b'x-accel-buffering', b'no')]})
+        cursor = scope_cursor(scope)
+        if cursor is not None:
+            for change_id, note_id in await sync_to_async(pending_changes, thread_sensitive=True)(user, cursor):
+                await send_event(send, note_id, change_id)
+                cursor = change_id
+        while not disconnected.done():
+            getter = asyncio.ensure_future(queue.get())
+            done, pending = await asyncio.wait({getter, disconnected}, timeout=settings.NOTE_EVENTS_HEARTBEAT, return_when=asyncio.FIRST_COMPLETED)
+            if getter in done:
+                data = getter.result()
+                if cursor is None or data['cursor'] is None or data['cursor'] > cursor:
+                    await send_event(send, data['note'], data['cursor'])
+                    cursor = data['cursor'] or cursor
+            else:
+                getter.cancel()
+                if not disconnected.done():
+                    await send({'type':'http.response.body', 'body':b': keep-alive\n\n', 'more_body':True})
+    finally:
+        hub.remove(user.id, callback)
+        disconnected.cancel()
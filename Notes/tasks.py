@@ -1,37 +1,144 @@
-from celery.task.schedules import crontab
-from celery.decorators import periodic_task
+from celery import shared_task
 from celery.utils.log import get_task_logger
-from Notes.models import Notes
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, DateTimeField, Value, When
+from authentication.models import User
+from authentication.tasks import send_emails
+from KeepNotes import metrics
+from KeepNotes.locks import Lease, claim_many, unclaim_many
+from Notes.models import Notes, NoteChange, NoteRevision, Attachment, Notification
+from Notes.reminders import next_fire
 from datetime import datetime, timedelta
+import functools
+import time
 
 logger = get_task_logger(__name__)
 
 
-@periodic_task(
-    run_every=(crontab(minute='*/24*60')),
-    name="delete_trashed_note",
-    ignore_result=True
-)
+def exclusive(period):
+    """
+        Args:
+            period : [seconds between two scheduled runs of the task]
+        Returns:
+            [function]: [decorator for periodic tasks returning the number of rows they processed]
+        A run is skipped when another worker holds the lease of the task, which lasts as long as
+        the hard time limit, or when the run of the same period already succeeded, so duplicated
+        beats and overlapping ticks never process the same rows twice. Runs, skips, rows and
+        duration are recorded in the metrics group tasks.<name>.
+    """
+    def decorator(function):
+        name = function.__name__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            group = 'tasks.'+name
+            lease = Lease('task:'+name, settings.CELERY_ANNOTATIONS[name]['time_limit'])
+            if not lease.acquire():
+                metrics.record(group, skipped=1)
+                logger.info("%s is running on another worker", name)
+                return name+" is running already!!!"
+            try:
+                tick = Lease('task:'+name+':'+str(int(time.time() // period)), period)
+                if not tick.acquire():
+                    metrics.record(group, skipped=1)
+                    return name+" has run in this period already!!!"
+                start = time.monotonic()
+                try:
+                    rows = function(*args, **kwargs)
+                except Exception:
+                    tick.release()
+                    metrics.record(group, failed=1)
+                    raise
+                metrics.record(group, runs=1, rows=rows, duration_ms=(time.monotonic()-start)*1000)
+                return str(rows)+" rows processed by "+name+"!!!"
+            finally:
+                lease.release()
+        return wrapper
+    return decorator
+
+
+@shared_task(name="delete_trashed_note", ignore_result=True)
+@exclusive(period=24*60*60)
 def delete_trashed_note():
-    notes = Notes.objects.filter(isDelete=True)
-    for note in notes:
-        if datetime.now() - note.trashedAt.replace(tzinfo=None) > timedelta(days=7):
-            note.delete()
-            return "Trashed notes are deleted!!!" 
-        
-    return "Trash check!!!"
-
-
-@periodic_task(
-    run_every=(crontab(minute='*/1')),
-    name="send_reminder",
-    ignore_result=True
-)
+    deleted = 0
+    for note in Notes.objects.filter(isDelete=True, trashedAt__lt=datetime.now()-timedelta(days=7)).iterator():
+        note.delete()
+        deleted += 1
+    return deleted
+
+
+def reminder_digest(user, notes):
+    """
+        Args:
+            user : [recipient]
+            notes : [dicts with title and reminder of the due notes of user]
+        Returns:
+            [dict]: [mail data of one digest listing every due note]
+    """
+    titles = [note['title'] or "Untitled note" for note in notes]
+    lines = ["- "+title+" ("+note['reminder'].strftime('%Y-%m-%d %H:%M')+")" for title, note in zip(titles, notes)]
+    email_body = "Hii \n"+user['username']+" Reminders of your notes:\n"+"\n".join(lines)
+    email_subject = "Reminder: "+titles[0] if len(notes) == 1 else str(len(notes))+" note reminders"
+    return {'email_body':email_body, 'to_email':user['email'], 'email_subject':email_subject}
+
+
+def deliver_reminders(notes):
+    """
+        Args:
+            notes : [dicts with id, title, reminder and reminderRule of claimed due notes]
+        Moves recurring reminders to their next fire time and clears the others with one
+        update, notifies owner and collaborators in app and queues one digest mail per
+        recipient once the batch is committed.
+    """
+    now = datetime.now()
+    next_fires = {note['id']: next_fire(note['reminderRule'], max(note['reminder'], now)) for note in notes if note['reminderRule']}
+    with transaction.atomic():
+        Notes.objects.filter(id__in=[note['id'] for note in notes], reminder__lte=now+timedelta(seconds=1)).update(reminder=Case(
+            *[When(id=note_id, then=Value(fire)) for note_id, fire in next_fires.items() if fire is not None],
+            default=Value(None), output_field=DateTimeField()))
+        recipients = Notification.objects.fan_out(notes)
+        NoteChange.objects.record(pairs={(note['id'], user_id) for user_id, due in recipients.items() for note in due})
+        users = User.objects.filter(id__in=list(recipients), is_active=True).values('id', 'username', 'email')
+        digests = [reminder_digest(user, recipients[user['id']]) for user in users if user['email']]
+        if digests:
+            transaction.on_commit(lambda: send_emails.delay(digests))
+
+
+@shared_task(name="send_reminder", ignore_result=True)
+@exclusive(period=60)
 def send_reminder():
-    notes = Notes.objects.filter(isDelete=False).exclude(reminder=None)
-    for note in notes:
-        if note.reminder.replace(tzinfo=None) - datetime.now() <= timedelta(seconds=1):
-            note.reminder = None
-            note.save()
-            return note
-    return "Reminder checked!!!"
\ No newline at end of file
+    sent, last_id = 0, 0
+    due = Notes.objects.filter(isDelete=False, reminder__lte=datetime.now()+timedelta(seconds=1)).order_by('id')
+    while True:
+        batch = list(due.filter(id__gt=last_id).values('id', 'title', 'reminder', 'reminderRule')[:settings.REMINDER_BATCH_SIZE])
+        if not batch:
+            return sent
+        last_id = batch[-1]['id']
+        keys = {'reminder:'+str(note['id'])+':'+note['reminder'].isoformat(): note for note in batch}
+        claimed = claim_many(list(keys), 24*60*60)
+        if claimed:
+            try:
+                deliver_reminders([keys[key] for key in claimed])
+            except Exception:
+                # the batch was rolled back, its reminders are retried on the next tick
+                unclaim_many(claimed)
+                raise
+            sent += len(claimed)
+
+
+@shared_task(name="prune_note_revisions", ignore_result=True)
+@exclusive(period=24*60*60)
+def prune_note_revisions():
+    return NoteRevision.objects.prune(datetime.now() - timedelta(days=settings.NOTE_REVISION_RETENTION_DAYS))
+
+
+@shared_task(name="delete_stale_attachments", ignore_result=True)
+@exclusive(period=60*60)
+def delete_stale_attachments():
+    attachments = Attachment.objects.stale(datetime.now() - timedelta(hours=settings.ATTACHMENT_UPLOAD_EXPIRY_HOURS))
+    deleted = 0
+    for attachment in attachments.iterator():
+        attachment.delete()
+        deleted += 1
+    return deleted
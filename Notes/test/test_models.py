@@ -1,6 +1,19 @@
 from django.test import TestCase
-from ..models import Notes, Labels
+from ..models import Notes, Labels, NoteRevision
+from django.test import override_settings
+from django.db import DatabaseError
+from unittest import mock
+from datetime import datetime, timedelta
 from authentication.models import User, UserProfile
+from django.core.cache import cache
+from KeepNotes import metrics
+from KeepNotes.cache import JSONSerializer, LocalLRU, LocalTier, ThresholdZlibCompressor, fresh, get_or_compute
+import threading
+import time
+from django_redis.cache import RedisCache
+from KeepNotes.locks import Lease
+from ..tasks import send_reminder, reminder_digest
+from ..reminders import InvalidRule, next_fire, normalize
 
 class NotesTest(TestCase):
     """ Test module for Notes and Label models """
@@ -14,6 +27,200 @@ class NotesTest(TestCase):
         note = Notes.objects.get(title='first note')
         self.assertEqual(note.get_content(), "this is my first note")
 
+    def test_create_large_note_keeps_preview_in_content(self):
+        body = 'large note ' * 500
+        note = Notes.objects.create(title='large note', body=body, owner=self.user)
+        note = Notes.objects.get(id=note.id)
+        self.assertTrue(note.isCompressed)
+        self.assertEqual(note.get_content(), body[:200])
+        self.assertEqual(note.body, body)
+
     def test_create_label(self):
         label = Labels.objects.get(owner=self.user)
         self.assertEqual(label.get_name(), "label 1")
+
+    def test_moving_label_rewrites_paths_of_its_subtree(self):
+        root = Labels.objects.get(name='label 1')
+        child = Labels.objects.create(name='child', owner=self.user, parent=root)
+        grandchild = Labels.objects.create(name='grandchild', owner=self.user, parent=child)
+        other = Labels.objects.create(name='other', owner=self.user)
+        child.parent = other
+        child.save()
+        grandchild.refresh_from_db()
+        self.assertEqual(grandchild.path, '/'+str(other.id)+'/'+str(child.id)+'/'+str(grandchild.id)+'/')
+        self.assertEqual(list(Labels.objects.subtree(root)), [root])
+
+    def test_label_subtrees_are_scoped_to_their_owner(self):
+        root = Labels.objects.get(name='label 1')
+        other_user = User.objects.create(email='other@gmail.com', username='other', password='other123')
+        other = Labels.objects.create(name='other', owner=other_user)
+        Labels.objects.filter(id=other.id).update(path=root.path+str(other.id)+'/')
+        Labels.objects.delete_labels([root])
+        self.assertTrue(Labels.objects.filter(id=other.id).exists())
+        label = Labels.objects.create(name='label 2', owner=self.user)
+        label.path = ''
+        with self.assertRaises(ValueError):
+            Labels.objects.delete_labels([label])
+
+    def test_resolve_labels_creates_only_missing_labels(self):
+        labels = Labels.objects.resolve(self.user, ['label 1', 'label 2', 'label 2'])
+        self.assertEqual(sorted(labels.values_list('name', flat=True)), ['label 1', 'label 2'])
+        self.assertEqual(Labels.objects.filter(owner=self.user).count(), 2)
+
+    @override_settings(NOTE_REVISION_SNAPSHOT_INTERVAL=3)
+    def test_note_revisions_store_deltas_between_snapshots(self):
+        note = Notes.objects.get(title='first note')
+        for version in range(2, 8):
+            Notes.objects.update_versioned(note.id, version-1, {'body': 'this is my first note, edit '+str(version)})
+        revisions = NoteRevision.objects.filter(note=note).order_by('number')
+        self.assertEqual([revision.isSnapshot for revision in revisions], [True, False, False, True, False, False, True])
+        self.assertEqual(NoteRevision.objects.get_revision(note.id, 6).body, 'this is my first note, edit 6')
+        self.assertEqual(NoteRevision.objects.get_revision(note.id, 1).body, 'this is my first note')
+
+    @override_settings(NOTE_REVISION_SNAPSHOT_INTERVAL=3)
+    def test_prune_note_revisions_keeps_latest_old_snapshot(self):
+        note = Notes.objects.get(title='first note')
+        for version in range(2, 6):
+            Notes.objects.update_versioned(note.id, version-1, {'title': 'note '+str(version)})
+        self.assertEqual(NoteRevision.objects.prune(datetime.now() + timedelta(days=1)), 3)
+        self.assertEqual(NoteRevision.objects.get_revision(note.id, 5).title, 'note 5')
+
+
+class PeriodicTasksTest(TestCase):
+    """ Test module for lease locks and idempotency of periodic tasks """
+
+    def setUp(self):
+        cache.clear()
+        metrics.reset('tasks.send_reminder')
+        self.user=User.objects.create(email='bhartimali@gmail.com',username='bharti',password='bharti123')
+        for number in range(3):
+            Notes.objects.create(title='note '+str(number), content='remind me', owner=self.user, reminder=datetime.now()-timedelta(minutes=1))
+
+    def test_send_reminder_processes_every_due_note_once(self):
+        self.assertEqual(send_reminder(), "3 rows processed by send_reminder!!!")
+        self.assertFalse(Notes.objects.exclude(reminder=None).exists())
+        self.assertEqual(metrics.read('tasks.send_reminder')['rows'], 3)
+
+    def test_send_reminder_skips_run_of_same_period(self):
+        send_reminder()
+        Notes.objects.update(reminder=datetime.now()-timedelta(minutes=1))
+        self.assertEqual(send_reminder(), "send_reminder has run in this period already!!!")
+        self.assertEqual(metrics.read('tasks.send_reminder')['skipped'], 1)
+
+    def test_send_reminder_skips_overlapping_run(self):
+        lease = Lease('task:send_reminder', 60)
+        self.assertTrue(lease.acquire())
+        self.assertEqual(send_reminder(), "send_reminder is running already!!!")
+        self.assertEqual(Notes.objects.exclude(reminder=None).count(), 3)
+        lease.release()
+        self.assertEqual(send_reminder(), "3 rows processed by send_reminder!!!")
+
+    def test_send_reminder_retries_batch_that_failed(self):
+        with mock.patch('Notes.tasks.deliver_reminders', side_effect=DatabaseError):
+            with self.assertRaises(DatabaseError):
+                send_reminder()
+        self.assertEqual(send_reminder(), "3 rows processed by send_reminder!!!")
+
+    def test_reminder_digest_lists_every_due_note(self):
+        notes = list(Notes.objects.exclude(reminder=None).order_by('id').values('title', 'reminder'))
+        digest = reminder_digest({'username':'bharti', 'email':'bhartimali@gmail.com'}, notes)
+        self.assertEqual(digest['email_subject'], "3 note reminders")
+        self.assertEqual(digest['email_body'].count('\n- note '), 3)
+
+    def test_send_reminder_moves_recurring_reminder_to_next_fire(self):
+        note = Notes.objects.get(title='note 0')
+        Notes.objects.filter(id=note.id).update(reminderRule='0 9 * * *')
+        send_reminder()
+        note.refresh_from_db()
+        self.assertEqual(note.reminder, next_fire('0 9 * * *', datetime.now()))
+        self.assertEqual(Notes.objects.exclude(reminder=None).count(), 1)
+
+
+class ReminderRuleTest(TestCase):
+    """ Test module for recurring reminder rules """
+
+    def test_next_fire_of_weekday_rule(self):
+        friday = datetime(2021, 1, 1, 10, 30)
+        self.assertEqual(next_fire('0 9 * * mon-fri', friday), datetime(2021, 1, 4, 9, 0))
+        self.assertEqual(next_fire('@daily', friday), datetime(2021, 1, 2, 0, 0))
+
+    def test_next_fire_matches_day_of_month_or_weekday(self):
+        self.assertEqual(next_fire('0 8 15 * sun', datetime(2021, 1, 1)), datetime(2021, 1, 3, 8, 0))
+
+    def test_normalize_rejects_invalid_rules(self):
+        self.assertEqual(normalize('weekly'), '@weekly')
+        for rule in ['0 25 * * *', '@reboot', '0 0 31 2 *']:
+            with self.assertRaises(InvalidRule):
+                normalize(rule)
+
+
+class CacheLayerTest(TestCase):
+    """ Test module for the serializer, compressor and local cache of the redis client """
+
+    def test_serializer_reads_other_versions_as_miss(self):
+        serializer = JSONSerializer({})
+        value = {'title': 'note', 'reminder': datetime(2021, 1, 1, 9, 0)}
+        self.assertEqual(serializer.loads(serializer.dumps(value)), {'title': 'note', 'reminder': '2021-01-01T09:00:00'})
+        self.assertIsNone(serializer.loads(b'\x80\x04pickled'))
+
+    def test_compressor_skips_short_values(self):
+        compressor = ThresholdZlibCompressor({'COMPRESS_MIN_LENGTH': 100})
+        self.assertEqual(compressor.compress(b'x'*100), b'x'*100)
+        self.assertEqual(compressor.decompress(compressor.compress(b'x'*1000)), b'x'*1000)
+        self.assertLess(len(compressor.compress(b'x'*1000)), 1000)
+
+    def test_local_lru_evicts_least_recently_used_and_expired(self):
+        lru = LocalLRU(2)
+        lru.set('a', b'1', 60)
+        lru.set('b', b'2', 60)
+        lru.get('a')
+        lru.set('c', b'3', 60)
+        self.assertIsNone(lru.get('b'))
+        self.assertEqual(lru.get('a'), b'1')
+        lru.set('a', b'1', 0)
+        self.assertIsNone(lru.get('a'))
+        lru.discard(['c'])
+        self.assertIsNone(lru.get('c'))
+
+    def test_tiered_client_shares_local_entries_and_listener_across_threads(self):
+        params = {'OPTIONS': {'CLIENT_CLASS': 'KeepNotes.cache.TieredClient', 'SERIALIZER': 'KeepNotes.cache.JSONSerializer', 'L1_PREFIXES': ['hot-']}}
+        stop = threading.Event()
+        values = []
+        read = lambda: values.append(RedisCache('redis://127.0.0.1:6399/7', params).get('hot-key'))
+        writer = RedisCache('redis://127.0.0.1:6399/7', params)
+        writer.client.tier.l1.set(str(writer.make_key('hot-key')), writer.client.encode('value'), 60)
+        with mock.patch.object(LocalTier, 'run', lambda tier: stop.wait()):
+            threads = [threading.Thread(target=read) for i in range(2)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            listeners = [thread for thread in threading.enumerate() if thread.name == 'cache-invalidation']
+            stop.set()
+        self.assertEqual(values, ['value', 'value'])
+        self.assertEqual(len(listeners), 1)
+
+    def test_get_or_compute_caches_value_with_its_expiry(self):
+        cache.clear()
+        computed = []
+        compute = lambda: computed.append(1) or 'value'
+        self.assertEqual(get_or_compute('key', compute, 60), 'value')
+        self.assertEqual(get_or_compute('key', compute, 60), 'value')
+        self.assertEqual(len(computed), 1)
+        self.assertTrue(fresh(cache.get('key')))
+        self.assertIsNone(get_or_compute('missing', lambda: None))
+        self.assertIsNone(cache.get('missing'))
+
+    def test_stale_value_is_served_while_another_caller_recomputes(self):
+        cache.clear()
+        cache.set('key', {'value': 'stale', 'delta': 0.1, 'expires': time.time()-1}, 60)
+        self.assertFalse(fresh(cache.get('key')))
+        with Lease('compute:key', 10):
+            self.assertEqual(get_or_compute('key', lambda: 'new'), 'stale')
+        self.assertEqual(get_or_compute('key', lambda: 'new'), 'new')
+
+    @override_settings(CACHE_COMPUTE_TIMEOUT=0.2)
+    def test_waiter_computes_after_compute_timeout(self):
+        cache.clear()
+        with Lease('compute:key', 10):
+            self.assertEqual(get_or_compute('key', lambda: 'value'), 'value')
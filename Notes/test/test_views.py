@@ -1,22 +1,50 @@
 from rest_framework import status
 from django.test import TestCase, Client
 from django.urls import reverse
+from KeepNotes import throttling
+from django.core.cache import cache
 from authentication.models import User, UserProfile
-from Notes.models import Notes, Labels
-from ..serializers import NotesSerializer, LabelsSerializer, ArchiveNotesSerializer, TrashSerializer, AddLabelsToNoteSerializer, ListNotesSerializer
+from Notes.models import Notes, Labels, NoteBody, Attachment, Notification
+from ..serializers import NotesSerializer, LabelsSerializer, LabelCountSerializer, ArchiveNotesSerializer, TrashSerializer, AddLabelsToNoteSerializer, ListNotesSerializer
 import json
 from django.views.decorators.csrf import csrf_exempt
+from django.db import connection
 from django.db.models import Q
 from datetime import datetime, timedelta
+from asgiref.sync import async_to_sync
+from django.test import override_settings
+import base64
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+from KeepNotes.asgi import application
+from Notes.async_views import cached
+from Notes.entries import search_key
+from KeepNotes.locks import Lease
+import threading
+from Notes.tasks import send_reminder
 
 CONTENT_TYPE = 'application/json'
 
+
+def run_commit_hooks():
+    """ runs the on_commit callbacks queued inside the transaction wrapping each test case """
+    callbacks, connection.run_on_commit = connection.run_on_commit, []
+    for savepoint_ids, callback in callbacks:
+        callback()
+
+
+@override_settings(THROTTLE_REDIS=None)
 class NotesAPITest(TestCase):
     """ Test module for notes app APIs """
 
     def setUp(self): 
         # Intialize the test client
         self.client = Client()
+        throttling.reset()
+        cache.clear()
 
         self.user1 = User.objects.create(email='malibharti5@gmail.com', username='bharti',password='pbkdf2_sha256$180000$vf55wIVIolGs$orroOnnkyPPnUqNgUpgYK4yI9un4fl+Oy0Ig9MUF+DI=', is_active=True, is_verified=True, )
         self.user2 = User.objects.create(email='malibharti@gmail.com', username='bharti2',password='pbkdf2_sha256$180000$vf55wIVIolGs$orroOnnkyPPnUqNgUpgYK4yI9un4fl+Oy0Ig9MUF+DI=', is_active=True, is_verified=True, )
@@ -138,6 +166,12 @@ class NotesAPITest(TestCase):
         else:
             self.assertNotEqual(response.data, serializer.data)
 
+    def test_get_all_notes_with_fields_and_preview_after_login(self):
+        self.client.post(reverse('login'),data=json.dumps(self.user1_credentials), content_type=CONTENT_TYPE)
+        response = self.client.get(reverse('notes')+'?fields=title,content,label&preview=5')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0], {'title': 'note1', 'content': 'first', 'label': ['label1']})
+
 ### Test cases for create note API
 
     def test_create_notes_with_valid_payload_without_login(self):
@@ -154,6 +188,12 @@ class NotesAPITest(TestCase):
         response = self.client.post(reverse('notes'),data=json.dumps(self.valid_payload), content_type=CONTENT_TYPE)
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
 
+    def test_create_notes_ignores_version_after_login(self):
+        self.client.post(reverse('login'),data=json.dumps(self.user1_credentials), content_type=CONTENT_TYPE)
+        response = self.client.post(reverse('notes'),data=json.dumps(dict(self.valid_payload, version=999)), content_type=CONTENT_TYPE)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Notes.objects.get(owner=self.user1, title='test').version, Notes._meta.get_field('version').default)
+
     def test_create_notes_with_invalid_payload_after_login(self):
         self.client.post(reverse('login'),data=json.dumps(self.user1_credentials), content_type=CONTENT_TYPE)
         response = self.client.post(reverse('notes'),data=json.dumps(self.invalid_payload), content_type=CONTENT_TYPE)
@@ -191,6 +231,21 @@ class NotesAPITest(TestCase):
         response = self.client.get(reverse('note',kwargs={'id':self.note3_for_user1.id}), content_type=CONTENT_TYPE)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    def test_get_note_is_cached_once_for_owner_and_collaborators(self):
+        self.client.post(reverse('login'),data=json.dumps(self.user1_credentials), content_type=CONTENT_TYPE)
+        response = self.client.get(reverse('note',kwargs={'id':self.note3_for_user1.id}))
+        self.assertEqual(cache.get(Notes.cache_key(self.note3_for_user1.id))['value']['data'], response.data)
+        self.client.post(reverse('login'),data=json.dumps(self.user2_credentials), content_type=CONTENT_TYPE)
+        response = self.client.get(reverse('note',kwargs={'id':self.note3_for_user1.id}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.client.post(reverse('login'),data=json.dumps(self.user1_credentials), content_type=CONTENT_TYPE)
+        self.client.put(reverse('note',kwargs={'id':self.note3_for_user1.id}), data=json.dumps(self.valid_payload), content_type=CONTENT_TYPE)
+        self.assertIsNotNone(cache.get(Notes.cache_key(self.note3_for_user1.id)))
+        run_commit_hooks()
+        self.assertIsNone(cache.get(Notes.cache_key(self.note3_for_user1.id)))
+        response = self.client.get(reverse('note',kwargs={'id':self.note3_for_user1.id}))
+        self.assertEqual(response.data['title'], self.valid_payload['title'])
+
 ### Test cases for update note API by id
 
     def test_update_notes_with_valid_payload_without_login(self):
@@ -228,6 +283,128 @@ class NotesAPITest(TestCase):
         response = self.client.put(reverse('note',kwargs={'id':self.note3_for_user1.id}), data=json.dumps(self.valid_payload), content_type=CONTENT_TYPE)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+### Test cases for versioned note updates
+
+    def test_update_note_with_current_version_after_login(self):
+        self.client.post(reverse('login'),data=json.dumps(self.user1_credentials), content_type=CONTENT_TYPE)
+        payload = dict(self.valid_payload, version=1)
+        response = self.client.put(reverse('note',kwargs={'id':self.note_for_user1.id}), data=json.dumps(payload), content_type=CONTENT_TYPE)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['version'], 2)
+        self.assertEqual(Notes.objects.get(id=self.note_for_user1.id).title, 'test')
+
+    def test_update_note_with_stale_version_after_login(self):
+        self.client.post(reverse('login'),data=json.dumps(self.user1_credentials), content_type=CONTENT_TYPE)
+        Notes.objects.filter(id=self.note_for_user1.id).update(version=3)
+        payload = dict(self.valid_payload, version=2)
+        response = self.client.put(reverse('note',kwargs={'id':self.note_for_user1.id}), data=json.dumps(payload), content_type=CONTENT_TYPE)
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data['version'], 3)
+        self.assertEqual(Notes.objects.get(id=self.note_for_user1.id).title, 'note1')
+
+    def test_update_note_with_stale_if_match_header_after_login(self):
+        self.client.post(reverse('login'),data=json.dumps(self.user1_credentials), content_type=CONTENT_TYPE)
+        Notes.objects.filter(id=self.note_for_user1.id).update(version=3)
+        response = self.client.put(reverse('note',kwargs={'id':self.note_for_user1.id}), data=json.dumps(self.valid_payload), content_type=CONTENT_TYPE, HTTP_IF_MATCH='"2"')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+    def test_archive_note_bumps_version_after_login(self):
+        self.client.post(reverse('login'),data=json.dumps(self.user1_credentials), content_type=CONTENT_TYPE)
+        response = self.client.put(reverse('archive-note', kwargs={'id': self.note_for_user1.id}),data=json.dumps(self.valid_archive_payload), content_type=CONTENT_TYPE)
+        note = Notes.objects.get(id=self.note_for_user1.id)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(note.isArchive)
+        self.assertEqual(note.version, 2)
+
+### Test cases for compressed note content
+
+    def test_create_large_note_stores_compressed_body_after_login(self):
+        self.client.post(reverse('login'),data=json.dumps(self.user1_credentials), content_type=CONTENT_TYPE)
+        content = ' '.join(['large note'] * 500)
+        response = self.client.post(reverse('notes'),data=json.dumps({'title': 'large', 'content': content}), content_type=CONTENT_TYPE)
+        note = Notes.objects.get(title='large')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(note.isCompressed)
+        self.assertEqual(note.content, content[:200])
+        self.assertEqual(NoteBody.objects.get(note=note).text, content)
+        response = self.client.get(reverse('notes'))
+        self.assertIn(content[:200], [data['content'] for data in response.data])
+
+    def test_get_large_note_by_id_returns_full_body_after_login(self):
+        self.client.post(reverse('login'),data=json.dumps(self.user1_credentials), content_type=CONTENT_TYPE)
+        note = Notes.objects.create(title='large', body='large note ' * 500, owner=self.user1)
+        cache.clear()
+        response = self.client.get(reverse('note',kwargs={'id': note.id}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['content'], 'large note ' * 500)
+        self.assertTrue(response.data['isCompressed'])
+
+    def test_shrink_large_note_removes_compressed_body_after_login(self):
+        self.client.post(reverse('login'),data=json.dumps(self.user1_credentials), content_type=CONTENT_TYPE)
+        Notes.objects.create(title='large', body='large note ' * 500, owner=self.user1)
+        note = Notes.objects.get(title='large')
+        response = self.client.put(reverse('note',kwargs={'id': note.id}), data=json.dumps({'title': 'large', 'content': 'small note'}), content_type=CONTENT_TYPE)
+        note = Notes.objects.get(id=note.id)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(note.isCompressed)
+        self.assertEqual(note.content, 'small note')
+        self.assertFalse(NoteBody.objects.filter(note=note).exists())
+
+    def test_search_finds_word_after_preview_of_large_note_after_login(self):
+        self.client.post(reverse('login'),data=json.dumps(self.user1_credentials), content_type=CONTENT_TYPE)
+        Notes.objects.create(title='large', body='large note ' * 500 + 'Needle', owner=self.user1)
+        response = self.client.get(reverse('search')+'?search=eedl')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([data['title'] for data in response.data], ['large'])
+
+### Test cases for note revisions
+
+    def test_list_note_revisions_without_login(self):
+        response = self.client.get(reverse('note-revisions',kwargs={'id': self.note_for_user1.id}))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_list_note_revisions_after_update_after_login(self):
+        self.client.post(reverse('login'),data=json.dumps(self.user1_credentials), content_type=CONTENT_TYPE)
+        self.client.put(reverse('note',kwargs={'id':self.note_for_user1.id}), data=json.dumps(self.valid_payload), content_type=CONTENT_TYPE)
+        response = self.client.get(reverse('note-revisions',kwargs={'id': self.note_for_user1.id}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([revision['number'] for revision in response.data], [2, 1])
+        self.assertEqual([revision['isSnapshot'] for revision in response.data], [False, True])
+
+    def test_get_note_revision_of_other_user_note_after_login(self):
+        self.client.post(reverse('login'),data=json.dumps(self.user1_credentials), content_type=CONTENT_TYPE)
+        response = self.client.get(reverse('note-revision',kwargs={'id': self.note_for_user2.id, 'number': 1}))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_get_note_revision_after_update_after_login(self):
+        self.client.post(reverse('login'),data=json.dumps(self.user2_credentials), content_type=CONTENT_TYPE)
+        self.client.put(reverse('note',kwargs={'id':self.note3_for_user1.id}), data=json.dumps(self.valid_payload), content_type=CONTENT_TYPE)
+        response = self.client.get(reverse('note-revision',kwargs={'id': self.note3_for_user1.id, 'number': 1}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((response.data['title'], response.data['content']), ('note3', 'third note'))
+        response = self.client.get(reverse('note-revision',kwargs={'id': self.note3_for_user1.id, 'number': 2}))
+        self.assertEqual((response.data['title'], response.data['content'], response.data['author']), ('test', 'test', 'malibharti@gmail.com'))
+
+    def test_restore_note_revision_after_login(self):
+        self.client.post(reverse('login'),data=json.dumps(self.user1_credentials), content_type=CONTENT_TYPE)
+        self.client.put(reverse('note',kwargs={'id':self.note_for_user1.id}), data=json.dumps(self.valid_payload), content_type=CONTENT_TYPE)
+        response = self.client.put(reverse('note-revision',kwargs={'id': self.note_for_user1.id, 'number': 1}), data=json.dumps({'version': 2}), content_type=CONTENT_TYPE)
+        note = Notes.objects.get(id=self.note_for_user1.id)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((note.title, note.content, note.version), ('note1', 'first note', 3))
+        self.assertEqual(note.revisions.count(), 3)
+
+    def test_restore_note_revision_with_stale_version_after_login(self):
+        self.client.post(reverse('login'),data=json.dumps(self.user1_credentials), content_type=CONTENT_TYPE)
+        self.client.put(reverse('note',kwargs={'id':self.note_for_user1.id}), data=json.dumps(self.valid_payload), content_type=CONTENT_TYPE)
+        response = self.client.put(reverse('note-revision',kwargs={'id': self.note_for_user1.id, 'number': 1}), data=json.dumps({'version': 1}), content_type=CONTENT_TYPE)
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+    def test_get_missing_note_revision_after_login(self):
+        self.client.post(reverse('login'),data=json.dumps(self.user1_credentials), content_type=CONTENT_TYPE)
+        response = self.client.get(reverse('note-revision',kwargs={'id': self.note_for_user1.id, 'number': 5}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
 ### Test cases for delete note API by id
 
     def test_delete_note_without_login(self):
@@ -292,12 +469,27 @@ class NotesAPITest(TestCase):
 
     def test_get_all_labels_after_login(self):
         self.client.post(reverse('login'),data=json.dumps(self.user1_credentials), content_type=CONTENT_TYPE)
-        labels = Labels.objects.filter(owner=self.user1)
-        serializer = LabelsSerializer(labels, many=True)
+        labels = Labels.objects.with_counts(self.user1)
+        serializer = LabelCountSerializer(labels, many=True)
         response = self.client.get(reverse('labels'))
         self.assertEqual(response.data, serializer.data)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    def test_get_label_counts_after_label_changes(self):
+        cache.clear()
+        self.client.post(reverse('login'),data=json.dumps(self.user1_credentials), content_type=CONTENT_TYPE)
+        response = self.client.get(reverse('labels'))
+        self.assertEqual([(label['name'], label['noteCount']) for label in response.data], [('label1', 1)])
+        self.note2_for_user1.label.add(self.label_for_user1)
+        self.note3_for_user1.label.add(self.label_for_user1)
+        run_commit_hooks()
+        response = self.client.get(reverse('labels'))
+        self.assertEqual([(label['name'], label['noteCount']) for label in response.data], [('label1', 3)])
+        self.client.put(reverse('note-state', kwargs={'id': self.note3_for_user1.id, 'action': 'trash'}), content_type=CONTENT_TYPE)
+        run_commit_hooks()
+        response = self.client.get(reverse('labels'))
+        self.assertEqual([(label['name'], label['noteCount']) for label in response.data], [('label1', 2)])
+
     def test_get_all_labels_of_other_user_after_login(self):
         self.client.post(reverse('login'),data=json.dumps(self.user1_credentials), content_type=CONTENT_TYPE)
         labels = Labels.objects.filter(owner=self.user2)
@@ -379,6 +571,46 @@ class NotesAPITest(TestCase):
         response = self.client.delete(reverse('label',kwargs={'id':self.label_for_user2.id}), content_type=CONTENT_TYPE)
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
+### Test cases for merge and bulk delete of labels
+
+    def test_merge_labels_after_login(self):
+        work = Labels.objects.create(name='work', owner=self.user1)
+        nested = Labels.objects.create(name='nested', owner=self.user1, parent=work)
+        self.note_for_user1.label.add(work)
+        self.note2_for_user1.label.add(work)
+        self.client.post(reverse('login'), data=json.dumps(self.user1_credentials), content_type=CONTENT_TYPE)
+        response = self.client.post(reverse('merge-labels'), data=json.dumps({'target':self.label_for_user1.id, 'sources':[work.id]}), content_type=CONTENT_TYPE)
+        self.assertEqual(response.data, {'notes':[self.note_for_user1.id, self.note2_for_user1.id]})
+        self.assertFalse(Labels.objects.filter(id=work.id).exists())
+        self.assertEqual(sorted(self.label_for_user1.notes_set.values_list('id', flat=True)), [self.note_for_user1.id, self.note2_for_user1.id])
+        nested.refresh_from_db()
+        self.assertEqual((nested.parent_id, nested.path), (self.label_for_user1.id, self.label_for_user1.path+str(nested.id)+'/'))
+
+    def test_merge_nested_labels_after_login(self):
+        work = Labels.objects.create(name='work', owner=self.user1)
+        nested = Labels.objects.create(name='nested', owner=self.user1, parent=work)
+        leaf = Labels.objects.create(name='leaf', owner=self.user1, parent=nested)
+        self.note2_for_user1.label.add(nested)
+        self.client.post(reverse('login'), data=json.dumps(self.user1_credentials), content_type=CONTENT_TYPE)
+        response = self.client.post(reverse('merge-labels'), data=json.dumps({'target':self.label_for_user1.id, 'sources':[work.id, nested.id]}), content_type=CONTENT_TYPE)
+        self.assertEqual(response.data, {'notes':[self.note2_for_user1.id]})
+        self.assertFalse(Labels.objects.filter(id__in=[work.id, nested.id]).exists())
+        leaf.refresh_from_db()
+        self.assertEqual((leaf.parent_id, leaf.path), (self.label_for_user1.id, self.label_for_user1.path+str(leaf.id)+'/'))
+
+    def test_merge_labels_of_other_user_after_login(self):
+        self.client.post(reverse('login'), data=json.dumps(self.user1_credentials), content_type=CONTENT_TYPE)
+        response = self.client.post(reverse('merge-labels'), data=json.dumps({'target':self.label_for_user1.id, 'sources':[self.label_for_user2.id]}), content_type=CONTENT_TYPE)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_delete_labels_after_login(self):
+        nested = Labels.objects.create(name='nested', owner=self.user1, parent=self.label_for_user1)
+        self.note2_for_user1.label.add(nested)
+        self.client.post(reverse('login'), data=json.dumps(self.user1_credentials), content_type=CONTENT_TYPE)
+        response = self.client.post(reverse('delete-labels'), data=json.dumps({'labels':[self.label_for_user1.id, self.label_for_user2.id]}), content_type=CONTENT_TYPE)
+        self.assertEqual(response.data, {'notes':[self.note_for_user1.id, self.note2_for_user1.id]})
+        self.assertEqual(list(Labels.objects.values_list('id', flat=True)), [self.label_for_user2.id])
+
 ### Test cases for Archive note API:
 
     def test_archive_note_without_login(self):
@@ -458,6 +690,40 @@ class NotesAPITest(TestCase):
         response = self.client.put(reverse('note-to-trash', kwargs={'id': self.note_for_user1.id}),data=json.dumps(self.invalid_trash_payload),  content_type=CONTENT_TYPE)
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
+### Test cases for note state transition API
+
+    def test_note_state_transition_without_login(self):
+        response = self.client.put(reverse('note-state', kwargs={'id': self.note_for_user1.id, 'action': 'archive'}), content_type=CONTENT_TYPE)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_archive_and_pin_note_after_login(self):
+        self.client.post(reverse('login'),data=json.dumps(self.user1_credentials), content_type=CONTENT_TYPE)
+        response = self.client.put(reverse('note-state', kwargs={'id': self.note_for_user1.id, 'action': 'archive'}), content_type=CONTENT_TYPE)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'id': self.note_for_user1.id, 'isArchive': True})
+        self.client.put(reverse('note-state', kwargs={'id': self.note_for_user1.id, 'action': 'pin'}), content_type=CONTENT_TYPE)
+        note = Notes.objects.get(id=self.note_for_user1.id)
+        self.assertTrue(note.isArchive and note.isPinned)
+        self.assertEqual(note.version, 3)
+
+    def test_trash_and_restore_note_after_login(self):
+        self.client.post(reverse('login'),data=json.dumps(self.user1_credentials), content_type=CONTENT_TYPE)
+        self.client.put(reverse('note-state', kwargs={'id': self.note_for_user1.id, 'action': 'trash'}), content_type=CONTENT_TYPE)
+        self.assertIsNotNone(Notes.objects.get(id=self.note_for_user1.id).trashedAt)
+        response = self.client.put(reverse('note-state', kwargs={'id': self.note_for_user1.id, 'action': 'pin'}), content_type=CONTENT_TYPE)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.put(reverse('note-state', kwargs={'id': self.note_for_user1.id, 'action': 'restore'}), content_type=CONTENT_TYPE)
+        note = Notes.objects.get(id=self.note_for_user1.id)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(note.isDelete)
+        self.assertIsNone(note.trashedAt)
+
+    def test_note_state_transition_of_shared_note_after_login(self):
+        self.client.post(reverse('login'),data=json.dumps(self.user2_credentials), content_type=CONTENT_TYPE)
+        response = self.client.put(reverse('note-state', kwargs={'id': self.note3_for_user1.id, 'action': 'trash'}), content_type=CONTENT_TYPE)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(Notes.objects.get(id=self.note3_for_user1.id).isDelete)
+
 ### Test cases to get note of trash details by id:
 
     def test_get_note_in_trash_without_login(self):
@@ -547,6 +813,14 @@ class NotesAPITest(TestCase):
         else:
             self.assertNotEqual(response.data, serializer.data)
 
+
+    def test_get_trash_note_list_with_fields_after_login(self):
+        self.client.post(reverse('login'),data=json.dumps(self.user1_credentials), content_type=CONTENT_TYPE)
+        Notes.objects.filter(id=self.note2_for_user1.id).update(isDelete=True)
+        response = self.client.get(reverse('trash-list')+'?fields=title,isDelete', content_type=CONTENT_TYPE)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, [{'title': 'note2', 'isDelete': True}])
+
 ### Test cases for add-label-to-note API 
 
     def test_add_label_to_note_without_login(self):
@@ -573,6 +847,47 @@ class NotesAPITest(TestCase):
         response = self.client.put(reverse('add-label', kwargs={'note_id': self.note_for_user2.id}), data=json.dumps(self.valid_add_label_payload), content_type=CONTENT_TYPE)
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
+### Test cases for bulk add-labels API
+
+    def test_bulk_add_labels_without_login(self):
+        payload = {'notes': [self.note_for_user1.id], 'labels': ['label1', 'label3']}
+        response = self.client.put(reverse('add-labels'), data=json.dumps(payload), content_type=CONTENT_TYPE)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_bulk_add_labels_after_login(self):
+        self.client.post(reverse('login'),data=json.dumps(self.user1_credentials), content_type=CONTENT_TYPE)
+        payload = {'notes': [self.note_for_user1.id, self.note2_for_user1.id], 'labels': ['label1', 'label3']}
+        response = self.client.put(reverse('add-labels'), data=json.dumps(payload), content_type=CONTENT_TYPE)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Labels.objects.filter(owner=self.user1, name='label1').count(), 1)
+        self.assertEqual(set(self.note2_for_user1.label.values_list('name', flat=True)), {'label1', 'label3'})
+
+    def test_bulk_add_labels_with_other_user_note_after_login(self):
+        self.client.post(reverse('login'),data=json.dumps(self.user1_credentials), content_type=CONTENT_TYPE)
+        payload = {'notes': [self.note_for_user1.id, self.note_for_user2.id], 'labels': ['label3']}
+        response = self.client.put(reverse('add-labels'), data=json.dumps(payload), content_type=CONTENT_TYPE)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['missing'], [self.note_for_user2.id])
+        self.assertFalse(self.note_for_user2.label.exists())
+
+    def test_bulk_add_labels_to_only_other_user_notes_after_login(self):
+        self.client.post(reverse('login'),data=json.dumps(self.user1_credentials), content_type=CONTENT_TYPE)
+        payload = {'notes': [self.note_for_user2.id], 'labels': ['label3']}
+        response = self.client.put(reverse('add-labels'), data=json.dumps(payload), content_type=CONTENT_TYPE)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_labels_added_by_name_are_listed_and_deleted_alone_after_login(self):
+        self.client.post(reverse('login'),data=json.dumps(self.user1_credentials), content_type=CONTENT_TYPE)
+        payload = {'notes': [self.note2_for_user1.id], 'labels': ['label3']}
+        self.client.put(reverse('add-labels'), data=json.dumps(payload), content_type=CONTENT_TYPE)
+        label = Labels.objects.get(owner=self.user1, name='label3')
+        self.assertEqual(label.path, '/'+str(label.id)+'/')
+        response = self.client.get(reverse('list-notes-in-labels'), {'labels':str(label.id)})
+        self.assertEqual([note['title'] for note in response.data], [self.note2_for_user1.title])
+        response = self.client.post(reverse('delete-labels'), data=json.dumps({'labels':[label.id]}), content_type=CONTENT_TYPE)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(Labels.objects.values_list('id', flat=True)), {self.label_for_user1.id, self.label_for_user2.id})
+
 ### Test cases for list-notes-in-label
 
     def test_get_note_list_in_label_without_login(self):
@@ -602,6 +917,34 @@ class NotesAPITest(TestCase):
             self.assertNotEqual(response.data, serializer.data)
 
 
+    def test_get_notes_in_nested_labels_with_any_and_all_match(self):
+        work = Labels.objects.create(name='work', owner=self.user1)
+        project = Labels.objects.create(name='project', owner=self.user1, parent=work)
+        self.note2_for_user1.label.add(project)
+        self.note_for_user1.label.add(work)
+        self.note3_for_user1.label.add(self.label_for_user1)
+        self.client.post(reverse('login'),data=json.dumps(self.user1_credentials), content_type=CONTENT_TYPE)
+        response = self.client.get(reverse('list-notes-in-labels'), {'labels':str(work.id)})
+        self.assertEqual([note['title'] for note in response.data], ['note1', 'note2'])
+        response = self.client.get(reverse('list-notes-in-labels'), {'labels':str(work.id)+','+str(self.label_for_user1.id), 'match':'all'})
+        self.assertEqual([note['title'] for note in response.data], ['note1'])
+        response = self.client.get(reverse('list-notes-in-labels'), {'labels':str(work.id)+','+str(self.label_for_user1.id), 'limit':2, 'offset':1})
+        self.assertEqual((response.data['count'], [note['title'] for note in response.data['results']]), (3, ['note2', 'note3']))
+
+    def test_get_notes_in_label_skips_trashed_and_unshared_notes(self):
+        self.note2_for_user1.label.add(self.label_for_user1)
+        Notes.objects.filter(id=self.note2_for_user1.id).update(isDelete=True)
+        self.note_for_user2.label.add(self.label_for_user1)
+        self.client.post(reverse('login'),data=json.dumps(self.user1_credentials), content_type=CONTENT_TYPE)
+        response = self.client.get(reverse('list-notes-in-label', kwargs={'label_id': self.label_for_user1.id}))
+        self.assertEqual([note['title'] for note in response.data], ['note1'])
+
+    def test_nest_label_under_own_child_after_login(self):
+        child = Labels.objects.create(name='child', owner=self.user1, parent=self.label_for_user1)
+        self.client.post(reverse('login'),data=json.dumps(self.user1_credentials), content_type=CONTENT_TYPE)
+        response = self.client.put(reverse('label', kwargs={'id': self.label_for_user1.id}), data=json.dumps({'name':'label1', 'parent':child.id}), content_type=CONTENT_TYPE)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
 ### SeacrhNote API test cases :
 
     def test_get_note_list_with_searched_key_without_login(self):
@@ -629,6 +972,214 @@ class NotesAPITest(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertNotEqual(response.data, serializer.data)
 
+    def test_searched_notes_are_cached_per_user(self):
+        self.client.post(reverse('login'), data=json.dumps(self.user1_credentials), content_type=CONTENT_TYPE)
+        response = self.client.get(reverse('search'), self.search_valid_payload)
+        self.assertEqual(cache.get(search_key(self.user1.id, Notes.search_generation(self.user1.id), 'note'))['value'], response.data)
+        self.client.post(reverse('login'), data=json.dumps(self.user2_credentials), content_type=CONTENT_TYPE)
+        response = self.client.get(reverse('search'), self.search_valid_payload)
+        titles = [note['title'] for note in response.data]
+        self.assertIn(self.note_for_user2.title, titles)
+        self.assertNotIn(self.note_for_user1.title, titles)
+
+    def test_cached_searches_are_dropped_when_a_note_changes(self):
+        self.client.post(reverse('login'), data=json.dumps(self.user1_credentials), content_type=CONTENT_TYPE)
+        response = self.client.get(reverse('search'), self.search_valid_payload)
+        self.assertNotIn('new note', [note['title'] for note in response.data])
+        self.client.post(reverse('notes'), data=json.dumps({'title': 'new note', 'content': 'test'}), content_type=CONTENT_TYPE)
+        run_commit_hooks()
+        response = self.client.get(reverse('search'), self.search_valid_payload)
+        self.assertIn('new note', [note['title'] for note in response.data])
+        status_code, data = self.asgi_get(reverse('search'), b'search=note')
+        self.assertEqual(data, response.data)
+
+    @override_settings(THROTTLE_RATES={'search': '2/min'})
+    def test_search_is_throttled_per_user(self):
+        self.client.post(reverse('login'), data=json.dumps(self.user1_credentials), content_type=CONTENT_TYPE)
+        for attempt in range(2):
+            response = self.client.get(reverse('search'), self.search_valid_payload)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.get(reverse('search'), self.search_valid_payload)
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.client.post(reverse('login'), data=json.dumps(self.user2_credentials), content_type=CONTENT_TYPE)
+        response = self.client.get(reverse('search'), self.search_valid_payload)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+### NoteChanges API testcases :
+
+    def test_get_changes_without_login(self):
+        response = self.client.get(reverse('changes'), content_type=CONTENT_TYPE)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_get_all_changes_after_login(self):
+        self.client.post(reverse('login'), data=json.dumps(self.user1_credentials), content_type=CONTENT_TYPE)
+        response = self.client.get(reverse('changes'), content_type=CONTENT_TYPE)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual({change['id'] for change in response.data['changes']}, {self.note_for_user1.id, self.note2_for_user1.id, self.note3_for_user1.id})
+        self.assertFalse(response.data['more'])
+
+    def test_get_changes_since_cursor_after_login(self):
+        self.client.post(reverse('login'), data=json.dumps(self.user1_credentials), content_type=CONTENT_TYPE)
+        cursor = self.client.get(reverse('changes'), content_type=CONTENT_TYPE).data['cursor']
+        self.note2_for_user1.title = 'changed'
+        self.note2_for_user1.save()
+        deleted_note_id = self.note3_for_user1.id
+        self.note3_for_user1.delete()
+        response = self.client.get(reverse('changes'), {'since': cursor})
+        self.assertEqual([(change['id'], change['deleted']) for change in response.data['changes']], [(self.note2_for_user1.id, False), (deleted_note_id, True)])
+        self.assertEqual(response.data['changes'][0]['note']['title'], 'changed')
+
+    def test_get_changes_of_shared_note_after_login(self):
+        self.client.post(reverse('login'), data=json.dumps(self.user2_credentials), content_type=CONTENT_TYPE)
+        cursor = self.client.get(reverse('changes'), content_type=CONTENT_TYPE).data['cursor']
+        self.note3_for_user1.label.add(self.label_for_user1)
+        response = self.client.get(reverse('changes'), {'since': cursor})
+        self.assertEqual([change['id'] for change in response.data['changes']], [self.note3_for_user1.id])
+
+    def test_get_changes_in_pages_after_login(self):
+        self.client.post(reverse('login'), data=json.dumps(self.user1_credentials), content_type=CONTENT_TYPE)
+        response = self.client.get(reverse('changes'), {'limit': 2})
+        self.assertEqual(len(response.data['changes']), 2)
+        self.assertTrue(response.data['more'])
+        response = self.client.get(reverse('changes'), {'since': response.data['cursor'], 'limit': 2})
+        self.assertEqual(len(response.data['changes']), 1)
+        self.assertFalse(response.data['more'])
+
+    def test_poll_changes_returns_pending_changes_without_waiting(self):
+        self.client.post(reverse('login'), data=json.dumps(self.user1_credentials), content_type=CONTENT_TYPE)
+        response = self.client.get(reverse('changes-poll'), {'since': 0, 'timeout': 0})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['changes']), 3)
+
+### Async read endpoints testcases :
+
+    def asgi_get(self, path, query_string=b'', headers=()):
+        messages = []
+        async def receive():
+            return {'type': 'http.request'}
+        async def send(message):
+            messages.append(message)
+        cookie = ('sessionid=%s' % self.client.cookies['sessionid'].value).encode() if 'sessionid' in self.client.cookies else b''
+        scope = {'type': 'http', 'method': 'GET', 'path': path, 'query_string': query_string, 'headers': [(b'cookie', cookie)]+list(headers)}
+        async_to_sync(application)(scope, receive, send)
+        return messages[0]['status'], json.loads(messages[1]['body'])
+
+    def test_async_list_notes_without_login(self):
+        status_code, data = self.asgi_get(reverse('notes'))
+        self.assertEqual(status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_async_list_notes_after_login(self):
+        self.client.post(reverse('login'), data=json.dumps(self.user1_credentials), content_type=CONTENT_TYPE)
+        status_code, data = self.asgi_get(reverse('notes'))
+        self.assertEqual(status_code, status.HTTP_200_OK)
+        self.assertEqual(data, self.client.get(reverse('notes')).json())
+
+    def test_async_list_notes_with_fields_and_preview_after_login(self):
+        self.client.post(reverse('login'), data=json.dumps(self.user1_credentials), content_type=CONTENT_TYPE)
+        status_code, data = self.asgi_get(reverse('notes'), b'fields=title,content&preview=5')
+        self.assertEqual(status_code, status.HTTP_200_OK)
+        self.assertEqual(data, self.client.get(reverse('notes')+'?fields=title,content&preview=5').json())
+
+    def test_async_get_shared_note_after_login(self):
+        self.client.post(reverse('login'), data=json.dumps(self.user2_credentials), content_type=CONTENT_TYPE)
+        status_code, data = self.asgi_get(reverse('note', kwargs={'id': self.note3_for_user1.id}))
+        self.assertEqual(status_code, status.HTTP_200_OK)
+        self.assertEqual(data['title'], 'note3')
+
+    def test_async_get_other_user_note_after_login(self):
+        self.client.post(reverse('login'), data=json.dumps(self.user2_credentials), content_type=CONTENT_TYPE)
+        status_code, data = self.asgi_get(reverse('note', kwargs={'id': self.note_for_user1.id}))
+        self.assertEqual(status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_async_cached_waits_for_value_computed_elsewhere(self):
+        cache.clear()
+        with Lease('compute:key', 10):
+            threading.Timer(0.1, lambda: cache.set('key', {'value': 'other', 'delta': 0.1, 'expires': time.time()+60}, 60)).start()
+            self.assertEqual(async_to_sync(cached)('key', lambda: 'value'), 'other')
+
+    def test_async_list_notes_with_basic_auth(self):
+        credentials = base64.b64encode(b'malibharti5@gmail.com:bharti')
+        status_code, data = self.asgi_get(reverse('notes'), headers=[(b'authorization', b'Basic '+credentials)])
+        self.assertEqual(status_code, status.HTTP_200_OK)
+        self.assertEqual(data, self.client.get(reverse('notes'), HTTP_AUTHORIZATION='Basic '+credentials.decode()).json())
+        status_code, data = self.asgi_get(reverse('notes'), headers=[(b'authorization', b'Basic '+base64.b64encode(b'malibharti5@gmail.com:wrong'))])
+        self.assertEqual(status_code, status.HTTP_403_FORBIDDEN)
+
+### Attachment API testcases :
+
+    def start_attachment(self, note, content, **extra):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        payload = dict({'name': 'notes.txt', 'contentType': 'text/plain', 'size': len(content)}, **extra)
+        return self.client.post(reverse('note-attachments', kwargs={'id': note.id}), data=json.dumps(payload), content_type=CONTENT_TYPE)
+
+    def put_chunk(self, attachment_id, content, start, size):
+        return self.client.put(reverse('attachment', kwargs={'attachment_id': attachment_id}), data=content, content_type='application/octet-stream', HTTP_CONTENT_RANGE='bytes %d-%d/%d' % (start, start+len(content)-1, size))
+
+    def test_start_attachment_without_login(self):
+        response = self.client.post(reverse('note-attachments', kwargs={'id': self.note_for_user1.id}), data=json.dumps({'name': 'a.txt', 'size': 1}), content_type=CONTENT_TYPE)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_upload_attachment_in_chunks_after_login(self):
+        self.client.post(reverse('login'), data=json.dumps(self.user2_credentials), content_type=CONTENT_TYPE)
+        content = b'first chunk, second chunk'
+        response = self.start_attachment(self.note3_for_user1, content, sha256=hashlib.sha256(content).hexdigest())
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        attachment_id = response.data['id']
+        self.assertEqual(self.put_chunk(attachment_id, content[:13], 0, len(content)).data['received'], 13)
+        response = self.put_chunk(attachment_id, content[:13], 0, len(content))
+        self.assertEqual((response.status_code, response.data['received']), (status.HTTP_409_CONFLICT, 13))
+        self.assertEqual(self.put_chunk(attachment_id, content[13:], 13, len(content)).data['received'], len(content))
+        response = self.client.post(reverse('complete-attachment', kwargs={'attachment_id': attachment_id}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['isComplete'])
+        self.assertEqual(self.client.post(reverse('complete-attachment', kwargs={'attachment_id': attachment_id})).data, response.data)
+        response = self.client.get(reverse('note-attachments', kwargs={'id': self.note3_for_user1.id}))
+        self.assertEqual([attachment['name'] for attachment in response.data], ['notes.txt'])
+        response = self.client.get(reverse('attachment-content', kwargs={'attachment_id': attachment_id}), HTTP_RANGE='bytes=13-')
+        self.assertEqual(b''.join(response.streaming_content), content[13:])
+        self.assertTrue(response['Cache-Control'].startswith('private'))
+        self.assertTrue(response['Content-Disposition'].startswith('attachment'))
+        response = self.client.get(reverse('media', kwargs={'path': Attachment.objects.get(id=attachment_id).file.name}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_complete_attachment_with_wrong_sha256_after_login(self):
+        self.client.post(reverse('login'), data=json.dumps(self.user1_credentials), content_type=CONTENT_TYPE)
+        response = self.start_attachment(self.note_for_user1, b'content', sha256='0'*64)
+        attachment_id = response.data['id']
+        self.put_chunk(attachment_id, b'content', 0, 7)
+        response = self.client.post(reverse('complete-attachment', kwargs={'attachment_id': attachment_id}))
+        self.assertEqual((response.status_code, response.data['received']), (status.HTTP_400_BAD_REQUEST, 0))
+
+    def test_complete_incomplete_attachment_after_login(self):
+        self.client.post(reverse('login'), data=json.dumps(self.user1_credentials), content_type=CONTENT_TYPE)
+        attachment_id = self.start_attachment(self.note_for_user1, b'content').data['id']
+        self.put_chunk(attachment_id, b'con', 0, 7)
+        response = self.client.post(reverse('complete-attachment', kwargs={'attachment_id': attachment_id}))
+        self.assertEqual((response.status_code, response.data['received']), (status.HTTP_400_BAD_REQUEST, 3))
+
+    def test_get_attachment_of_other_user_note_after_login(self):
+        self.client.post(reverse('login'), data=json.dumps(self.user1_credentials), content_type=CONTENT_TYPE)
+        attachment_id = self.start_attachment(self.note_for_user1, b'content').data['id']
+        self.client.post(reverse('login'), data=json.dumps(self.user2_credentials), content_type=CONTENT_TYPE)
+        response = self.client.get(reverse('attachment', kwargs={'attachment_id': attachment_id}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_purged_note_removes_attachment_file(self):
+        self.client.post(reverse('login'), data=json.dumps(self.user1_credentials), content_type=CONTENT_TYPE)
+        attachment_id = self.start_attachment(self.note_for_user1, b'content').data['id']
+        self.put_chunk(attachment_id, b'content', 0, 7)
+        self.client.post(reverse('complete-attachment', kwargs={'attachment_id': attachment_id}))
+        path = Attachment.objects.get(id=attachment_id).file.path
+        Notes.objects.filter(id=self.note_for_user1.id).update(isDelete=True)
+        response = self.client.get(reverse('attachment', kwargs={'attachment_id': attachment_id}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        Notes.objects.get(id=self.note_for_user1.id).delete()
+        self.assertFalse(os.path.exists(path))
+
 ### AddCollaborator API testcase : 
 
     def test_add_collaborator_without_login(self):
@@ -650,6 +1201,28 @@ class NotesAPITest(TestCase):
         response = self.client.put(reverse('collaborator', kwargs={'note_id': self.note3_for_user1.id}), data=json.dumps(self.collaborator2_valid_payload), content_type=CONTENT_TYPE)
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
+### ShareNotes API testcases :
+
+    def test_share_notes_without_login(self):
+        payload = {'notes': [self.note_for_user1.id], 'emails': ['malibharti@gmail.com']}
+        response = self.client.put(reverse('share'), data=json.dumps(payload), content_type=CONTENT_TYPE)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_share_notes_after_login(self):
+        self.client.post(reverse('login'), data=json.dumps(self.user1_credentials), content_type=CONTENT_TYPE)
+        payload = {'notes': [self.note_for_user1.id, self.note2_for_user1.id, self.note_for_user2.id], 'emails': ['malibharti@gmail.com', 'malibharti05@gmail.com', 'unknown@gmail.com', 'malibharti5@gmail.com']}
+        response = self.client.put(reverse('share'), data=json.dumps(payload), content_type=CONTENT_TYPE)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['missing'], [self.note_for_user2.id])
+        self.assertEqual(response.data['collaborators'], {'malibharti@gmail.com': 'shared', 'malibharti05@gmail.com': 'shared', 'unknown@gmail.com': 'not found', 'malibharti5@gmail.com': 'own email'})
+        self.assertEqual(set(self.note2_for_user1.collaborator.all()), {self.user2, self.user3})
+
+    def test_share_other_user_notes_after_login(self):
+        self.client.post(reverse('login'), data=json.dumps(self.user1_credentials), content_type=CONTENT_TYPE)
+        payload = {'notes': [self.note_for_user2.id], 'emails': ['malibharti05@gmail.com']}
+        response = self.client.put(reverse('share'), data=json.dumps(payload), content_type=CONTENT_TYPE)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
 ### Reminder API testcases:
 
     def test_add_reminder_without_login(self):
@@ -673,6 +1246,18 @@ class NotesAPITest(TestCase):
 
 ### Delete remider API test case:
 
+    def test_add_recurring_reminder_after_login(self):
+        self.client.post(reverse('login'), data=json.dumps(self.user1_credentials), content_type=CONTENT_TYPE)
+        response = self.client.put(reverse('reminder', kwargs={'note_id': self.note_for_user1.id}), data=json.dumps({'reminderRule':'daily'}), content_type=CONTENT_TYPE)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        note = Notes.objects.get(id=self.note_for_user1.id)
+        self.assertEqual((note.reminderRule, note.reminder), ('@daily', datetime.combine(datetime.now().date()+timedelta(days=1), datetime.min.time())))
+
+    def test_add_reminder_with_invalid_rule_after_login(self):
+        self.client.post(reverse('login'), data=json.dumps(self.user1_credentials), content_type=CONTENT_TYPE)
+        response = self.client.put(reverse('reminder', kwargs={'note_id': self.note_for_user1.id}), data=json.dumps({'reminderRule':'0 0 31 2 *'}), content_type=CONTENT_TYPE)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_delete_reminder_without_login(self):
         response = self.client.delete(reverse('reminder', kwargs={'note_id': self.note_for_user1.id}), content_type=CONTENT_TYPE)
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -680,4 +1265,28 @@ class NotesAPITest(TestCase):
     def test_delete_reminder_after_login_with_valid_payload(self):
         self.client.post(reverse('login'), data=json.dumps(self.user1_credentials), content_type=CONTENT_TYPE)
         response = self.client.delete(reverse('reminder', kwargs={'note_id': self.note_for_user1.id}), content_type=CONTENT_TYPE)
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+### Notifications API testcases :
+
+    def test_send_reminder_notifies_owner_and_collaborators(self):
+        cache.clear()
+        Notes.objects.filter(id__in=[self.note_for_user1.id, self.note3_for_user1.id]).update(reminder=datetime.now()-timedelta(minutes=1))
+        send_reminder()
+        self.assertEqual(sorted(Notification.objects.values_list('user_id', 'note_id')), sorted([(self.user1.id, self.note_for_user1.id), (self.user1.id, self.note3_for_user1.id), (self.user2.id, self.note3_for_user1.id)]))
+        self.client.post(reverse('login'), data=json.dumps(self.user2_credentials), content_type=CONTENT_TYPE)
+        response = self.client.get(reverse('notifications'), {'unread':'true'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([notification['title'] for notification in response.data], ['note3'])
+
+    def test_mark_notifications_read_after_login(self):
+        Notification.objects.create(user=self.user1, note=self.note_for_user1, reminder=datetime.now())
+        Notification.objects.create(user=self.user2, note=self.note3_for_user1, reminder=datetime.now())
+        self.client.post(reverse('login'), data=json.dumps(self.user1_credentials), content_type=CONTENT_TYPE)
+        response = self.client.put(reverse('notifications'), data=json.dumps({}), content_type=CONTENT_TYPE)
+        self.assertEqual(response.data, {'response':1})
+        self.assertEqual(list(Notification.objects.filter(isRead=False).values_list('user_id', flat=True)), [self.user2.id])
+
+    def test_get_notifications_without_login(self):
+        response = self.client.get(reverse('notifications'))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
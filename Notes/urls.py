@@ -1,22 +1,37 @@
 from django.urls import path
 from django.conf.urls import url
-from Notes.views import CreateAndListNotes, NoteDetails, DeleteNote, CreateAndListLabels, LabelDetails,  ArchiveNote, TrashUntrash, ArchiveNotesList, TrashList, AddLabelsToNote, ListNotesInLabel, SearchNote, AddCollaborator, Reminder
+from Notes.views import CreateAndListNotes, NoteDetails, NoteRevisions, NoteRevisionDetails, NoteAttachments, AttachmentUpload, CompleteAttachment, AttachmentContent, DeleteNote, CreateAndListLabels, LabelDetails, MergeLabels, DeleteLabels,  ArchiveNote, TrashUntrash, ArchiveNotesList, NoteStateTransition, TrashList, AddLabelsToNote, BulkAddLabels, ListNotesInLabel, SearchNote, NoteChanges, PollNoteChanges, Notifications, AddCollaborator, ShareNotes, Reminder
 
 
 
 urlpatterns = [
     path('notes/',CreateAndListNotes.as_view() , name='notes'),
     path('note/<int:id>',NoteDetails.as_view() , name='note'),
+    path('note/<int:id>/revisions/', NoteRevisions.as_view(), name='note-revisions'),
+    path('note/<int:id>/revisions/<int:number>', NoteRevisionDetails.as_view(), name='note-revision'),
+    path('note/<int:id>/attachments/', NoteAttachments.as_view(), name='note-attachments'),
+    path('attachment/<uuid:attachment_id>', AttachmentUpload.as_view(), name='attachment'),
+    path('attachment/<uuid:attachment_id>/complete', CompleteAttachment.as_view(), name='complete-attachment'),
+    path('attachment/<uuid:attachment_id>/content', AttachmentContent.as_view(), name='attachment-content'),
     path('delete-note/<int:id>', DeleteNote.as_view(), name='delete-note'),
     path('labels/',CreateAndListLabels.as_view() , name='labels'),
     path('label/<int:id>',LabelDetails.as_view() , name='label'),
+    path('merge-labels/', MergeLabels.as_view(), name='merge-labels'),
+    path('delete-labels/', DeleteLabels.as_view(), name='delete-labels'),
     path('archive-note/<int:id>', ArchiveNote.as_view(), name='archive-note'),
     path('note-to-trash/<int:id>', TrashUntrash.as_view(), name='note-to-trash'),
+    url(r'^note/(?P<id>\d+)/(?P<action>archive|unarchive|trash|restore|pin|unpin)$', NoteStateTransition.as_view(), name='note-state'),
     path('archive-list/', ArchiveNotesList.as_view(), name='archive-list'),
     path('trash-list/',TrashList.as_view(), name='trash-list'),
     path('add-label/<int:note_id>', AddLabelsToNote.as_view(), name='add-label'),
+    path('add-labels/', BulkAddLabels.as_view(), name='add-labels'),
     path('list-notes-in-label/<int:label_id>', ListNotesInLabel.as_view(), name='list-notes-in-label'),
+    path('list-notes-in-labels/', ListNotesInLabel.as_view(), name='list-notes-in-labels'),
     path('search/', SearchNote.as_view(), name='search'),
+    path('changes/', NoteChanges.as_view(), name='changes'),
+    path('changes/poll/', PollNoteChanges.as_view(), name='changes-poll'),
+    path('notifications/', Notifications.as_view(), name='notifications'),
     path('collaborator/<int:note_id>', AddCollaborator.as_view(), name='collaborator'),
+    path('share/', ShareNotes.as_view(), name='share'),
     path('reminder/<int:note_id>', Reminder.as_view(), name='reminder'),
 ]
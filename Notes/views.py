@@ -1,22 +1,116 @@
 from django.shortcuts import render
-from Notes.serializers import NotesSerializer, LabelsSerializer, ArchiveNotesSerializer, TrashSerializer, AddLabelsToNoteSerializer,ListNotesSerializer, AddCollaboratorSerializer,ReminderSerializer
+from Notes.serializers import NotesSerializer, NotePreviewSerializer, LabelsSerializer, LabelCountSerializer, ArchiveNotesSerializer, TrashSerializer, AddLabelsToNoteSerializer,ListNotesSerializer, AddCollaboratorSerializer,ReminderSerializer, BulkAddLabelsSerializer, MergeLabelsSerializer, DeleteLabelsSerializer, ShareNotesSerializer, NoteChangeSerializer, NoteRevisionSerializer, NoteRevisionDetailsSerializer, RestoreRevisionSerializer, AttachmentSerializer, NotificationSerializer, ReadNotificationsSerializer, parse_projection
 from Notes.permissions import IsOwner, IsCollaborator
-from Notes.models import Notes, Labels
+from Notes.events import hub
+from Notes.entries import note_entry, search_key
+from Notes.reminders import next_fire
+from Notes.models import Notes, Labels, NoteChange, NoteRevision, Attachment, Notification
+from KeepNotes.cache import get_or_compute
+from KeepNotes.media import media_response
+from KeepNotes.storage import content_storage
 from authentication.models import User
 from rest_framework import generics, permissions
 from rest_framework.response import Response
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.exceptions import APIException, ErrorDetail
 from django.conf import settings
+from django.http import Http404
+from django.db import transaction
 from django.db.models import Q
-from django.core.cache import cache
 from rest_framework import status
 import logging
+import os
+import re
+import threading
 from datetime import datetime, timedelta
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
 logger = logging.getLogger('django')
 
-class CreateAndListNotes(generics.ListCreateAPIView):
+
+class VersionConflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = 'Note was changed by someone else, reload it and retry.'
+    default_code = 'version_conflict'
+
+    def __init__(self, version):
+        self.detail = {'detail':ErrorDetail(self.default_detail, self.default_code), 'version':version}
+
+
+class VersionedUpdateMixin:
+    """
+        Summary:
+        --------
+            This mixin saves only the changed fields of a note with a conditional UPDATE on its version.
+        --------
+        Methods:
+            get_expected_version : It returns the version sent in payload or If-Match header.
+            save_versioned : It writes the changed fields or raises VersionConflict with the current version.
+    """
+
+    def get_expected_version(self, serializer):
+        """
+            Args:
+                serializer : [validated serializer of the update]
+            Returns:
+                [int]: [version the client based its changes on, None if not sent]
+        """
+        version = serializer.validated_data.pop('version', None)
+        if version is None:
+            header = self.request.META.get('HTTP_IF_MATCH', '').replace('W/', '').strip('" ')
+            version = int(header) if header.isdigit() else None
+        return version
+
+    def save_versioned(self, serializer, **fields):
+        """
+            Args:
+                serializer : [validated serializer of the update]
+                fields : [extra field values to save]
+            Returns:
+                [Notes]: [note instance carrying the saved values and new version]
+        """
+        note = serializer.instance
+        version = self.get_expected_version(serializer)
+        if version is None:
+            version = note.version
+        fields = {field: value for field, value in dict(serializer.validated_data, **fields).items() if getattr(note, field) != value}
+        new_version = Notes.objects.update_versioned(note.id, version, fields, self.request.user) if fields else (version if version == note.version else None)
+        if new_version is None:
+            current = Notes.objects.filter(id=note.id).values_list('version', flat=True).first()
+            raise VersionConflict(current)
+        for field, value in fields.items():
+            setattr(note, field, value)
+        note.version = new_version
+        return note
+
+
+class ProjectionMixin:
+    """
+        Summary:
+        --------
+            This mixin lets list views return only the fields asked with ?fields=title,label
+            and a preview of content asked with ?preview=N.
+        --------
+        Methods:
+            get_serializer : It passes the requested projection to the serializer of GET requests.
+            filter_queryset : It loads only the columns needed by the requested fields.
+    """
+    projection_params = [
+        openapi.Parameter('fields',in_=openapi.IN_QUERY,description='Comma separated fields to return',type=openapi.TYPE_STRING),
+        openapi.Parameter('preview',in_=openapi.IN_QUERY,description='Return only the first N characters of content',type=openapi.TYPE_INTEGER),
+    ]
+
+    def get_serializer(self, *args, **kwargs):
+        if self.request.method == 'GET':
+            kwargs['fields'], kwargs['preview'] = parse_projection(self.request.query_params)
+        return super().get_serializer(*args, **kwargs)
+
+    def filter_queryset(self, queryset):
+        return self.get_serializer().project(super().filter_queryset(queryset))
+
+
+class CreateAndListNotes(ProjectionMixin, generics.ListCreateAPIView):
     """
         Summary:
         --------
@@ -24,12 +118,22 @@ class CreateAndListNotes(generics.ListCreateAPIView):
         --------
         Methods:
             get_queryset : User will get all the notes.
+            get_serializer_class : It returns the preview serializer for listing notes.
             perform_create : User will able to create new note.
     """
     serializer_class = NotesSerializer
     queryset = Notes.objects.all()
     permission_classes = (permissions.IsAuthenticated,)
 
+    def get_serializer_class(self):
+        """
+            Returns:
+                [class]: [serializer with only the stored preview of compressed notes for GET]
+        """
+        if self.request.method == 'GET':
+            return NotePreviewSerializer
+        return self.serializer_class
+
     def perform_create(self,serializer):
         """
             Args:
@@ -39,10 +143,7 @@ class CreateAndListNotes(generics.ListCreateAPIView):
                 [Response]: [success message and status code]
         """
         owner = self.request.user
-        note = serializer.save(owner=owner)
-        cache.set(str(owner)+"-notes-"+str(note.id), note)
-        if cache.get(str(owner)+"-notes-"+str(note.id)):
-            logger.info("Data is stored in cache")
+        serializer.save(owner=owner)
         return Response({'success':'New note is created!!'}, status=status.HTTP_201_CREATED)
     
     def get_queryset(self): 
@@ -55,7 +156,7 @@ class CreateAndListNotes(generics.ListCreateAPIView):
         return self.queryset.filter(Q(owner=owner)|Q(collaborator=owner), Q(isArchive=False,isDelete=False)).distinct()   
                           
 
-class NoteDetails(generics.RetrieveUpdateAPIView):
+class NoteDetails(VersionedUpdateMixin, generics.RetrieveUpdateAPIView):
     """
         Summary:
         --------
@@ -63,6 +164,7 @@ class NoteDetails(generics.RetrieveUpdateAPIView):
         --------
         Methods:
             get_queryset : User will get the note by id.
+            retrieve : User will get the note from the cache entry shared with its collaborators.
             perform_update : User will able to update note.
     """
     serializer_class = NotesSerializer
@@ -70,6 +172,22 @@ class NoteDetails(generics.RetrieveUpdateAPIView):
     permission_classes = (permissions.IsAuthenticated,IsCollaborator)
     lookup_field="id"
 
+    def retrieve(self, request, id):
+        """
+            Args:
+                id : [id of note provided in url]
+            Returns:
+                [Response]: [serialized note and status code, the serialized note is cached once for
+                             owner and collaborators, dropped whenever the note changes and
+                             recomputed by one request at a time]
+        """
+        entry = get_or_compute(Notes.cache_key(id), lambda: note_entry(id))
+        if entry is None:
+            raise Http404
+        if request.user.id != entry['owner'] and request.user.id not in entry['collaborators']:
+            self.permission_denied(request)
+        return Response(entry['data'], status=status.HTTP_200_OK)
+
     def perform_update(self,serializer):
         """
             Args:
@@ -78,9 +196,7 @@ class NoteDetails(generics.RetrieveUpdateAPIView):
             Returns:
                 [Response]: [serialized note data and status code]
         """
-        owner = self.request.user
-        note = serializer.save()
-        cache.set(str(owner)+"-notes-"+str(self.kwargs[self.lookup_field]), self.queryset.all())
+        note = self.save_versioned(serializer)
         logger.info("udated note data is set")
         return Response({'response': note}, status=status.HTTP_200_OK)
 
@@ -90,19 +206,292 @@ class NoteDetails(generics.RetrieveUpdateAPIView):
             Returns:
                 [queryset]: [owned or shared note fetched by given id]
         """
-        owner = self.request.user
-        if cache.get(str(owner)+"-notes-"+str(self.kwargs[self.lookup_field])):
-            queryset = cache.get(str(owner)+"-notes-"+str(self.kwargs[self.lookup_field]))
-            logger.info("udated note data is coming from cache")
-            return queryset
-        else:
-            queryset = self.queryset.filter(isDelete=False)
-            logger.info("updated note data is coming form DB")
-            if queryset:
-                cache.set(str(owner)+"-notes-"+str(self.kwargs[self.lookup_field]), queryset)
-            return queryset
+        return self.queryset.filter(isDelete=False)
             
 
+class NoteRevisions(generics.GenericAPIView):
+    """
+        Summary:
+        --------
+            This class will let authorized user to list the revisions of an owned or shared note.
+        --------
+        Methods:
+            get : It returns revision numbers, authors and dates, newest first.
+    """
+    serializer_class = NoteRevisionSerializer
+    queryset = Notes.objects.filter(isDelete=False)
+    permission_classes = (permissions.IsAuthenticated,IsCollaborator)
+    lookup_field = "id"
+
+    def get(self, request, id):
+        """
+            Args:
+                id : [id of note provided in url]
+            Returns:
+                [Response]: [serialized revisions of note and status code]
+        """
+        note = self.get_object()
+        revisions = note.revisions.defer('data').select_related('author').order_by('-number')
+        return Response(self.get_serializer(revisions, many=True).data, status=status.HTTP_200_OK)
+
+
+class NoteRevisionDetails(VersionedUpdateMixin, generics.GenericAPIView):
+    """
+        Summary:
+        --------
+            This class will let authorized user to view a revision of a note or restore the note to it.
+        --------
+        Methods:
+            get_revision : It rebuilds the revision from its snapshot and deltas.
+            get : It returns title and content of the revision.
+            put : It writes title and content of the revision as a new version of the note.
+    """
+    serializer_class = NoteRevisionDetailsSerializer
+    queryset = Notes.objects.filter(isDelete=False)
+    permission_classes = (permissions.IsAuthenticated,IsCollaborator)
+    lookup_field = "id"
+
+    def get_revision(self, note, number):
+        """
+            Args:
+                note : [note fetched by id]
+                number : [revision number provided in url]
+            Returns:
+                [NoteRevision]: [revision with its title and body, None if it does not exist]
+        """
+        return NoteRevision.objects.get_revision(note.id, number)
+
+    def get(self, request, id, number):
+        """
+            Args:
+                id : [id of note provided in url]
+                number : [revision number provided in url]
+            Returns:
+                [Response]: [serialized revision and status code]
+        """
+        revision = self.get_revision(self.get_object(), number)
+        if revision is None:
+            return Response({'response':'This revision does not exist'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(self.get_serializer(revision).data, status=status.HTTP_200_OK)
+
+    @swagger_auto_schema(request_body=RestoreRevisionSerializer)
+    def put(self, request, id, number):
+        """
+            Args:
+                id : [id of note provided in url]
+                number : [revision number provided in url]
+            Returns:
+                [Response]: [new version of note and status code]
+        """
+        note = self.get_object()
+        revision = self.get_revision(note, number)
+        if revision is None:
+            return Response({'response':'This revision does not exist'}, status=status.HTTP_404_NOT_FOUND)
+        serializer = RestoreRevisionSerializer(note, data=request.data)
+        serializer.is_valid(raise_exception=True)
+        note = self.save_versioned(serializer, title=revision.title, body=revision.body)
+        return Response({'response':'Note is restored to revision '+str(number), 'version':note.version}, status=status.HTTP_200_OK)
+
+
+class NoteAttachments(generics.GenericAPIView):
+    """
+        Summary:
+        --------
+            This class will let authorized user to list the attachments of a note or start uploading a new one.
+        --------
+        Methods:
+            get : It returns the completely uploaded attachments of note.
+            post : It creates an attachment waiting for its chunks.
+    """
+    serializer_class = AttachmentSerializer
+    queryset = Notes.objects.filter(isDelete=False)
+    permission_classes = (permissions.IsAuthenticated,IsCollaborator)
+    lookup_field = "id"
+
+    def get(self, request, id):
+        """
+            Args:
+                id : [id of note provided in url]
+            Returns:
+                [Response]: [serialized attachments and status code]
+        """
+        attachments = self.get_object().attachments.filter(isComplete=True).order_by('date')
+        return Response(self.get_serializer(attachments, many=True).data, status=status.HTTP_200_OK)
+
+    def post(self, request, id):
+        """
+            Args:
+                id : [id of note provided in url]
+            Returns:
+                [Response]: [serialized attachment with the chunk size to use and status code]
+        """
+        note = self.get_object()
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        attachment = serializer.save(note=note, owner=request.user)
+        os.makedirs(os.path.dirname(attachment.part_path()), exist_ok=True)
+        open(attachment.part_path(), 'wb').close()
+        return Response(dict(serializer.data, chunkSize=settings.ATTACHMENT_CHUNK_SIZE), status=status.HTTP_201_CREATED)
+
+
+class AttachmentMixin:
+    """
+        Summary:
+        --------
+            This mixin fetches an attachment of a note owned by or shared with the logged in user.
+        --------
+        Methods:
+            get_attachment : It returns the attachment given in url or raises 404.
+    """
+    serializer_class = AttachmentSerializer
+    permission_classes = (permissions.IsAuthenticated,)
+
+    def get_attachment(self, attachment_id):
+        """
+            Args:
+                attachment_id : [id of attachment provided in url]
+            Returns:
+                [Attachment]: [attachment visible to the logged in user]
+        """
+        attachment = Attachment.objects.visible_to(self.request.user).filter(id=attachment_id).first()
+        if attachment is None:
+            raise Http404
+        return attachment
+
+
+class AttachmentUpload(AttachmentMixin, generics.GenericAPIView):
+    """
+        Summary:
+        --------
+            This class will let authorized user to upload an attachment chunk by chunk and resume an interrupted upload.
+        --------
+        Methods:
+            get : It returns the upload state, received tells where to resume.
+            put : It writes the request body at the offset given by Content-Range.
+            delete : It deletes the attachment or aborts its upload.
+    """
+    content_range = re.compile(r'^bytes (\d+)-(\d+)/(\d+)$')
+    read_size = 64*1024
+
+    def get(self, request, attachment_id):
+        """
+            Args:
+                attachment_id : [id of attachment provided in url]
+            Returns:
+                [Response]: [serialized attachment and status code]
+        """
+        return Response(self.get_serializer(self.get_attachment(attachment_id)).data, status=status.HTTP_200_OK)
+
+    def put(self, request, attachment_id):
+        """
+            Args:
+                attachment_id : [id of attachment provided in url]
+            Returns:
+                [Response]: [bytes received so far and status code, 409 with received if the chunk does not
+                             start where the upload stopped]
+        """
+        attachment = self.get_attachment(attachment_id)
+        match = self.content_range.match(request.META.get('HTTP_CONTENT_RANGE', ''))
+        if attachment.isComplete:
+            return Response({'response':'Attachment is already uploaded'}, status=status.HTTP_409_CONFLICT)
+        if not match or int(match.group(3)) != attachment.size or int(match.group(1)) > int(match.group(2)) or int(match.group(2)) >= attachment.size:
+            return Response({'response':'Content-Range header must be bytes first-last/size'}, status=status.HTTP_400_BAD_REQUEST)
+        start, length = int(match.group(1)), int(match.group(2))-int(match.group(1))+1
+        if length > settings.ATTACHMENT_CHUNK_SIZE:
+            return Response({'response':'Chunk is larger than '+str(settings.ATTACHMENT_CHUNK_SIZE)+' bytes'}, status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        if start != attachment.received:
+            return Response({'response':'Upload continues at byte '+str(attachment.received), 'received':attachment.received}, status=status.HTTP_409_CONFLICT)
+        written = 0
+        with open(attachment.part_path(), 'r+b') as part:
+            part.seek(start)
+            while written < length:
+                data = request.stream.read(min(self.read_size, length-written)) if request.stream else b''
+                if not data:
+                    break
+                part.write(data)
+                written += len(data)
+        if not Attachment.objects.filter(id=attachment.id, received=start).update(received=start+written, updatedAt=datetime.now()):
+            received = Attachment.objects.filter(id=attachment.id).values_list('received', flat=True).first()
+            return Response({'response':'Upload continues at byte '+str(received), 'received':received}, status=status.HTTP_409_CONFLICT)
+        return Response({'received':start+written}, status=status.HTTP_200_OK)
+
+    def delete(self, request, attachment_id):
+        """
+            Args:
+                attachment_id : [id of attachment provided in url]
+            Returns:
+                [Response]: [success message and status code]
+        """
+        attachment = self.get_attachment(attachment_id)
+        note_id = attachment.note_id
+        attachment.delete()
+        if attachment.isComplete:
+            NoteChange.objects.record([note_id])
+        return Response({'response':'Attachment is deleted'}, status=status.HTTP_204_NO_CONTENT)
+
+
+class CompleteAttachment(AttachmentMixin, generics.GenericAPIView):
+    """
+        Summary:
+        --------
+            This class will let authorized user to finish an upload once every chunk is received.
+        --------
+        Methods:
+            post : It checks size and sha256 of the received file and stores it by content.
+    """
+
+    def post(self, request, attachment_id):
+        """
+            Args:
+                attachment_id : [id of attachment provided in url]
+            Returns:
+                [Response]: [serialized attachment and status code, 400 if the file is incomplete or corrupted]
+            The attachment row stays locked until the file is stored, so a concurrent or retried
+            completion waits and then returns the completed attachment instead of looking for the
+            part file that was moved away.
+        """
+        attachment = self.get_attachment(attachment_id)
+        with transaction.atomic():
+            attachment = Attachment.objects.select_for_update().get(id=attachment.id)
+            if attachment.isComplete:
+                return Response(self.get_serializer(attachment).data, status=status.HTTP_200_OK)
+            if attachment.received != attachment.size or os.path.getsize(attachment.part_path()) != attachment.size:
+                return Response({'response':'Upload is not complete', 'received':attachment.received}, status=status.HTTP_400_BAD_REQUEST)
+            digest = attachment.digest()
+            if attachment.sha256 and attachment.sha256 != digest:
+                Attachment.objects.filter(id=attachment.id).update(received=0)
+                open(attachment.part_path(), 'wb').close()
+                return Response({'response':'sha256 of the uploaded file does not match, upload it again', 'received':0}, status=status.HTTP_400_BAD_REQUEST)
+            name = content_storage.store('attachments/'+os.path.basename(attachment.name), attachment.part_path(), digest)
+            Attachment.objects.filter(id=attachment.id).update(file=name, sha256=digest, isComplete=True)
+            NoteChange.objects.record([attachment.note_id])
+        attachment.refresh_from_db()
+        return Response(self.get_serializer(attachment).data, status=status.HTTP_200_OK)
+
+
+class AttachmentContent(AttachmentMixin, generics.GenericAPIView):
+    """
+        Summary:
+        --------
+            This class will let authorized user to download an attachment, byte ranges are supported.
+        --------
+        Methods:
+            get : It returns the file of a completely uploaded attachment.
+    """
+
+    def get(self, request, attachment_id):
+        """
+            Args:
+                attachment_id : [id of attachment provided in url]
+            Returns:
+                [HttpResponse]: [file of attachment]
+        """
+        attachment = self.get_attachment(attachment_id)
+        if not attachment.isComplete:
+            raise Http404
+        return media_response(request, content_storage, attachment.file.name, attachment.contentType or None, True, attachment.name, private=True)
+
+
 class DeleteNote(generics.RetrieveDestroyAPIView):
     """
         Summary:
@@ -125,8 +514,6 @@ class DeleteNote(generics.RetrieveDestroyAPIView):
             Returns:
                 [Response]: [success message and status code]
         """
-        owner = self.request.user
-        cache.delete(str(owner)+"-notes-"+str(self.kwargs[self.lookup_field]))
         instance.delete()
         return Response({'response': 'Note is deleted permanently.'}, status=status.HTTP_204_NO_CONTENT)
 
@@ -139,11 +526,22 @@ class CreateAndListLabels(generics.ListCreateAPIView):
         --------
         Methods:
             get_queryset : User will get all the labels.
+            list : User will get all the labels with their active note counts.
             perform_create : User will able to create new label.
     """
     serializer_class = LabelsSerializer
     queryset = Labels.objects.all()
     permission_classes = (permissions.IsAuthenticated,)
+
+    def list(self, request):
+        """
+            Returns:
+                [Response]: [labels of user with their note counts and status code, computed by one
+                             aggregate query and cached until a note or label of user changes]
+        """
+        data = get_or_compute(Labels.counts_key(request.user.id),
+            lambda: list(LabelCountSerializer(Labels.objects.with_counts(request.user), many=True).data), settings.LABEL_COUNTS_TIMEOUT)
+        return Response(data, status=status.HTTP_200_OK)
     
     def perform_create(self,serializer):
         """
@@ -154,10 +552,7 @@ class CreateAndListLabels(generics.ListCreateAPIView):
                 [Response]: [success message and status code]
         """
         owner = self.request.user
-        label = serializer.save(owner=owner)
-        cache.set(str(owner)+"-labels-"+str(label.id), label)
-        if cache.get(str(owner)+"-labels-"+str(label.id)):
-            logger.info("Label data is stored in cache")
+        serializer.save(owner=owner)
         return Response({'success':'New label is created!!'}, status=status.HTTP_201_CREATED)
 
     def get_queryset(self):
@@ -179,7 +574,7 @@ class LabelDetails(generics.RetrieveUpdateDestroyAPIView):
         Methods:
             get_queryset : User will get label by id.
             perform_update : User will able to update label.
-            perform_destroy : User will able to delete label.
+            perform_destroy : User will able to delete label, labels nested under it are deleted with it.
     """
     serializer_class = LabelsSerializer
     queryset = Labels.objects.all()
@@ -196,27 +591,15 @@ class LabelDetails(generics.RetrieveUpdateDestroyAPIView):
         """
         owner = self.request.user
         label = serializer.save(owner=owner)
-        cache.set(str(owner)+"-labels-"+str(self.kwargs[self.lookup_field]), self.queryset.all())
-        logger.info("udated label data is set")
         return Response({'response':label}, status=status.HTTP_200_OK)
     
     def get_queryset(self):
         """
             Args:
             Returns:
-                [queryset]: [label fetched by given id and owned by user]
+                [queryset]: [labels owned by user, the label with given id is fetched from it]
         """
-        owner = self.request.user
-        if cache.get(str(owner)+"-labels-"+str(self.kwargs[self.lookup_field])):
-            queryset = cache.get(str(owner)+"-labels-"+str(self.kwargs[self.lookup_field]))
-            logger.info("udated label data is coming from cache")
-            return queryset
-        else:
-            queryset = self.queryset.filter(owner=owner)
-            logger.info("updated label data is coming form DB")
-            if queryset:
-                cache.set(str(owner)+"-labels-"+str(self.kwargs[self.lookup_field]), queryset)
-            return queryset
+        return self.queryset.filter(owner=self.request.user)
 
     def perform_destroy(self, instance):
         """
@@ -224,15 +607,75 @@ class LabelDetails(generics.RetrieveUpdateDestroyAPIView):
                 instance : [fetched label object by id ]
 
             Returns:
-                [Response]: [success message and status code]
+                [Response]: [success message and status code, like delete-labels/ the whole
+                             subtree of the label is deleted and its notes keep their other labels]
         """
-        owner = self.request.user
-        cache.delete(str(owner)+"-labels-"+str(self.kwargs[self.lookup_field]))
         instance.delete()
         return Response({'response': 'Label is deleted.'}, status=status.HTTP_204_NO_CONTENT)
 
 
-class ArchiveNote(generics.RetrieveUpdateAPIView):
+class MergeLabels(generics.GenericAPIView):
+    """
+        Summary:
+        --------
+            This class will let authorized user to merge several labels into one.
+        --------
+        Methods:
+            post: It relabels the notes of the source labels with the target label and deletes the sources.
+    """
+    permission_classes = (permissions.IsAuthenticated,)
+    serializer_class = MergeLabelsSerializer
+
+    def post(self, request):
+        """
+            Args:
+                request : [target label id and source label ids]
+            Returns:
+                [Response]: [relabeled note ids and status code]
+        """
+        serializer = self.serializer_class(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        target_id = serializer.validated_data['target']
+        source_ids = set(serializer.validated_data['sources']) - {target_id}
+        labels = {label.id: label for label in Labels.objects.filter(owner=request.user, id__in=source_ids | {target_id}).only('id', 'owner', 'path')}
+        if len(labels) != len(source_ids)+1:
+            return Response({'response':'Labels do not exist'}, status=status.HTTP_404_NOT_FOUND)
+        target, sources = labels[target_id], [labels[id] for id in source_ids]
+        if any(target.path.startswith(source.path) for source in sources):
+            return Response({'response':'Label can not be merged into a label nested under it'}, status=status.HTTP_400_BAD_REQUEST)
+        note_ids = Labels.objects.merge(target, sources)
+        return Response({'notes':sorted(note_ids)}, status=status.HTTP_200_OK)
+
+
+class DeleteLabels(generics.GenericAPIView):
+    """
+        Summary:
+        --------
+            This class will let authorized user to delete several labels at once.
+        --------
+        Methods:
+            post: It deletes the labels with the labels nested under them.
+    """
+    permission_classes = (permissions.IsAuthenticated,)
+    serializer_class = DeleteLabelsSerializer
+
+    def post(self, request):
+        """
+            Args:
+                request : [label ids]
+            Returns:
+                [Response]: [ids of notes that lost a label and status code]
+        """
+        serializer = self.serializer_class(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        labels = list(Labels.objects.filter(owner=request.user, id__in=serializer.validated_data['labels']).only('id', 'owner', 'path'))
+        if not labels:
+            return Response({'response':'Labels do not exist'}, status=status.HTTP_404_NOT_FOUND)
+        note_ids = Labels.objects.delete_labels(labels)
+        return Response({'notes':sorted(note_ids)}, status=status.HTTP_200_OK)
+
+
+class ArchiveNote(VersionedUpdateMixin, generics.RetrieveUpdateAPIView):
     """
         Summary:
         --------
@@ -253,16 +696,7 @@ class ArchiveNote(generics.RetrieveUpdateAPIView):
             Returns:
                 [queryset]: [note owned by user is fetched with given id]
         """
-        owner = self.request.user
-        if cache.get(str(owner)+"-notes-"+str(self.kwargs[self.lookup_field])):
-            queryset = cache.get(str(owner)+"-notes-"+str(self.kwargs[self.lookup_field]))
-            logger.info("udated archive notes data is coming from cache")
-            return queryset
-        else:
-            queryset = self.queryset.filter(isDelete=False, id=self.kwargs[self.lookup_field])
-            logger.info("updated archive note data is coming form DB")
-            cache.set(str(owner)+"-notes-"+str(self.kwargs[self.lookup_field]), queryset)
-            return queryset
+        return self.queryset.filter(isDelete=False, id=self.kwargs[self.lookup_field])
  
     def perform_update(self,serializer):
         """
@@ -272,14 +706,12 @@ class ArchiveNote(generics.RetrieveUpdateAPIView):
             Returns:
                 [Response]: [serialized data of updated note and status code]
         """
-        owner = self.request.user
-        note = serializer.save(owner=owner)
-        cache.set(str(owner)+"-notes-"+str(note.id), self.queryset.all())
+        note = self.save_versioned(serializer)
         logger.info("udated archive note data is set")
         return Response({'response':note}, status=status.HTTP_200_OK)
     
 
-class ArchiveNotesList(generics.ListAPIView):
+class ArchiveNotesList(ProjectionMixin, generics.ListAPIView):
     """
         Summary:
         --------
@@ -302,7 +734,7 @@ class ArchiveNotesList(generics.ListAPIView):
         return self.queryset.filter(Q(owner=owner),isArchive=True, isDelete=False)
         
 
-class TrashUntrash(generics.RetrieveUpdateAPIView):
+class TrashUntrash(VersionedUpdateMixin, generics.RetrieveUpdateAPIView):
     """
         Summary:
         --------
@@ -325,15 +757,10 @@ class TrashUntrash(generics.RetrieveUpdateAPIView):
             Returns:
                 [Response]: [serialized data of updated note and status code]
         """
-        owner = self.request.user
         if serializer.validated_data['isDelete']==True:
-            note = serializer.save(owner=owner, trashedAt=datetime.now())
-        else:
-            note = serializer.save(owner=owner, trashedAt=None)
-        if note.isDelete==True:
-            cache.delete(str(owner)+"-notes-"+str(self.kwargs[self.lookup_field]))
+            note = self.save_versioned(serializer, trashedAt=datetime.now())
         else:
-            cache.set(str(owner)+"-notes-"+str(self.kwargs[self.lookup_field]), self.queryset.all())
+            note = self.save_versioned(serializer, trashedAt=None)
         logger.info("udated trashed note data is set")
         return Response({'response':note}, status=status.HTTP_200_OK)
         
@@ -344,20 +771,48 @@ class TrashUntrash(generics.RetrieveUpdateAPIView):
             Returns:
                 [queryset]: [owned note by user is fetched with given id]
         """
+        return self.queryset.filter(id=self.kwargs[self.lookup_field])
+        
+
+class NoteStateTransition(generics.GenericAPIView):
+    """
+        Summary:
+        --------
+            This class will let authorized user to archive, unarchive, trash, restore, pin or unpin a note
+            with a single UPDATE under the ownership predicate, without loading or serializing the note.
+        --------
+        Methods:
+            put : It applies the state transition given in url and returns the new state.
+    """
+    permission_classes = (permissions.IsAuthenticated,)
+    transitions = {
+        'archive': ({'isArchive': True}, True),
+        'unarchive': ({'isArchive': False}, True),
+        'trash': ({'isDelete': True}, False),
+        'restore': ({'isDelete': False, 'trashedAt': None}, False),
+        'pin': ({'isPinned': True}, True),
+        'unpin': ({'isPinned': False}, True),
+    }
+
+    def put(self, request, id, action):
+        """
+            Args:
+                id : [id of note provided in url]
+                action : [state transition provided in url]
+            Returns:
+                [Response]: [note id, new state and status code]
+        """
         owner = self.request.user
-        if cache.get(str(owner)+"-notes-"+str(self.kwargs[self.lookup_field])):
-            queryset = cache.get(str(owner)+"-notes-"+str(self.kwargs[self.lookup_field]))
-            logger.info("udated trashed note data is coming from cache")
-            return queryset
+        fields, active_only = self.transitions[action]
+        state = dict(fields)
+        if action == 'trash':
+            state['trashedAt'] = datetime.now()
+        if not Notes.objects.update_state(id, owner, state, active_only):
+            return Response({'response':'Note does not exist'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(dict(fields, id=int(id)), status=status.HTTP_200_OK)
 
-        else:
-            queryset = self.queryset.filter(id=self.kwargs[self.lookup_field])
-            logger.info("updated trashed note data is coming form DB")
-            cache.set(str(owner)+"-notes-"+str(self.kwargs[self.lookup_field]), queryset)
-            return queryset
-        
 
-class TrashList(generics.ListAPIView):
+class TrashList(ProjectionMixin, generics.ListAPIView):
     """
         Summary:
         --------
@@ -401,19 +856,13 @@ class AddLabelsToNote(generics.GenericAPIView):
             Returns:
                 [Response]: [added label name and status code]
         """
-        try:
-            note = Notes.objects.get(Q(id = note_id), Q(owner=self.request.user)|Q(collaborator=self.request.user))
-        except Notes.DoesNotExist:
+        if not Notes.objects.filter(Q(id = note_id), Q(owner=self.request.user)|Q(collaborator=self.request.user)).exists():
             return Response({'response':'Note does not exist'}, status=status.HTTP_404_NOT_FOUND)
         serializer = self.serializer_class(data=request.data)
         serializer.is_valid(raise_exception=True)
         label_name = serializer.validated_data['label']
-        try:
-            label = Labels.objects.get(name=label_name, owner=self.request.user)
-        except Labels.DoesNotExist:
-            label = Labels.objects.create(name=label_name, owner=self.request.user)
-        note.label.add(label.id)
-        note.save()
+        label_ids = Labels.objects.resolve(self.request.user, [label_name]).values_list('id', flat=True)
+        Notes.objects.add_labels([note_id], label_ids)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     def get(self,request, note_id):
@@ -431,35 +880,99 @@ class AddLabelsToNote(generics.GenericAPIView):
             return Response({'response':'Not Found'}, status=status.HTTP_404_NOT_FOUND)
 
 
-class ListNotesInLabel(generics.GenericAPIView):
+class BulkAddLabels(generics.GenericAPIView):
+    """
+        Summary:
+        --------
+            This class will let authorized user to add several labels to one or many notes at once.
+        --------
+        Methods:
+            put: This method allows to add labels to all fetched notes.
+    """
+    permission_classes = (permissions.IsAuthenticated,)
+    serializer_class = BulkAddLabelsSerializer
+
+    def put(self, request):
+        """
+            Args:
+                request : [note ids and label names to add]
+
+            Returns:
+                [Response]: [labeled note ids, label names, missing note ids and status code]
+        """
+        serializer = self.serializer_class(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        owner = self.request.user
+        note_ids = serializer.validated_data['notes']
+        notes = set(Notes.objects.filter(Q(owner=owner)|Q(collaborator=owner), id__in=note_ids).values_list('id', flat=True))
+        if not notes:
+            return Response({'response':'Notes do not exist'}, status=status.HTTP_404_NOT_FOUND)
+        labels = dict(Labels.objects.resolve(owner, serializer.validated_data['labels']).values_list('id', 'name'))
+        Notes.objects.add_labels(notes, labels.keys())
+        missing = [note_id for note_id in note_ids if note_id not in notes]
+        return Response({'notes':sorted(notes), 'labels':sorted(labels.values()), 'missing':missing}, status=status.HTTP_200_OK)
+
+
+class LabelNotesPagination(LimitOffsetPagination):
+    max_limit = 100
+
+
+class ListNotesInLabel(ProjectionMixin, generics.GenericAPIView):
     """
         Summary:
         --------
-            This class will let authorized user to get all notes with same label.
+            This class will let authorized user to get the active notes having one or more labels,
+            notes with a label nested under a given label are listed with it.
         --------
         Methods:
-            get_queryset : User will get all note same label id given.   
+            get_labels : It returns the labels of user given in url or in the labels parameter.
+            get: It returns the notes having any or all of the labels, a page of them with ?limit and ?offset.
+        Both routes answer with the bare list of notes, an empty list when no note has the labels.
+        list-notes-in-label/<id> used to wrap it as {'response': [...]} and answer
+        {'response':'No notes with this label'}, which its own test never expected.
     """
     permission_classes = (permissions.IsAuthenticated,)
     serializer_class = ListNotesSerializer
+    pagination_class = LabelNotesPagination
+    labels_param_config = openapi.Parameter('labels',in_=openapi.IN_QUERY,description='Comma separated label ids',type=openapi.TYPE_STRING)
+    match_param_config = openapi.Parameter('match',in_=openapi.IN_QUERY,description='any (default) or all of the labels',type=openapi.TYPE_STRING)
+
+    def get_labels(self, label_id=None):
+        """
+            Args:
+                label_id : [id of label provided in url, the labels parameter is used without it]
+            Returns:
+                [list]: [labels of user, raises ValueError if one does not exist]
+        """
+        if label_id is not None:
+            ids = {int(label_id)}
+        else:
+            ids = {int(id) for id in self.request.query_params.get('labels', '').split(',') if id.strip()}
+        labels = list(Labels.objects.filter(id__in=ids, owner=self.request.user).only('id', 'path'))
+        if not ids or len(labels) != len(ids):
+            raise ValueError(ids)
+        return labels
 
-    def get(self,request,label_id):
+    @swagger_auto_schema(manual_parameters=ProjectionMixin.projection_params+[labels_param_config, match_param_config])
+    def get(self,request,label_id=None):
         """
             Args:
+                label_id : [id of label provided in url]
             Returns:
-                [queryset]: [note list with a label given id and owned by user]
+                [Response]: [serialized notes with the labels and status code]
         """
         try:
-            notes = Labels.objects.get(id=label_id,owner=self.request.user).notes_set.all()
-        except:
+            labels = self.get_labels(label_id)
+        except ValueError:
             return Response({'response':'This label does not exist'}, status=status.HTTP_404_NOT_FOUND)
-        if notes:
-            serializer = ListNotesSerializer(notes,many=True)
-            return Response({'response':serializer.data}, status=status.HTTP_200_OK)
-        else:
-            return Response({'response':'No notes with this label'}, status=status.HTTP_200_OK)
+        notes = Notes.objects.in_labels(request.user, labels, match_all=request.query_params.get('match') == 'all')
+        notes = self.filter_queryset(notes.order_by('-isPinned', 'id'))
+        page = self.paginate_queryset(notes)
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+        return Response(self.get_serializer(notes, many=True).data, status=status.HTTP_200_OK)
 
-class SearchNote(generics.GenericAPIView):
+class SearchNote(ProjectionMixin, generics.GenericAPIView):
     """
         Summary:
         --------
@@ -470,45 +983,188 @@ class SearchNote(generics.GenericAPIView):
             get: It returns the serailized notes list.
     """
     permission_classes=(permissions.IsAuthenticated,)
-    serializer_class = NotesSerializer    
+    serializer_class = NotePreviewSerializer    
+    throttle_scope = 'search'
     token_param_config = openapi.Parameter('search',in_=openapi.IN_QUERY,description='Description',type=openapi.TYPE_STRING)
     
-    def get_queryset(self, queryset=None):
+    def get_queryset(self, query=None):
         """
             Args:
-                queryset : [search query parameter]
+                query : [last word of the search string]
             Returns:
-                [note]: [fetched notes containing given search query]
+                [queryset]: [active notes of user having query in title or content]
         """
-        notes = []
-        owner = self.request.user
-        if queryset:                
-            searchlist = queryset.split(' ')
-            for query in searchlist:
-                if cache.get(query):
-                    notes = cache.get(query)
-                    logger.info("data is coming from cache")
-                else:
-                    notes = Notes.objects.filter(Q(title__icontains=query)|Q(content__icontains=query), Q(isArchive=False,isDelete=False),Q(owner=owner)|Q(collaborator=owner))
-                    if notes:
-                        cache.set(query, notes)  
-        return notes
-
-    @swagger_auto_schema(manual_parameters=[token_param_config])
+        return Notes.objects.search(self.request.user, query)
+
+    @swagger_auto_schema(manual_parameters=[token_param_config]+ProjectionMixin.projection_params)
     def get(self, request):
         """
             Args:
                 request : 
             Returns:
-                [Response]: [serialized data of fetched notes and status code]
+                [Response]: [serialized data of fetched notes and status code, cached per user,
+                             search word and projection]
         """
-        queryset = request.GET.get('search')
-        if queryset:
-            note = self.get_queryset(queryset)
-        else:
+        search = request.GET.get('search')
+        if not search:
             return Response({'response':'Give some search string!!!'})
-        serializer = NotesSerializer(note, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        query = search.split(' ')[-1]
+        fields, preview = parse_projection(request.query_params)
+        data = get_or_compute(search_key(request.user.id, Notes.search_generation(request.user.id), query, fields, preview),
+            lambda: self.get_serializer(self.filter_queryset(self.get_queryset(query)), many=True).data or None)
+        return Response(data or [], status=status.HTTP_200_OK)
+
+
+class NoteChanges(generics.GenericAPIView):
+    """
+        Summary:
+        --------
+            This class will let authorized user to fetch only the notes changed since a cursor.
+        --------
+        Methods:
+            get: It returns a page of changed notes and deleted note ids after the given cursor.
+    """
+    permission_classes = (permissions.IsAuthenticated,)
+    serializer_class = NoteChangeSerializer
+    page_size = 100
+    max_page_size = 500
+    since_param_config = openapi.Parameter('since',in_=openapi.IN_QUERY,description='Cursor returned by the previous call',type=openapi.TYPE_INTEGER)
+    limit_param_config = openapi.Parameter('limit',in_=openapi.IN_QUERY,description='Maximum changes in the page',type=openapi.TYPE_INTEGER)
+
+    def get_changes(self, cursor, limit):
+        """
+            Args:
+                cursor : [id of the last change already seen by the client]
+                limit : [maximum number of changes to return]
+            Returns:
+                [dict]: [new cursor, more flag and changed or deleted notes in sequence order]
+        """
+        owner = self.request.user
+        changes = list(NoteChange.objects.since(owner, cursor).values_list('id', 'note_id')[:limit+1])
+        more = len(changes) > limit
+        changes = changes[:limit]
+        note_ids = list(dict.fromkeys(note_id for change_id, note_id in changes))
+        notes = Notes.objects.filter(Q(owner=owner)|Q(collaborator=owner), id__in=note_ids).distinct().prefetch_related('label', 'collaborator')
+        notes = {note.id: note for note in notes}
+        data = []
+        for note_id in note_ids:
+            if note_id in notes:
+                data.append({'id':note_id, 'deleted':False, 'note':self.serializer_class(notes[note_id]).data})
+            else:
+                data.append({'id':note_id, 'deleted':True, 'note':None})
+        return {'cursor':changes[-1][0] if changes else cursor, 'more':more, 'changes':data}
+
+    def get_cursor_and_limit(self, request):
+        """
+            Args:
+                request : [since and limit query parameters]
+            Returns:
+                [tuple]: [cursor and page size, raises ValueError for invalid values]
+        """
+        cursor = int(request.GET.get('since', 0))
+        limit = min(int(request.GET.get('limit', self.page_size)), self.max_page_size)
+        if cursor < 0 or limit < 1:
+            raise ValueError(cursor, limit)
+        return cursor, limit
+
+    @swagger_auto_schema(manual_parameters=[since_param_config, limit_param_config])
+    def get(self, request):
+        """
+            Args:
+                request : [since and limit query parameters]
+            Returns:
+                [Response]: [new cursor, more flag, changed notes and status code]
+        """
+        try:
+            cursor, limit = self.get_cursor_and_limit(request)
+        except ValueError:
+            return Response({'response':'since and limit must be positive integers'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(self.get_changes(cursor, limit), status=status.HTTP_200_OK)
+
+
+class Notifications(generics.GenericAPIView):
+    """
+        Summary:
+        --------
+            This class will let authorized user to read the reminders delivered to owned and shared notes.
+        --------
+        Methods:
+            get: It returns the newest notifications, only unread ones if asked.
+            put: It marks the given notifications, or all of them, as read with one update.
+    """
+    permission_classes = (permissions.IsAuthenticated,)
+    serializer_class = NotificationSerializer
+    page_size = 50
+    unread_param_config = openapi.Parameter('unread',in_=openapi.IN_QUERY,description='Only unread notifications',type=openapi.TYPE_BOOLEAN)
+
+    def get_queryset(self):
+        return Notification.objects.filter(user=self.request.user)
+
+    @swagger_auto_schema(manual_parameters=[unread_param_config])
+    def get(self, request):
+        """
+            Args:
+                request : [unread query parameter]
+            Returns:
+                [Response]: [serialized notifications newest first and status code]
+        """
+        notifications = self.get_queryset()
+        if request.GET.get('unread') in ('true', '1'):
+            notifications = notifications.filter(isRead=False)
+        notifications = notifications.select_related('note').order_by('-id')[:self.page_size]
+        return Response(self.get_serializer(notifications, many=True).data, status=status.HTTP_200_OK)
+
+    @swagger_auto_schema(request_body=ReadNotificationsSerializer)
+    def put(self, request):
+        """
+            Args:
+                request : [ids of notifications to mark as read, all when omitted]
+            Returns:
+                [Response]: [number of notifications marked as read and status code]
+        """
+        serializer = ReadNotificationsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        notifications = self.get_queryset().filter(isRead=False)
+        if 'ids' in serializer.validated_data:
+            notifications = notifications.filter(id__in=serializer.validated_data['ids'])
+        return Response({'response':notifications.update(isRead=True)}, status=status.HTTP_200_OK)
+
+
+class PollNoteChanges(NoteChanges):
+    """
+        Summary:
+        --------
+            This class will let authorized user to long-poll for note changes when the
+            event stream can not be used (WSGI deployments).
+        --------
+        Methods:
+            get: It waits until a change after the given cursor is published or the timeout expires.
+    """
+    timeout_param_config = openapi.Parameter('timeout',in_=openapi.IN_QUERY,description='Seconds to wait for a change',type=openapi.TYPE_NUMBER)
+
+    @swagger_auto_schema(manual_parameters=[NoteChanges.since_param_config, NoteChanges.limit_param_config, timeout_param_config])
+    def get(self, request):
+        """
+            Args:
+                request : [since, limit and timeout query parameters]
+            Returns:
+                [Response]: [new cursor, more flag, changed notes (empty on timeout) and status code]
+        """
+        try:
+            cursor, limit = self.get_cursor_and_limit(request)
+            timeout = max(min(float(request.GET.get('timeout', settings.NOTE_EVENTS_POLL_TIMEOUT)), settings.NOTE_EVENTS_POLL_TIMEOUT), 0)
+        except ValueError:
+            return Response({'response':'since, limit and timeout must be positive numbers'}, status=status.HTTP_400_BAD_REQUEST)
+        changed = threading.Event()
+        callback = lambda data: changed.set()
+        hub.add(request.user.id, callback)
+        try:
+            changes = self.get_changes(cursor, limit)
+            if not changes['changes'] and changed.wait(timeout):
+                changes = self.get_changes(cursor, limit)
+        finally:
+            hub.remove(request.user.id, callback)
+        return Response(changes, status=status.HTTP_200_OK)
 
 
 class AddCollaborator(generics.GenericAPIView):
@@ -532,22 +1188,18 @@ class AddCollaborator(generics.GenericAPIView):
             Returns:
                 [Response]: [added collaborator email and status code]
         """
-        try:
-            note = Notes.objects.get(Q(owner=self.request.user)|Q(collaborator=self.request.user),isDelete=False,id=note_id)
-        except:
+        if not Notes.objects.filter(Q(owner=self.request.user)|Q(collaborator=self.request.user),isDelete=False,id=note_id).exists():
             return Response({'response':'note does not exist!!'}, status=status.HTTP_404_NOT_FOUND)
         serializer = self.serializer_class(data=request.data)
         serializer.is_valid(raise_exception=True)
         collaborator_email = serializer.validated_data['collaborator']
-        try:
-            collaborator = User.objects.get(email=collaborator_email)
-        except:
+        collaborator_id = User.objects.filter(email=collaborator_email).values_list('id', flat=True).first()
+        if collaborator_id is None:
             return Response({'This user email does not exist.'}, status=status.HTTP_404_NOT_FOUND)
-        if collaborator==request.user:
+        if collaborator_id==request.user.id:
             return Response({'Detail': 'This email already exists!!!'}, status=status.HTTP_400_BAD_REQUEST)
         else:
-            note.collaborator.add(collaborator.id)
-            note.save()
+            Notes.objects.add_collaborators([(note_id, collaborator_id)])
             return Response({'collaborator':collaborator_email}, status=status.HTTP_200_OK)
 
 
@@ -565,6 +1217,49 @@ class AddCollaborator(generics.GenericAPIView):
         else:
             return Response({'response':'Not Found'}, status=status.HTTP_404_NOT_FOUND)
 
+class ShareNotes(generics.GenericAPIView):
+    """
+        Summary:
+        --------
+            This class will let authorized user to share one or many notes with many collaborators at once.
+        --------
+        Methods:
+            put : It adds every existing user email as collaborator of all fetched notes.
+    """
+    permission_classes = (permissions.IsAuthenticated, )
+    serializer_class = ShareNotesSerializer
+
+    def put(self, request):
+        """
+            Args:
+                request : [note ids and collaborator emails]
+
+            Returns:
+                [Response]: [shared note ids, missing note ids, result per email and status code]
+        """
+        serializer = self.serializer_class(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        owner = self.request.user
+        note_ids = serializer.validated_data['notes']
+        emails = list(dict.fromkeys(serializer.validated_data['emails']))
+        notes = dict(Notes.objects.filter(Q(owner=owner)|Q(collaborator=owner), isDelete=False, id__in=note_ids).values_list('id', 'owner_id').distinct())
+        if not notes:
+            return Response({'response':'Notes do not exist'}, status=status.HTTP_404_NOT_FOUND)
+        users = dict(User.objects.filter(email__in=emails).values_list('email', 'id'))
+        results = {}
+        for email in emails:
+            if email not in users:
+                results[email] = 'not found'
+            elif users[email] == owner.id:
+                results[email] = 'own email'
+            else:
+                results[email] = 'shared'
+        collaborator_ids = [users[email] for email in emails if results[email] == 'shared']
+        Notes.objects.add_collaborators((note_id, user_id) for note_id, note_owner in notes.items() for user_id in collaborator_ids if user_id != note_owner)
+        missing = [note_id for note_id in note_ids if note_id not in notes]
+        return Response({'notes':sorted(notes), 'missing':missing, 'collaborators':results}, status=status.HTTP_200_OK)
+
+
 class Reminder(generics.GenericAPIView):
     """
         Summary:
@@ -574,7 +1269,7 @@ class Reminder(generics.GenericAPIView):
         Methods:
             get_queryset : It returns the queryset of note by given id.
             get: It returns the serailized note.
-            put : It allows to add reminder for fetched note if the data is valid.
+            put : It allows to add a one time or recurring (cron rule) reminder for fetched note if the data is valid.
     """
     serializer_class = ReminderSerializer
     permission_classes = (permissions.IsAuthenticated,)
@@ -603,13 +1298,15 @@ class Reminder(generics.GenericAPIView):
             return Response({'response':'Note does not exist'}, status=status.HTTP_404_NOT_FOUND)
         serializer = self.serializer_class(data=request.data)
         serializer.is_valid(raise_exception=True)
-        reminder = serializer.validated_data['reminder']
+        rule = serializer.validated_data.get('reminderRule', '')
+        reminder = serializer.validated_data.get('reminder') or next_fire(rule, datetime.now())
         if reminder.replace(tzinfo=None) - datetime.now() < timedelta(seconds=0):
             return Response({'response':'Invalid Time Given'}, status=status.HTTP_400_BAD_REQUEST)
         else:
             note.reminder = reminder
+            note.reminderRule = rule
             note.save()
-            return Response({'response':serializer.data}, status=status.HTTP_200_OK)
+            return Response({'response':self.serializer_class(note).data}, status=status.HTTP_200_OK)
 
     def get(self,request, note_id):
         """
@@ -640,6 +1337,7 @@ class Reminder(generics.GenericAPIView):
             return Response({'response':'Reminder is not set'})
         else:
             note.reminder = None
+            note.reminderRule = ''
             note.save()
             return Response({'response':'Reminder is removed'}, status=status.HTTP_200_OK)
         
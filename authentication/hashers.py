@@ -0,0 +1,103 @@
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.utils.crypto import constant_time_compare
+from django.utils.translation import gettext_noop as _
+from KeepNotes import metrics
+import base64
+import hashlib
+import time
+
+
+class TimedHasherMixin:
+    """
+        Summary:
+        --------
+            Records how often and how long passwords are verified in the metrics group
+            auth.hashers, ex: scrypt_verify and scrypt_verify_us.
+    """
+
+    def verify(self, password, encoded):
+        start = time.perf_counter()
+        valid = super().verify(password, encoded)
+        name = self.algorithm+'_verify'
+        metrics.record('auth.hashers', **{name: 1, name+'_us': (time.perf_counter()-start)*1000000})
+        return valid
+
+
+class ScryptPasswordHasher(hashers.BasePasswordHasher):
+    """
+        Summary:
+        --------
+            Memory hard scrypt hasher of the standard library, its cost is set by PASSWORD_SCRYPT_N,
+            PASSWORD_SCRYPT_R and PASSWORD_SCRYPT_P. Hashes made with other parameters are
+            rehashed on the next login.
+    """
+    algorithm = 'scrypt'
+    dklen = 64
+
+    @property
+    def params(self):
+        return settings.PASSWORD_SCRYPT_N, settings.PASSWORD_SCRYPT_R, settings.PASSWORD_SCRYPT_P
+
+    def derive(self, password, salt, n, r, p):
+        return hashlib.scrypt(password.encode(), salt=salt.encode(), n=n, r=r, p=p, maxmem=256*n*r*p, dklen=self.dklen)
+
+    def encode(self, password, salt, n=None, r=None, p=None):
+        assert password is not None
+        assert salt and '$' not in salt
+        n, r, p = (n or self.params[0]), (r or self.params[1]), (p or self.params[2])
+        hash = base64.b64encode(self.derive(password, salt, n, r, p)).decode('ascii')
+        return "%s$%d$%d$%d$%s$%s" % (self.algorithm, n, r, p, salt, hash)
+
+    def decode(self, encoded):
+        algorithm, n, r, p, salt, hash = encoded.split('$', 5)
+        assert algorithm == self.algorithm
+        return {'algorithm': algorithm, 'n': int(n), 'r': int(r), 'p': int(p), 'salt': salt, 'hash': hash}
+
+    def verify(self, password, encoded):
+        decoded = self.decode(encoded)
+        encoded_2 = self.encode(password, decoded['salt'], decoded['n'], decoded['r'], decoded['p'])
+        return constant_time_compare(encoded, encoded_2)
+
+    def safe_summary(self, encoded):
+        decoded = self.decode(encoded)
+        return {
+            _('algorithm'): decoded['algorithm'],
+            _('work factor'): decoded['n'],
+            _('block size'): decoded['r'],
+            _('parallelism'): decoded['p'],
+            _('salt'): hashers.mask_hash(decoded['salt']),
+            _('hash'): hashers.mask_hash(decoded['hash']),
+        }
+
+    def must_update(self, encoded):
+        decoded = self.decode(encoded)
+        return (decoded['n'], decoded['r'], decoded['p']) != self.params
+
+    def harden_runtime(self, password, encoded):
+        # The cost of scrypt is in its memory use, running it again would not hide a cheaper hash
+        pass
+
+
+class TimedScryptPasswordHasher(TimedHasherMixin, ScryptPasswordHasher):
+    pass
+
+
+class TimedArgon2PasswordHasher(TimedHasherMixin, hashers.Argon2PasswordHasher):
+    """ Argon2 hasher of django tuned by PASSWORD_ARGON2_TIME_COST, MEMORY_COST and PARALLELISM, needs argon2-cffi """
+
+    @property
+    def time_cost(self):
+        return settings.PASSWORD_ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self):
+        return settings.PASSWORD_ARGON2_MEMORY_COST
+
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_ARGON2_PARALLELISM
+
+
+class TimedPBKDF2PasswordHasher(TimedHasherMixin, hashers.PBKDF2PasswordHasher):
+    pass
@@ -0,0 +1,69 @@
+from django.conf import settings
+from django.core.files.base import ContentFile
+from KeepNotes.storage import content_storage
+from PIL import Image, ImageOps, features
+import io
+
+
+class InvalidImage(Exception):
+    pass
+
+
+def decode(file):
+    """
+        Args:
+            file : [uploaded image file opened in binary mode]
+        Returns:
+            [Image]: [decoded RGB image turned upright by its EXIF orientation]
+        Raises:
+            InvalidImage : [file is not an image Pillow can decode or has too many pixels]
+    """
+    try:
+        image = Image.open(file)
+        if image.width * image.height > settings.PROFILE_IMAGE_MAX_PIXELS:
+            raise InvalidImage("Image has too many pixels")
+        image = ImageOps.exif_transpose(image)
+        return image.convert('RGB')
+    except (OSError, ValueError, Image.DecompressionBombError) as error:
+        raise InvalidImage(str(error))
+
+
+def encode(image, format):
+    """
+        Args:
+            image : [decoded image]
+            format : [WEBP or JPEG]
+        Returns:
+            [bytes]: [compressed image without EXIF, ICC or any other metadata]
+    """
+    if format == 'WEBP' and not features.check('webp'):
+        format = 'JPEG'
+    buffer = io.BytesIO()
+    if format == 'WEBP':
+        image.save(buffer, 'WEBP', quality=settings.PROFILE_IMAGE_QUALITY, method=6)
+    else:
+        image.save(buffer, 'JPEG', quality=settings.PROFILE_IMAGE_QUALITY, optimize=True, progressive=True)
+    return buffer.getvalue(), format
+
+
+def resize(image):
+    """
+        Returns:
+            [tuple]: [image scaled down to fit PROFILE_IMAGE_SIZE and thumbnail cropped to PROFILE_THUMBNAIL_SIZE]
+    """
+    full = image.copy()
+    full.thumbnail(settings.PROFILE_IMAGE_SIZE, Image.LANCZOS)
+    thumbnail = ImageOps.fit(image, settings.PROFILE_THUMBNAIL_SIZE, Image.LANCZOS)
+    return full, thumbnail
+
+
+def store(folder, data, format):
+    """
+        Args:
+            folder : [folder of the file under MEDIA_ROOT]
+            data : [file content]
+            format : [WEBP or JPEG]
+        Returns:
+            [str]: [content addressed storage name, the file is written only if it is not stored yet]
+    """
+    return content_storage.save(folder+('image.webp' if format == 'WEBP' else 'image.jpg'), ContentFile(data))
@@ -0,0 +1,28 @@
+# Generated by Django 3.0.8 on 2026-10-19 22:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0004_auto_20210107_2349'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='image_status',
+            field=models.CharField(blank=True, choices=[('pending', 'Pending'), ('ready', 'Ready'), ('invalid', 'Invalid')], max_length=10),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='thumbnail',
+            field=models.ImageField(blank=True, max_length=255, null=True, upload_to=''),
+        ),
+        migrations.AlterField(
+            model_name='userprofile',
+            name='image',
+            field=models.ImageField(blank=True, max_length=255, null=True, upload_to='profile_picture/uploads/'),
+        ),
+    ]
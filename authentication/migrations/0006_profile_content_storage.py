@@ -0,0 +1,24 @@
+# Generated by Django 3.0.8 on 2026-10-19 22:23
+
+import KeepNotes.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0005_profile_thumbnail'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='userprofile',
+            name='image',
+            field=models.ImageField(blank=True, max_length=255, null=True, storage=KeepNotes.storage.ContentAddressedStorage(), upload_to='profile_picture/uploads/'),
+        ),
+        migrations.AlterField(
+            model_name='userprofile',
+            name='thumbnail',
+            field=models.ImageField(blank=True, max_length=255, null=True, storage=KeepNotes.storage.ContentAddressedStorage(), upload_to=''),
+        ),
+    ]
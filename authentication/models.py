@@ -1,5 +1,6 @@
 from django.db import models
 from django.contrib.auth.models import (AbstractBaseUser, BaseUserManager, PermissionsMixin )
+from KeepNotes.storage import content_storage
 import uuid
 
  
@@ -49,13 +50,20 @@ class User(AbstractBaseUser, PermissionsMixin):
 
         
 class UserProfile(models.Model):
+    IMAGE_PENDING = 'pending'
+    IMAGE_READY = 'ready'
+    IMAGE_INVALID = 'invalid'
+    IMAGE_STATUS_CHOICES = [(IMAGE_PENDING, 'Pending'), (IMAGE_READY, 'Ready'), (IMAGE_INVALID, 'Invalid')]
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.OneToOneField(to=User, on_delete=models.CASCADE, related_name='profile')
     first_name = models.CharField(max_length=50, unique=False, blank=True)
     last_name = models.CharField(max_length=50, unique=False, blank=True)
     DOB = models.DateField(max_length=8,null=True)
     created_at = models.DateTimeField(auto_now_add=True)
-    image = models.ImageField(upload_to='profile_picture/',max_length=255, null=True, blank=True)
+    image = models.ImageField(upload_to='profile_picture/uploads/',storage=content_storage,max_length=255, null=True, blank=True)
+    thumbnail = models.ImageField(storage=content_storage,max_length=255, null=True, blank=True)
+    image_status = models.CharField(max_length=10, choices=IMAGE_STATUS_CHOICES, blank=True)
 
     def get_last_name(self):       
         return self.last_name
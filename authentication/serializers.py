@@ -1,13 +1,24 @@
 from rest_framework import serializers
+from django.conf import settings
 from authentication.models import User, UserProfile
 from django.contrib import auth
 from rest_framework.exceptions import AuthenticationFailed
 from django.contrib.auth import authenticate
 
 class UserProfileSerializer(serializers.ModelSerializer):    
+    image = serializers.ImageField(required=False, allow_null=True)
     class Meta:
         model = UserProfile
-        fields = ['first_name', 'last_name', 'DOB','image']
+        fields = ['first_name', 'last_name', 'DOB','image','thumbnail','image_status']
+        extra_kwargs = {'thumbnail': {'read_only': True}, 'image_status': {'read_only': True}}
+
+    def validate_image(self, image):
+        if image and image.size > settings.PROFILE_IMAGE_MAX_UPLOAD_SIZE:
+            raise serializers.ValidationError("Image can not be larger than "+str(settings.PROFILE_IMAGE_MAX_UPLOAD_SIZE // (1024*1024))+" MB!!")
+        if image:
+            # the upload is stored with the extension of its decoded format, never the one sent by the client
+            image.name = 'upload.'+image.image.format.lower()
+        return image
 
 
 class RegisterSerializer(serializers.ModelSerializer):
@@ -43,12 +54,13 @@ class LoginSerializer(serializers.ModelSerializer):
     class Meta:
         model=User
         fields=['email','password','username']
+        extra_kwargs = {'password': {'write_only': True}}
 
     def validate(self, attrs):
         email= attrs.get('email','')
         password = attrs.get('password','')
         try:
-            user = authenticate(email=email, password=password)
+            user = authenticate(self.context.get('request'), email=email, password=password)
             if user is None:
                 raise AuthenticationFailed("Invalid credentials given!!!")
             if not user.is_active:
@@ -58,6 +70,7 @@ class LoginSerializer(serializers.ModelSerializer):
 
         except serializers.ValidationError:
             return {'error':"Please provide email and password"}
+        attrs['user'] = user
         return attrs
 
 
@@ -0,0 +1,71 @@
+from celery import shared_task
+from celery.utils.log import get_task_logger
+from django.conf import settings
+from authentication.models import UserProfile
+from authentication import images
+from authentication.utils import EmailsNotSent, Util
+from KeepNotes.storage import content_storage
+
+logger = get_task_logger(__name__)
+
+
+def delete_upload(upload):
+    """ deletes a processed upload unless another profile waits for the same content """
+    if not UserProfile.objects.filter(image=upload).exists():
+        content_storage.delete(upload)
+
+
+@shared_task(name="send_email", bind=True, ignore_result=True, max_retries=5, default_retry_delay=60)
+def send_email(self, data):
+    """
+        Args:
+            data : [email_subject, email_body and to_email of the mail]
+        Sends the mail off the request cycle, a failing mail server is retried every minute.
+    """
+    try:
+        Util.send_email(data)
+    except OSError as error:
+        raise self.retry(exc=error)
+
+
+@shared_task(name="send_emails", bind=True, ignore_result=True, max_retries=5, default_retry_delay=60)
+def send_emails(self, data_list):
+    """
+        Args:
+            data_list : [email_subject, email_body and to_email of every mail]
+        Sends a batch of mails over one connection of the email backend, a retry only sends the
+        mails the failing attempt did not send.
+    """
+    try:
+        Util.send_emails(data_list)
+    except EmailsNotSent as error:
+        raise self.retry(args=(data_list[error.sent:],), exc=error)
+
+
+@shared_task(name="process_profile_image", ignore_result=True)
+def process_profile_image(profile_id, upload):
+    """
+        Args:
+            profile_id : [id of profile with a freshly uploaded image]
+            upload : [name of the uploaded image]
+        Decodes the upload, stores a resized image and a thumbnail under content hashed names
+        and removes the upload. Invalid uploads are removed and marked invalid. The profile is
+        left untouched when another image was uploaded meanwhile, and a redelivered message
+        of an upload processed already does nothing.
+    """
+    profile = UserProfile.objects.filter(id=profile_id, image=upload, image_status=UserProfile.IMAGE_PENDING).first()
+    if profile is None:
+        return
+    try:
+        with profile.image.open('rb') as file:
+            image = images.decode(file)
+    except images.InvalidImage as error:
+        logger.warning("profile image %s is invalid: %s", upload, error)
+        UserProfile.objects.filter(id=profile_id, image=upload).update(image=None, thumbnail=None, image_status=UserProfile.IMAGE_INVALID)
+        delete_upload(upload)
+        return
+    full, thumbnail = images.resize(image)
+    image_name = images.store('profile_picture/', *images.encode(full, 'JPEG'))
+    thumbnail_name = images.store('profile_picture/thumbnails/', *images.encode(thumbnail, settings.PROFILE_THUMBNAIL_FORMAT))
+    UserProfile.objects.filter(id=profile_id, image=upload).update(image=image_name, thumbnail=thumbnail_name, image_status=UserProfile.IMAGE_READY)
+    delete_upload(upload)
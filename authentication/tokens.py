@@ -0,0 +1,94 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.utils.crypto import constant_time_compare, salted_hmac
+from django.utils.http import base36_to_int, int_to_base36
+from KeepNotes.locks import claim
+import hashlib
+import time
+
+VERIFY_EMAIL = 'verify-email'
+RESET_PASSWORD = 'reset-password'
+
+
+class InvalidToken(Exception):
+    pass
+
+
+class ExpiredToken(InvalidToken):
+    pass
+
+
+def signer(purpose):
+    return signing.Signer(salt='authentication.tokens.'+purpose)
+
+
+def user_state(user):
+    """
+        Args:
+            user : [user a RESET_PASSWORD token is for]
+        Returns:
+            [str]: [hash of the password and last login of user, changing either of them invalidates
+                    the reset tokens made before, like PasswordResetTokenGenerator does]
+    """
+    last_login = '' if user.last_login is None else user.last_login.replace(microsecond=0, tzinfo=None)
+    return salted_hmac('authentication.tokens.state', str(user.password)+str(last_login)).hexdigest()[::2]
+
+
+def make_token(user, purpose):
+    """
+        Args:
+            user : [user the token is for]
+            purpose : [VERIFY_EMAIL or RESET_PASSWORD, a token is only accepted for its own purpose]
+        Returns:
+            [str]: [<user id>.<expiry>:<signature>, ids and expiry in base 36, RESET_PASSWORD
+                    tokens carry .<user state> after the expiry]
+    """
+    expires = int(time.time()) + settings.AUTH_TOKEN_AGES[purpose]
+    value = int_to_base36(user.id)+'.'+int_to_base36(expires)
+    if purpose == RESET_PASSWORD:
+        value += '.'+user_state(user)
+    return signer(purpose).sign(value)
+
+
+def read_token(token, purpose):
+    """
+        Args:
+            token : [token made by make_token]
+            purpose : [purpose the token has to be made for]
+        Returns:
+            [tuple]: [user id, expiry timestamp and user state, None for tokens without one]
+        Raises:
+            InvalidToken : [signature does not match]
+            ExpiredToken : [expiry has passed]
+    """
+    try:
+        user_id, expires, *state = signer(purpose).unsign(token or '').split('.')
+        user_id, expires = base36_to_int(user_id), base36_to_int(expires)
+    except (signing.BadSignature, ValueError):
+        raise InvalidToken(token)
+    if expires <= time.time():
+        raise ExpiredToken(token)
+    return user_id, expires, state[0] if state else None
+
+
+def use_token(token, purpose):
+    """
+        Args:
+            token : [token made by make_token]
+            purpose : [purpose the token has to be made for]
+        Returns:
+            [int]: [id of the user of the token, the token is remembered as used until it expires]
+        Raises:
+            InvalidToken : [signature does not match, the password or last login of the user changed
+                            since the token was made or the token was used already]
+            ExpiredToken : [expiry has passed]
+    """
+    user_id, expires, state = read_token(token, purpose)
+    if state is not None:
+        user = get_user_model().objects.filter(id=user_id).first()
+        if user is None or not constant_time_compare(state, user_state(user)):
+            raise InvalidToken(token)
+    if not claim('used-token:'+hashlib.sha256(token.encode()).hexdigest(), max(expires - time.time(), 1)):
+        raise InvalidToken(token)
+    return user_id
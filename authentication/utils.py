@@ -1,7 +1,31 @@
-from django.core.mail import EmailMessage
+from django.core.mail import EmailMessage, get_connection
+
+
+class EmailsNotSent(OSError):
+    """ the email backend failed after sending the first `sent` mails of a batch """
+
+    def __init__(self, sent, error):
+        super().__init__(str(error))
+        self.sent = sent
+
 
 class Util:
     @staticmethod
     def send_email(data):
         email = EmailMessage(subject=data['email_subject'],body=data['email_body'],to=[data['to_email']])
-        email.send()
\ No newline at end of file
+        email.send()
+
+    @staticmethod
+    def send_emails(data_list):
+        """
+            sends the mails in order over one connection of the email backend and returns how many
+            were sent, a failure raises EmailsNotSent with the number of mails sent before it
+        """
+        sent = 0
+        try:
+            with get_connection() as connection:
+                for data in data_list:
+                    sent += connection.send_messages([EmailMessage(subject=data['email_subject'],body=data['email_body'],to=[data['to_email']],connection=connection)]) or 0
+        except OSError as error:
+            raise EmailsNotSent(sent, error) from error
+        return sent
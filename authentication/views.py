@@ -1,31 +1,31 @@
 from django.shortcuts import HttpResponse, render,redirect
-from django.contrib.auth import logout,login, authenticate
+from django.contrib.auth import logout,login
 from rest_framework import generics, status, views, permissions
 from authentication.serializers import RegisterSerializer, EmailVerificationSerializer, LoginSerializer, ResetPasswordSerializer, NewPasswordSerializer, UserProfileSerializer
 from rest_framework.response import Response
 from authentication.models import User, UserProfile
-from authentication.utils import Util
 from django.contrib.sites.shortcuts import  get_current_site
 from django.urls import reverse
-from django.conf import settings
-import jwt
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
-from rest_framework_jwt.utils import jwt_payload_handler
 import pyshorteners
 from rest_framework.permissions import AllowAny
 from authentication.permissions import IsOwner
+from authentication import tokens
+from authentication.tasks import process_profile_image, send_email
+from django.db import transaction
 
 
 class RegisterView(generics.GenericAPIView):
     """
-        API register user details, create a user profile for user and send jwt token to verify email
+        API register user details, create a user profile for user and send a signed token to verify email
     """
     permission_classes = (AllowAny,)
+    throttle_scope = 'register'
     serializer_class = RegisterSerializer
     def post(self, request):
         """
-            Generate jwt token ,create verification url and send it to user email 
+            Generate signed token ,create verification url and send it to user email 
         """      
         user = request.data
         serializer = self.serializer_class(data=user)
@@ -34,9 +34,8 @@ class RegisterView(generics.GenericAPIView):
         user_data = serializer.data
         user = User.objects.get(email=user_data['email'])
 
-        # generating token using user information
-        payload = jwt_payload_handler(user)
-        token = jwt.encode(payload,settings.SECRET_KEY).decode('UTF-8')
+        # generating a signed token for email verification
+        token = tokens.make_token(user, tokens.VERIFY_EMAIL)
         user_data['token'] = token
         
         # creating email verification link
@@ -50,7 +49,7 @@ class RegisterView(generics.GenericAPIView):
         
         email_body = 'Hii \n'+user.username+' Use this below to verify your email \n'+verification_link
         data = {'email_body':email_body ,'to_email':user.email, 'email_subject':'Verify you email'}
-        Util.send_email(data) 
+        transaction.on_commit(lambda: send_email.delay(data))
         return Response(user_data,status=status.HTTP_201_CREATED)
 
 
@@ -70,16 +69,12 @@ class VerifyEmail(generics.GenericAPIView):
         """       
         token = request.GET.get('token')
         try:
-            payload = jwt.decode(token,settings.SECRET_KEY)
-            user = User.objects.get(id=payload['user_id'])
-            if not user.is_verified:
-                user.is_verified=True
-                user.is_active=True
-                user.save()
+            user_id = tokens.use_token(token, tokens.VERIFY_EMAIL)
+            User.objects.filter(id=user_id, is_verified=False).update(is_verified=True, is_active=True)
             return Response({'email':'Succefully Activated'},status=status.HTTP_200_OK)
-        except jwt.ExpiredSignatureError:
+        except tokens.ExpiredToken:
             return Response({'error':'Activation Expired'}, status=status.HTTP_400_BAD_REQUEST)
-        except jwt.exceptions.DecodeError:
+        except tokens.InvalidToken:
             return Response({'error':'Invalid Token'}, status=status.HTTP_400_BAD_REQUEST)
 
 
@@ -89,17 +84,16 @@ class LoginAPIView(generics.GenericAPIView):
     """
     serializer_class = LoginSerializer
     permission_classes = (AllowAny,)
+    throttle_scope = 'login'
 
     def post(self, request):
         """ Take user credentials and authenticate it to login  """        
         
-        serializer = self.serializer_class(data=request.data)
+        serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        user_data = serializer.data
-        user = authenticate(email=user_data['email'], password=user_data['password'])
-        user_data['username'] = user.username
+        user = serializer.validated_data['user']
         login(request, user)
-        return Response(user_data, status=status.HTTP_200_OK)
+        return Response({'email':user.email, 'username':user.username}, status=status.HTTP_200_OK)
     
 
 class ResetPassword(generics.GenericAPIView):
@@ -108,10 +102,11 @@ class ResetPassword(generics.GenericAPIView):
     """
     serializer_class = ResetPasswordSerializer
     permission_classes = (AllowAny,)
+    throttle_scope = 'reset-password'
 
     def post(self, request):
         """
-            Get user email and generate jwt token and send it to the user by email
+            Get user email and generate a single use signed token and send it to the user by email
 
         """        
         serializer = self.serializer_class(data=request.data)
@@ -120,15 +115,13 @@ class ResetPassword(generics.GenericAPIView):
         user = User.objects.get(email=user_data['email']) 
         current_site = get_current_site(request).domain
         reverse_link = reverse('new-pass')
-        payload = jwt_payload_handler(user)
-        token = jwt.encode(payload, settings.SECRET_KEY).decode('UTF-8')
-       
+        token = tokens.make_token(user, tokens.RESET_PASSWORD)
         user_data['token']=token
         shortener = pyshorteners.Shortener()
         reset_link = shortener.tinyurl.short('http://'+current_site+reverse_link+'?token='+token)
         email_body = "hii \n"+user.username+"Use this link to reset password: \n"+reset_link
         data={'email_body':email_body,'to_email':user.email,'email_subject':"Reset password Link"}
-        Util.send_email(data)
+        transaction.on_commit(lambda: send_email.delay(data))
         return Response(user_data, status=status.HTTP_200_OK)
 
 
@@ -150,14 +143,13 @@ class NewPassword(generics.GenericAPIView):
         user_data = serializer.data
  
         try:
-            payload = jwt.decode(token,settings.SECRET_KEY)
-            user = User.objects.get(id=payload['user_id'])
+            user = User.objects.get(id=tokens.use_token(token, tokens.RESET_PASSWORD))
             user.set_password(user_data['password'])
             user.save()    
             return Response({'email':'New password is created'},status=status.HTTP_200_OK)
-        except jwt.ExpiredSignatureError:
+        except tokens.ExpiredToken:
             return Response({'error':'Link is Expired'}, status=status.HTTP_400_BAD_REQUEST)
-        except jwt.exceptions.DecodeError:
+        except (tokens.InvalidToken, User.DoesNotExist):
             return Response({'error':'Invalid Token'}, status=status.HTTP_400_BAD_REQUEST)  
 
 
@@ -185,9 +177,13 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
         """        
         return self.request.user.profile
         
-    def perform_create(self):
+    def perform_update(self, serializer):
         """
-            Save the updated user profile instance
+            Save the updated user profile instance, a new image is processed by a celery task
+            once the upload is committed
         """
-        profile = serializer.save(user=self.request.user)
-        return Response({'response': profile}, status=status.HTTP_200_OK)
\ No newline at end of file
+        if serializer.validated_data.get('image'):
+            profile = serializer.save(image_status=UserProfile.IMAGE_PENDING)
+            transaction.on_commit(lambda: process_profile_image.delay(str(profile.id), profile.image.name))
+        else:
+            serializer.save()
\ No newline at end of file